@@ -1,13 +1,53 @@
+from .adaptive import AdaptiveConcurrencyLimiter
+from .auth import (
+    AccessToken,
+    ClientCredentialsTokenProvider,
+    FileTokenStore,
+    MemoryTokenStore,
+    TokenProvider,
+    TokenStore,
+)
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .client import AsyncClient, Client
+from .document_cache import DocumentCache, FileDocumentCache, MemoryDocumentCache
+from .deadline import DeadlineExceeded, deadline, time_remaining
+from .documents import DocumentStream
 from .environment import Environment, ServerGroup
+from .hedge import HedgePolicy
+from .pool import PoolOptions
+from .rate_limit import RateLimiter
+from .resources.dem import AsyncDemRecordWriter, DemRecordWriter
+from .retry import RetryPolicy
 from make_api_request import ApiError, BinaryResponse
 
 
 __all__ = [
+    "AccessToken",
+    "AdaptiveConcurrencyLimiter",
     "ApiError",
     "AsyncClient",
+    "AsyncDemRecordWriter",
     "BinaryResponse",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "Client",
+    "ClientCredentialsTokenProvider",
+    "DeadlineExceeded",
+    "DemRecordWriter",
+    "DocumentCache",
+    "DocumentStream",
     "Environment",
+    "FileDocumentCache",
+    "FileTokenStore",
+    "HedgePolicy",
+    "MemoryDocumentCache",
+    "MemoryTokenStore",
+    "PoolOptions",
+    "RateLimiter",
+    "RetryPolicy",
     "ServerGroup",
+    "TokenProvider",
+    "TokenStore",
+    "deadline",
+    "time_remaining",
 ]
@@ -0,0 +1,116 @@
+import asyncio
+import collections
+import typing
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of requests in flight to a service, adapting the limit to how the
+    service copes with the load (additive increase, multiplicative decrease).
+
+    The limiter keeps a baseline of the round-trip latency the service achieves when it is
+    not loaded. While requests succeed within `latency_tolerance` times that baseline and the
+    limit is being used, the limit grows by about one request per limit's worth of
+    completed requests. A failed request (a raised exception, or a 429 or 5xx response) or a
+    slow one shrinks the limit by `backoff_ratio`, at most once per round trip.
+
+    Waiting requests are admitted first-come first-served. A limiter belongs to the event
+    loop it is first used on.
+
+    Examples:
+    ```py
+    client = AsyncClient(
+        token=getenv("API_TOKEN"),
+        adaptive_concurrency={"sign": AdaptiveConcurrencyLimiter(max_limit=64)},
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+    ):
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._baseline: typing.Optional[float] = None
+        self._last_decrease = 0.0
+        self._waiters: typing.Deque["asyncio.Future[None]"] = collections.deque()
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently in flight"""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Waits until a request may be sent"""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, *, latency: float, failed: bool) -> None:
+        """Records the outcome of a request admitted by `acquire` and frees its slot"""
+        loop_time = asyncio.get_running_loop().time()
+        in_flight = self._in_flight
+        self._in_flight -= 1
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            self._baseline += (latency - self._baseline) * 0.01
+        if failed or latency > self._baseline * self.latency_tolerance:
+            if loop_time - self._last_decrease >= self._baseline:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._last_decrease = loop_time
+        elif in_flight * 2 >= self.limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        self._wake()
+
+    def abandon(self) -> None:
+        """Frees the slot of a request admitted by `acquire` that was cancelled"""
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
+def _bulk_concurrency(
+    base_client: typing.Any, *, service_name: str, concurrency: typing.Optional[int]
+) -> int:
+    """
+    Resolves the concurrency of a bulk helper: `concurrency` when given, otherwise the
+    `max_limit` of the service's adaptive limiter, which then paces the requests, or 8
+    """
+    if concurrency is not None:
+        return concurrency
+    limiters = getattr(base_client, "adaptive_concurrency", {})
+    limiter = limiters.get(service_name)
+    return limiter.max_limit if limiter is not None else 8
@@ -0,0 +1,353 @@
+import abc
+import asyncio
+import contextvars
+import httpx
+import json
+import os
+import pydantic
+import random
+import tempfile
+import threading
+import time
+import typing
+
+from make_api_request import ApiError
+from make_api_request.auth import AuthProvider
+from make_api_request.request import RequestConfig
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+SIGNICAT_TOKEN_URL = "https://api.signicat.com/auth/open/connect/token"
+
+
+class AccessToken(pydantic.BaseModel):
+    """A bearer token and the UNIX time at which it expires"""
+
+    access_token: str
+    expires_at: float
+
+
+class TokenStore(abc.ABC):
+    """
+    Storage for the current token, which can be shared by every `TokenProvider` using it.
+
+    `acquire` and `release` bracket a refresh, so that only one holder of the store
+    fetches a new token while the others wait and then read it with `load`.
+    """
+
+    @abc.abstractmethod
+    def load(self) -> typing.Optional[AccessToken]:
+        """Returns the stored token, if any"""
+
+    @abc.abstractmethod
+    def save(self, token: AccessToken) -> None:
+        """Replaces the stored token"""
+
+    @abc.abstractmethod
+    def acquire(self) -> None:
+        """Blocks until this caller holds the refresh lock"""
+
+    @abc.abstractmethod
+    def release(self) -> None:
+        """Releases the refresh lock"""
+
+    def __enter__(self) -> "TokenStore":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.release()
+
+
+class MemoryTokenStore(TokenStore):
+    """Keeps the token in memory, shared by the token providers of this process only"""
+
+    def __init__(self) -> None:
+        self._token: typing.Optional[AccessToken] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> typing.Optional[AccessToken]:
+        return self._token
+
+    def save(self, token: AccessToken) -> None:
+        self._token = token
+
+    def acquire(self) -> None:
+        self._lock.acquire()
+
+    def release(self) -> None:
+        self._lock.release()
+
+
+class FileTokenStore(TokenStore):
+    """
+    Keeps the token in a JSON file, shared by every process on the host using the same
+    `path`, e.g. the workers of a gunicorn server. The refresh lock is an exclusive
+    `flock` on `<path>.lock`, so only one process refreshes an expiring token.
+
+    The file is created readable by the current user only. Requires a POSIX platform.
+
+    Examples:
+    ```py
+    provider = ClientCredentialsTokenProvider(
+        client_id=getenv("SIGNICAT_CLIENT_ID"),
+        client_secret=getenv("SIGNICAT_CLIENT_SECRET"),
+        store=FileTokenStore("/run/signicat/token.json"),
+    )
+    ```
+    """
+
+    def __init__(self, path: typing.Union[str, "os.PathLike[str]"]):
+        if fcntl is None:
+            raise RuntimeError("FileTokenStore requires fcntl, which is not available")
+        self.path = os.fspath(path)
+        self._thread_lock = threading.Lock()
+        self._lock_fd: typing.Optional[int] = None
+
+    def load(self) -> typing.Optional[AccessToken]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return AccessToken.model_validate(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, token: AccessToken) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".token-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(token.model_dump_json())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        try:
+            fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._lock_fd = fd
+
+    def release(self) -> None:
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._thread_lock.release()
+
+
+class TokenProvider(abc.ABC):
+    """
+    Supplies bearer tokens, caching each one in memory until shortly before it expires.
+
+    A token is refreshed `refresh_margin` seconds plus a random jitter of up to
+    `refresh_jitter` seconds before it expires, so that clients started together do not
+    refresh together. For short-lived tokens, the margin and the jitter are each capped at a
+    quarter of the token's lifetime, so that a token is used for at least half of it.
+    Concurrent callers needing a refresh share a single `fetch_token` (or `afetch_token`)
+    call.
+
+    Tokens are kept in `store`, in memory by default. A `FileTokenStore` shares them with
+    other processes, so that only one process refreshes a token for all of them.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_margin: float = 60,
+        refresh_jitter: float = 30,
+        store: typing.Optional[TokenStore] = None,
+    ):
+        self.refresh_margin = refresh_margin
+        self.refresh_jitter = refresh_jitter
+        self.store = store if store is not None else MemoryTokenStore()
+        self._token: typing.Optional[AccessToken] = None
+        self._invalidated: typing.Optional[str] = None
+        self._refresh_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock: typing.Optional[asyncio.Lock] = None
+
+    @abc.abstractmethod
+    def fetch_token(self) -> AccessToken:
+        """Requests a new token"""
+
+    async def afetch_token(self) -> AccessToken:
+        """Requests a new token without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.fetch_token)
+
+    def cached_token(self) -> typing.Optional[str]:
+        """Returns the cached token, or `None` when it is missing or due for a refresh"""
+        if self._token is None or time.time() >= self._refresh_at:
+            stored = self.store.load()
+            if stored is None or stored.access_token == self._invalidated:
+                return None
+            if self._token is None or stored.access_token != self._token.access_token:
+                self._set_token(stored)
+            if time.time() >= self._refresh_at:
+                return None
+        return typing.cast(AccessToken, self._token).access_token
+
+    def get_token(self) -> str:
+        """Returns a valid token, fetching a new one when needed"""
+        token = self.cached_token()
+        if token is not None:
+            return token
+        with self._lock, self.store:
+            token = self.cached_token()
+            if token is None:
+                token = self._save_token(self.fetch_token())
+            return token
+
+    async def aget_token(self) -> str:
+        """Returns a valid token, fetching a new one when needed"""
+        token = self.cached_token()
+        if token is not None:
+            return token
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.store.acquire)
+            try:
+                token = self.cached_token()
+                if token is None:
+                    token = self._save_token(await self.afetch_token())
+            finally:
+                self.store.release()
+            return token
+
+    def invalidate(self) -> None:
+        """Drops the cached token so that the next request fetches a new one"""
+        if self._token is not None:
+            self._invalidated = self._token.access_token
+        self._token = None
+
+    def _save_token(self, token: AccessToken) -> str:
+        self.store.save(token)
+        self._set_token(token)
+        return token.access_token
+
+    def _set_token(self, token: AccessToken) -> None:
+        quarter = max(token.expires_at - time.time(), 0) / 4
+        jitter = random.uniform(0, min(self.refresh_jitter, quarter))
+        margin = min(self.refresh_margin, quarter)
+        self._refresh_at = token.expires_at - margin - jitter
+        self._token = token
+
+
+class ClientCredentialsTokenProvider(TokenProvider):
+    """
+    Fetches tokens from an OAuth 2.0 token endpoint with the client credentials grant.
+
+    Examples:
+    ```py
+    provider = ClientCredentialsTokenProvider(
+        client_id=getenv("SIGNICAT_CLIENT_ID"),
+        client_secret=getenv("SIGNICAT_CLIENT_SECRET"),
+        scope="signicat-api",
+    )
+    client = Client(token_provider=provider)
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        client_id: str,
+        client_secret: str,
+        token_url: str = SIGNICAT_TOKEN_URL,
+        scope: typing.Optional[str] = None,
+        httpx_client: typing.Optional[httpx.Client] = None,
+        async_httpx_client: typing.Optional[httpx.AsyncClient] = None,
+        refresh_margin: float = 60,
+        refresh_jitter: float = 30,
+        store: typing.Optional[TokenStore] = None,
+    ):
+        super().__init__(
+            refresh_margin=refresh_margin, refresh_jitter=refresh_jitter, store=store
+        )
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self.scope = scope
+        self._httpx_client = httpx_client
+        self._async_httpx_client = async_httpx_client
+
+    def fetch_token(self) -> AccessToken:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.Client(timeout=30)
+        response = self._httpx_client.post(self.token_url, data=self._form())
+        return self._parse(response)
+
+    async def afetch_token(self) -> AccessToken:
+        if self._async_httpx_client is None:
+            self._async_httpx_client = httpx.AsyncClient(timeout=30)
+        response = await self._async_httpx_client.post(
+            self.token_url, data=self._form()
+        )
+        return self._parse(response)
+
+    def _form(self) -> typing.Dict[str, str]:
+        form = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        if self.scope is not None:
+            form["scope"] = self.scope
+        return form
+
+    def _parse(self, response: httpx.Response) -> AccessToken:
+        if not response.is_success:
+            raise ApiError(response=response)
+        body = response.json()
+        return AccessToken(
+            access_token=body["access_token"],
+            expires_at=time.time() + float(body.get("expires_in", 3600)),
+        )
+
+
+class BearerTokenAuth(AuthProvider):
+    """Adds the token of a `TokenProvider` to the request's Authorization header"""
+
+    def __init__(self, *, token_provider: TokenProvider):
+        super().__init__()
+        self.token_provider = token_provider
+        self._prepared: contextvars.ContextVar[typing.Optional[str]] = (
+            contextvars.ContextVar("signicat_dem_py_prepared_token", default=None)
+        )
+
+    async def prepare(self) -> None:
+        """
+        Obtains a valid token before an asynchronous request is built, which the request
+        then uses without touching the token provider again
+        """
+        self._prepared.set(await self.token_provider.aget_token())
+
+    def add_to_request(self, cfg: RequestConfig) -> RequestConfig:
+        token = self._prepared.get()
+        if token is not None:
+            self._prepared.set(None)
+        else:
+            token = (
+                self.token_provider.cached_token() or self.token_provider.get_token()
+            )
+        headers = cfg.get("headers", {})
+        headers["Authorization"] = f"Bearer {token}"
+        cfg["headers"] = headers
+        return cfg
+
+    def set_value(self, val: typing.Optional[str]) -> None:
+        """Caches `val` as a token that does not expire"""
+        self.token_provider._set_token(
+            AccessToken(access_token=val or "", expires_at=float("inf"))
+        )
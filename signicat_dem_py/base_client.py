@@ -0,0 +1,755 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import httpx
+import time
+import typing
+import uuid
+
+from make_api_request import (
+    ApiError,
+    AsyncBaseClient as _AsyncBaseClient,
+    QueryParams,
+    RequestOptions,
+    SyncBaseClient as _SyncBaseClient,
+)
+from make_api_request.auth import AuthProvider
+from make_api_request.request import RequestConfig
+from make_api_request.response import AsyncStreamResponse, StreamResponse
+from signicat_dem_py import request
+from signicat_dem_py.adaptive import AdaptiveConcurrencyLimiter
+from signicat_dem_py.auth import BearerTokenAuth
+from signicat_dem_py.circuit_breaker import CircuitBreaker, CircuitOpenError
+from signicat_dem_py.concurrency import AsyncSingleFlight, SingleFlight
+from signicat_dem_py.deadline import (
+    DeadlineExceeded,
+    _check_deadline,
+    _clamp_timeout,
+    _within_deadline,
+)
+from signicat_dem_py.hedge import HedgePolicy
+from signicat_dem_py.rate_limit import RateLimiter, _matching_rate_limiters
+from signicat_dem_py.retry import (
+    IDEMPOTENCY_KEY_HEADER,
+    RetryPolicy,
+    _ATTEMPT_EXTENSION,
+)
+
+
+T = typing.TypeVar("T")
+
+
+def _split_request_config(
+    req_cfg: RequestConfig,
+) -> typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]:
+    """Splits a request config into `build_request` and `send` keyword arguments"""
+    build_kwargs: typing.Dict[str, typing.Any] = dict(req_cfg)
+    send_kwargs: typing.Dict[str, typing.Any] = {
+        key: build_kwargs.pop(key)
+        for key in ("auth", "follow_redirects")
+        if key in build_kwargs
+    }
+    return build_kwargs, send_kwargs
+
+
+class _AsyncResponseContext:
+    """Closes a streamed response once an `AsyncStreamResponse` is exhausted"""
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self._response.aclose()
+
+
+def _pick_winner(done: typing.Set[typing.Any]) -> typing.Any:
+    """Picks a successful future out of `done`, or any of them when they all failed"""
+    for future in done:
+        if not future.cancelled() and future.exception() is None:
+            return future
+    return next(iter(done))
+
+
+class _ResilienceMixin:
+    _base_url: typing.Dict[str, str]
+    retry: typing.Optional[RetryPolicy]
+    hedge: typing.Optional[HedgePolicy]
+    coalesce_gets: bool
+    idempotency_keys: bool
+    circuit_breakers: typing.Dict[str, CircuitBreaker]
+    rate_limiters: typing.Dict[str, RateLimiter]
+
+    def _rate_limiters_for(
+        self, req_cfg: RequestConfig, *, service_name: typing.Optional[str]
+    ) -> typing.List[RateLimiter]:
+        """Returns the rate limiters the request has to pass"""
+        if not self.rate_limiters:
+            return []
+        base_url = self._base_url.get(service_name or "", "").rstrip("/")
+        url = str(req_cfg["url"])
+        return _matching_rate_limiters(
+            self.rate_limiters,
+            service_name=service_name,
+            method=req_cfg["method"],
+            path=url[len(base_url) :] if url.startswith(base_url) else url,
+        )
+
+    def _admit(
+        self, req_cfg: RequestConfig, *, service_name: typing.Optional[str]
+    ) -> typing.Optional[CircuitBreaker]:
+        """Returns the breaker guarding the request, raising when it is open"""
+        breaker = self.circuit_breakers.get(service_name or "")
+        if breaker is not None:
+            breaker.before_call(
+                service_name=service_name or "",
+                method=req_cfg["method"],
+                url=str(req_cfg["url"]),
+            )
+        return breaker
+
+    def _hedge_for(
+        self, req_cfg: RequestConfig, *, opts: request.RequestOptions, stream: bool
+    ) -> typing.Optional[HedgePolicy]:
+        """Returns the hedge policy applying to the request, only ever for plain `GET`s"""
+        if stream or req_cfg["method"].upper() not in ("GET", "HEAD"):
+            return None
+        return opts.get("hedge", self.hedge)
+
+    def _with_idempotency_key(
+        self, req_cfg: RequestConfig, *, opts: request.RequestOptions
+    ) -> typing.Tuple[RequestConfig, typing.Optional[bool]]:
+        """
+        Returns a `POST` request with its idempotency key header, generated once so that
+        every attempt carries the same key, and whether the request may be retried
+        """
+        idempotent = opts.get("idempotent")
+        key = opts.get("idempotency_key")
+        if req_cfg["method"].upper() != "POST" or (
+            key is None and not self.idempotency_keys
+        ):
+            return req_cfg, idempotent
+        headers = dict(req_cfg.get("headers", {}))
+        if not any(name.lower() == IDEMPOTENCY_KEY_HEADER.lower() for name in headers):
+            headers[IDEMPOTENCY_KEY_HEADER] = key or str(uuid.uuid4())
+        if idempotent is None and key is not None:
+            idempotent = True
+        return typing.cast(RequestConfig, {**req_cfg, "headers": headers}), idempotent
+
+    def _coalesce_key(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        request_options: typing.Optional[RequestOptions],
+        cast_to: typing.Any,
+    ) -> typing.Optional[typing.Hashable]:
+        """
+        Returns the key under which identical in-flight `GET` requests share one response,
+        or `None` when the request is not coalesced
+        """
+        opts = typing.cast(request.RequestOptions, request_options or {})
+        if req_cfg["method"].upper() != "GET" or not opts.get(
+            "coalesce", self.coalesce_gets
+        ):
+            return None
+        if isinstance(cast_to, type) and issubclass(cast_to, httpx.Response):
+            return None
+        return (
+            service_name,
+            str(req_cfg["url"]),
+            repr(sorted(req_cfg.get("params", {}).items())),
+            repr(sorted(req_cfg.get("headers", {}).items())),
+            repr(req_cfg.get("timeout")),
+            repr(cast_to),
+        )
+
+    def _attempt_kwargs(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        client: typing.Union[httpx.Client, httpx.AsyncClient],
+    ) -> typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]:
+        """
+        Returns the `build_request` and `send` keyword arguments of an attempt, its timeout
+        cut to the time left before the enclosing deadline
+        """
+        build_kwargs, send_kwargs = _split_request_config(req_cfg)
+        build_kwargs["timeout"] = _clamp_timeout(
+            build_kwargs.get("timeout", client.timeout),
+            method=req_cfg["method"],
+            url=str(req_cfg["url"]),
+        )
+        return build_kwargs, send_kwargs
+
+    def _fallback(self, error: CircuitOpenError) -> typing.Any:
+        """Returns the result of the open breaker's fallback, or re-raises `error`"""
+        breaker = self.circuit_breakers.get(error.service_name)
+        if breaker is None or breaker.fallback is None:
+            raise error
+        return breaker.fallback(error)
+
+
+class SyncBaseClient(_ResilienceMixin, _SyncBaseClient):
+    """
+    Synchronous base client which sends each request through the httpx client of the
+    service it targets, falling back to the shared `httpx_client`, and applies the
+    configured retry policy, circuit breakers and rate limiters
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: typing.Union[str, typing.Dict[str, str]],
+        httpx_client: httpx.Client,
+        auths: typing.Optional[typing.Dict[str, AuthProvider]] = None,
+        service_httpx_clients: typing.Optional[typing.Dict[str, httpx.Client]] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        hedge: typing.Optional[HedgePolicy] = None,
+        coalesce_gets: bool = False,
+        idempotency_keys: bool = True,
+        circuit_breakers: typing.Optional[typing.Dict[str, CircuitBreaker]] = None,
+        rate_limiters: typing.Optional[typing.Dict[str, RateLimiter]] = None,
+    ):
+        super().__init__(base_url=base_url, httpx_client=httpx_client, auths=auths)
+        self.service_httpx_clients = service_httpx_clients or {}
+        self.retry = retry
+        self.hedge = hedge
+        self.coalesce_gets = coalesce_gets
+        self.idempotency_keys = idempotency_keys
+        self._get_flight = SingleFlight()
+        self.circuit_breakers = circuit_breakers or {}
+        self.rate_limiters = rate_limiters or {}
+        self._hedge_executor: typing.Optional[concurrent.futures.Executor] = None
+
+    def httpx_client_for(self, service_name: typing.Optional[str]) -> httpx.Client:
+        """Returns the httpx client used for requests to `service_name`"""
+        return self.service_httpx_clients.get(service_name or "", self.httpx_client)
+
+    def _send(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        request_options: typing.Optional[RequestOptions],
+        stream: bool = False,
+    ) -> httpx.Response:
+        opts = typing.cast(request.RequestOptions, request_options or {})
+        policy = opts.get("retry", self.retry)
+        hedge = self._hedge_for(req_cfg, opts=opts, stream=stream)
+        req_cfg, idempotent = self._with_idempotency_key(req_cfg, opts=opts)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if hedge is not None:
+                    response = self._send_hedged(
+                        req_cfg, service_name=service_name, hedge=hedge
+                    )
+                else:
+                    response = self._send_once(
+                        req_cfg, service_name=service_name, stream=stream
+                    )
+            except Exception as e:
+                if policy is None or not policy.is_retryable(
+                    attempt=attempt,
+                    method=req_cfg["method"],
+                    idempotent=idempotent,
+                    exception=e,
+                ):
+                    raise
+                delay = policy.delay(attempt=attempt)
+                if not _within_deadline(delay):
+                    raise
+                time.sleep(delay)
+                continue
+            response.extensions[_ATTEMPT_EXTENSION] = attempt
+            if policy is None or not policy.is_retryable(
+                attempt=attempt,
+                method=req_cfg["method"],
+                idempotent=idempotent,
+                response=response,
+            ):
+                return response
+            delay = policy.delay(attempt=attempt, response=response)
+            if not _within_deadline(delay):
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def _send_hedged(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        hedge: HedgePolicy,
+    ) -> httpx.Response:
+        start = time.monotonic()
+        delay = hedge.hedge_delay()
+        if delay is None:
+            response = self._send_once(req_cfg, service_name=service_name, stream=False)
+            hedge.record(time.monotonic() - start)
+            return response
+        if self._hedge_executor is None:
+            self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="signicat-hedge"
+            )
+
+        def submit() -> "concurrent.futures.Future[httpx.Response]":
+            assert self._hedge_executor is not None
+            return self._hedge_executor.submit(
+                contextvars.copy_context().run,
+                self._send_once,
+                req_cfg,
+                service_name=service_name,
+                stream=False,
+            )
+
+        pending = {submit()}
+        done, pending = concurrent.futures.wait(pending, timeout=delay)
+        if not done and hedge.try_hedge():
+            pending.add(submit())
+        while not done or (pending and _pick_winner(done).exception() is not None):
+            more, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            done |= more
+        hedge.record(time.monotonic() - start)
+        return typing.cast(httpx.Response, _pick_winner(done).result())
+
+    def _send_once(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        stream: bool,
+    ) -> httpx.Response:
+        _check_deadline(method=req_cfg["method"], url=str(req_cfg["url"]))
+        breaker = self._admit(req_cfg, service_name=service_name)
+        client = self.httpx_client_for(service_name)
+        try:
+            for limiter in self._rate_limiters_for(req_cfg, service_name=service_name):
+                limiter.acquire()
+            build_kwargs, send_kwargs = self._attempt_kwargs(req_cfg, client=client)
+        except BaseException:
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        start = time.monotonic()
+        try:
+            response = client.send(
+                client.build_request(**build_kwargs), stream=stream, **send_kwargs
+            )
+        except Exception:
+            if breaker is not None:
+                breaker.record(failed=True, duration=time.monotonic() - start)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        if breaker is not None:
+            breaker.record(
+                failed=breaker.is_failure(response.status_code),
+                duration=time.monotonic() - start,
+            )
+        return response
+
+    def request(
+        self,
+        *,
+        method: str,
+        path: str,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        service_name: typing.Optional[str] = None,
+        auth_names: typing.Optional[typing.List[str]] = None,
+        query_params: typing.Optional[QueryParams] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        data: typing.Optional[httpx._types.RequestData] = None,
+        files: typing.Optional[httpx._types.RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        content_type: typing.Optional[str] = None,
+        content: typing.Optional[httpx._types.RequestContent] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> T:
+        req_cfg = self.build_request(
+            method=method,
+            path=path,
+            service_name=service_name,
+            auth_names=auth_names,
+            query_params=query_params,
+            headers=headers,
+            data=data,
+            files=files,
+            json=json,
+            content_type=content_type,
+            content=content,
+            request_options=request_options,
+        )
+
+        def send() -> T:
+            try:
+                response = self._send(
+                    req_cfg, service_name=service_name, request_options=request_options
+                )
+            except CircuitOpenError as e:
+                return typing.cast(T, self._fallback(e))
+
+            if not response.is_success:
+                raise ApiError(response=response)
+
+            if self._cast_to_raw_response(res=response, cast_to=cast_to):
+                return response
+
+            return self.process_response(response=response, cast_to=cast_to)
+
+        key = self._coalesce_key(
+            req_cfg,
+            service_name=service_name,
+            request_options=request_options,
+            cast_to=cast_to,
+        )
+        return send() if key is None else self._get_flight.do(key, send)
+
+    def stream_request(
+        self,
+        *,
+        method: str,
+        path: str,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        service_name: typing.Optional[str] = None,
+        auth_names: typing.Optional[typing.List[str]] = None,
+        query_params: typing.Optional[QueryParams] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        data: typing.Optional[httpx._types.RequestData] = None,
+        files: typing.Optional[httpx._types.RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        content_type: typing.Optional[str] = None,
+        content: typing.Optional[httpx._types.RequestContent] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> StreamResponse[T]:
+        req_cfg = self.build_request(
+            method=method,
+            path=path,
+            service_name=service_name,
+            auth_names=auth_names,
+            query_params=query_params,
+            headers=headers,
+            data=data,
+            files=files,
+            json=json,
+            content_type=content_type,
+            content=content,
+            request_options=request_options,
+        )
+        response = self._send(
+            req_cfg,
+            service_name=service_name,
+            request_options=request_options,
+            stream=True,
+        )
+        return StreamResponse(response, contextlib.closing(response), cast_to)
+
+
+class AsyncBaseClient(_ResilienceMixin, _AsyncBaseClient):
+    """
+    Asynchronous base client which sends each request through the httpx client of the
+    service it targets, falling back to the shared `httpx_client`, and applies the
+    configured retry policy, circuit breakers, rate limiters and adaptive concurrency
+    limiters
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: typing.Union[str, typing.Dict[str, str]],
+        httpx_client: httpx.AsyncClient,
+        auths: typing.Optional[typing.Dict[str, AuthProvider]] = None,
+        service_httpx_clients: typing.Optional[
+            typing.Dict[str, httpx.AsyncClient]
+        ] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        hedge: typing.Optional[HedgePolicy] = None,
+        coalesce_gets: bool = False,
+        idempotency_keys: bool = True,
+        circuit_breakers: typing.Optional[typing.Dict[str, CircuitBreaker]] = None,
+        rate_limiters: typing.Optional[typing.Dict[str, RateLimiter]] = None,
+        adaptive_concurrency: typing.Optional[
+            typing.Dict[str, AdaptiveConcurrencyLimiter]
+        ] = None,
+    ):
+        super().__init__(base_url=base_url, httpx_client=httpx_client, auths=auths)
+        self.service_httpx_clients = service_httpx_clients or {}
+        self.retry = retry
+        self.hedge = hedge
+        self.coalesce_gets = coalesce_gets
+        self.idempotency_keys = idempotency_keys
+        self._get_flight = AsyncSingleFlight()
+        self.circuit_breakers = circuit_breakers or {}
+        self.rate_limiters = rate_limiters or {}
+        self.adaptive_concurrency = adaptive_concurrency or {}
+
+    def httpx_client_for(self, service_name: typing.Optional[str]) -> httpx.AsyncClient:
+        """Returns the httpx client used for requests to `service_name`"""
+        return self.service_httpx_clients.get(service_name or "", self.httpx_client)
+
+    async def _send(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        request_options: typing.Optional[RequestOptions],
+        stream: bool = False,
+    ) -> httpx.Response:
+        opts = typing.cast(request.RequestOptions, request_options or {})
+        policy = opts.get("retry", self.retry)
+        hedge = self._hedge_for(req_cfg, opts=opts, stream=stream)
+        req_cfg, idempotent = self._with_idempotency_key(req_cfg, opts=opts)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if hedge is not None:
+                    response = await self._send_hedged(
+                        req_cfg, service_name=service_name, hedge=hedge
+                    )
+                else:
+                    response = await self._send_once(
+                        req_cfg, service_name=service_name, stream=stream
+                    )
+            except Exception as e:
+                if policy is None or not policy.is_retryable(
+                    attempt=attempt,
+                    method=req_cfg["method"],
+                    idempotent=idempotent,
+                    exception=e,
+                ):
+                    raise
+                delay = policy.delay(attempt=attempt)
+                if not _within_deadline(delay):
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            response.extensions[_ATTEMPT_EXTENSION] = attempt
+            if policy is None or not policy.is_retryable(
+                attempt=attempt,
+                method=req_cfg["method"],
+                idempotent=idempotent,
+                response=response,
+            ):
+                return response
+            delay = policy.delay(attempt=attempt, response=response)
+            if not _within_deadline(delay):
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def _send_hedged(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        hedge: HedgePolicy,
+    ) -> httpx.Response:
+        start = time.monotonic()
+        delay = hedge.hedge_delay()
+        if delay is None:
+            response = await self._send_once(
+                req_cfg, service_name=service_name, stream=False
+            )
+            hedge.record(time.monotonic() - start)
+            return response
+        tasks = [
+            asyncio.ensure_future(
+                self._send_once(req_cfg, service_name=service_name, stream=False)
+            )
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=delay)
+            if not done and hedge.try_hedge():
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._send_once(
+                            req_cfg, service_name=service_name, stream=False
+                        )
+                    )
+                )
+                pending.add(tasks[-1])
+            while not done or (pending and _pick_winner(done).exception() is not None):
+                more, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                done |= more
+            hedge.record(time.monotonic() - start)
+            return typing.cast(httpx.Response, _pick_winner(done).result())
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def _send_once(
+        self,
+        req_cfg: RequestConfig,
+        *,
+        service_name: typing.Optional[str],
+        stream: bool,
+    ) -> httpx.Response:
+        _check_deadline(method=req_cfg["method"], url=str(req_cfg["url"]))
+        breaker = self._admit(req_cfg, service_name=service_name)
+        client = self.httpx_client_for(service_name)
+        concurrency = self.adaptive_concurrency.get(service_name or "")
+        try:
+            for limiter in self._rate_limiters_for(req_cfg, service_name=service_name):
+                await limiter.aacquire()
+            if concurrency is not None:
+                await concurrency.acquire()
+        except BaseException:
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        try:
+            build_kwargs, send_kwargs = self._attempt_kwargs(req_cfg, client=client)
+        except DeadlineExceeded:
+            if concurrency is not None:
+                concurrency.abandon()
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        start = time.monotonic()
+        try:
+            response = await client.send(
+                client.build_request(**build_kwargs), stream=stream, **send_kwargs
+            )
+        except Exception:
+            duration = time.monotonic() - start
+            if concurrency is not None:
+                concurrency.release(latency=duration, failed=True)
+            if breaker is not None:
+                breaker.record(failed=True, duration=duration)
+            raise
+        except BaseException:
+            if concurrency is not None:
+                concurrency.abandon()
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        duration = time.monotonic() - start
+        if concurrency is not None:
+            concurrency.release(
+                latency=duration,
+                failed=response.status_code == 429 or response.status_code >= 500,
+            )
+        if breaker is not None:
+            breaker.record(
+                failed=breaker.is_failure(response.status_code), duration=duration
+            )
+        return response
+
+    async def _prepare_auth(
+        self, auth_names: typing.Optional[typing.List[str]]
+    ) -> None:
+        for auth_name in auth_names or []:
+            auth_provider = self._auths.get(auth_name)
+            if isinstance(auth_provider, BearerTokenAuth):
+                await auth_provider.prepare()
+
+    async def request(
+        self,
+        *,
+        method: str,
+        path: str,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        service_name: typing.Optional[str] = None,
+        auth_names: typing.Optional[typing.List[str]] = None,
+        query_params: typing.Optional[QueryParams] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        data: typing.Optional[httpx._types.RequestData] = None,
+        files: typing.Optional[httpx._types.RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        content_type: typing.Optional[str] = None,
+        content: typing.Optional[httpx._types.RequestContent] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> T:
+        await self._prepare_auth(auth_names)
+        req_cfg = self.build_request(
+            method=method,
+            path=path,
+            service_name=service_name,
+            auth_names=auth_names,
+            query_params=query_params,
+            headers=headers,
+            data=data,
+            files=files,
+            json=json,
+            content_type=content_type,
+            content=content,
+            request_options=request_options,
+        )
+
+        async def send() -> T:
+            try:
+                response = await self._send(
+                    req_cfg, service_name=service_name, request_options=request_options
+                )
+            except CircuitOpenError as e:
+                return typing.cast(T, self._fallback(e))
+
+            if not response.is_success:
+                raise ApiError(response=response)
+
+            if self._cast_to_raw_response(res=response, cast_to=cast_to):
+                return response
+
+            return self.process_response(response=response, cast_to=cast_to)
+
+        key = self._coalesce_key(
+            req_cfg,
+            service_name=service_name,
+            request_options=request_options,
+            cast_to=cast_to,
+        )
+        if key is None:
+            return await send()
+        return await self._get_flight.do(key, send)
+
+    async def stream_request(
+        self,
+        *,
+        method: str,
+        path: str,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        service_name: typing.Optional[str] = None,
+        auth_names: typing.Optional[typing.List[str]] = None,
+        query_params: typing.Optional[QueryParams] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        data: typing.Optional[httpx._types.RequestData] = None,
+        files: typing.Optional[httpx._types.RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        content_type: typing.Optional[str] = None,
+        content: typing.Optional[httpx._types.RequestContent] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> AsyncStreamResponse[T]:
+        await self._prepare_auth(auth_names)
+        req_cfg = self.build_request(
+            method=method,
+            path=path,
+            service_name=service_name,
+            auth_names=auth_names,
+            query_params=query_params,
+            headers=headers,
+            data=data,
+            files=files,
+            json=json,
+            content_type=content_type,
+            content=content,
+            request_options=request_options,
+        )
+        response = await self._send(
+            req_cfg,
+            service_name=service_name,
+            request_options=request_options,
+            stream=True,
+        )
+        return AsyncStreamResponse(response, _AsyncResponseContext(response), cast_to)
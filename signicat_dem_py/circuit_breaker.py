@@ -0,0 +1,157 @@
+import collections
+import threading
+import time
+import typing
+
+
+CircuitState = typing.Literal["closed", "open", "half_open"]
+
+DEFAULT_FAILURE_STATUSES: typing.FrozenSet[int] = frozenset(range(500, 600))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker of its service is open"""
+
+    def __init__(self, *, service_name: str, method: str, url: str, retry_at: float):
+        super().__init__(
+            f"circuit breaker for service '{service_name}' is open, "
+            f"not sending {method} {url}"
+        )
+        self.service_name = service_name
+        self.method = method
+        self.url = url
+        self.retry_at = retry_at
+        """UNIX time at which the breaker lets trial requests through again"""
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a service while it fails or responds slowly.
+
+    The breaker records the outcome of the last `window_size` requests. Once at least
+    `minimum_calls` are recorded and the share of failures reaches `failure_rate_threshold`,
+    or the share of calls slower than `slow_call_duration` seconds reaches
+    `slow_call_rate_threshold`, the breaker opens: requests fail immediately with
+    `CircuitOpenError`, without using a connection, or return the result of `fallback`.
+
+    After `open_duration` seconds the breaker is half open and lets `half_open_calls` trial
+    requests through. It closes when they all succeed and opens again when one fails.
+
+    A request fails when it raises, e.g. on a timeout, or its response status is in
+    `failure_statuses` (5xx by default).
+
+    Examples:
+    ```py
+    client = Client(
+        token=getenv("API_TOKEN"),
+        circuit_breakers={"dem": CircuitBreaker(slow_call_duration=5)},
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 1.0,
+        slow_call_duration: float = 10,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30,
+        half_open_calls: int = 1,
+        failure_statuses: typing.Iterable[int] = DEFAULT_FAILURE_STATUSES,
+        fallback: typing.Optional[
+            typing.Callable[[CircuitOpenError], typing.Any]
+        ] = None,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = max(min(minimum_calls, window_size), 1)
+        self.open_duration = open_duration
+        self.half_open_calls = max(half_open_calls, 1)
+        self.failure_statuses = frozenset(failure_statuses)
+        self.fallback = fallback
+        self._outcomes: typing.Deque[typing.Tuple[bool, bool]] = collections.deque(
+            maxlen=max(window_size, 1)
+        )
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the breaker"""
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self, *, service_name: str, method: str, url: str) -> None:
+        """Admits a request, raising `CircuitOpenError` when it may not be sent"""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return
+            if state == "half_open" and self._trials < self.half_open_calls:
+                self._trials += 1
+                return
+        raise CircuitOpenError(
+            service_name=service_name,
+            method=method,
+            url=url,
+            retry_at=time.time()
+            + max(self._opened_at + self.open_duration - time.monotonic(), 0.0),
+        )
+
+    def record(self, *, failed: bool, duration: float) -> None:
+        """Records the outcome of an admitted request"""
+        slow = duration >= self.slow_call_duration
+        with self._lock:
+            state = self._current_state()
+            if state == "half_open":
+                if failed or slow:
+                    self._open()
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._state = "closed"
+                    self._outcomes.clear()
+                return
+            if state == "open":
+                return
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.minimum_calls:
+                return
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if (
+                failures / len(self._outcomes) >= self.failure_rate_threshold
+                or slow_calls / len(self._outcomes) >= self.slow_call_rate_threshold
+            ):
+                self._open()
+
+    def abandon(self) -> None:
+        """Releases the trial slot of an admitted request that was cancelled"""
+        with self._lock:
+            if self._current_state() == "half_open" and self._trials > 0:
+                self._trials -= 1
+
+    def is_failure(self, status_code: int) -> bool:
+        """Whether a response with `status_code` counts as a failure"""
+        return status_code in self.failure_statuses
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state == "open"
+            and time.monotonic() >= self._opened_at + self.open_duration
+        ):
+            self._state = "half_open"
+            self._trials = 0
+            self._trial_successes = 0
+        return self._state
+
+    def _open(self) -> None:
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
@@ -1,10 +1,48 @@
 import httpx
 import typing
 
-from make_api_request import AsyncBaseClient, AuthBearer, SyncBaseClient
+from make_api_request import AuthBearer, type_utils
+from make_api_request.auth import AuthProvider
+from signicat_dem_py.adaptive import AdaptiveConcurrencyLimiter
+from signicat_dem_py.auth import BearerTokenAuth, TokenProvider
+from signicat_dem_py.base_client import AsyncBaseClient, SyncBaseClient
+from signicat_dem_py.circuit_breaker import CircuitBreaker
+from signicat_dem_py.document_cache import DocumentCache
 from signicat_dem_py.environment import DEFAULT, Environment, ServerGroup, _get_base_url
+from signicat_dem_py.hedge import HedgePolicy
+from signicat_dem_py.pool import PoolOptions, _httpx_client_kwargs, _merge_pool_options
+from signicat_dem_py.rate_limit import RateLimiter
 from signicat_dem_py.resources.dem import AsyncDemClient, DemClient
 from signicat_dem_py.resources.sign import AsyncSignClient, SignClient
+from signicat_dem_py.retry import RetryPolicy
+
+
+ServiceName = typing.Literal["dem", "sign"]
+
+
+def _pool_options(
+    *,
+    max_connections: typing.Union[typing.Optional[int], type_utils.NotGiven],
+    max_keepalive_connections: typing.Union[typing.Optional[int], type_utils.NotGiven],
+    keepalive_expiry: typing.Union[typing.Optional[float], type_utils.NotGiven],
+    http2: bool,
+) -> PoolOptions:
+    options: PoolOptions = {"http2": http2}
+    if not isinstance(max_connections, type_utils.NotGiven):
+        options["max_connections"] = max_connections
+    if not isinstance(max_keepalive_connections, type_utils.NotGiven):
+        options["max_keepalive_connections"] = max_keepalive_connections
+    if not isinstance(keepalive_expiry, type_utils.NotGiven):
+        options["keepalive_expiry"] = keepalive_expiry
+    return _merge_pool_options(options)
+
+
+def _bearer_auth(
+    *, token: typing.Optional[str], token_provider: typing.Optional[TokenProvider]
+) -> AuthProvider:
+    if token_provider is not None:
+        return BearerTokenAuth(token_provider=token_provider)
+    return AuthBearer(token=token)
 
 
 class Client:
@@ -15,19 +53,102 @@ class Client:
         httpx_client: typing.Optional[httpx.Client] = None,
         environment: ServerGroup = DEFAULT,
         token: typing.Optional[str] = None,
+        token_provider: typing.Optional[TokenProvider] = None,
+        max_connections: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        max_keepalive_connections: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        keepalive_expiry: typing.Union[
+            typing.Optional[float], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        http2: bool = False,
+        pools: typing.Optional[typing.Dict[ServiceName, PoolOptions]] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        hedge: typing.Optional[HedgePolicy] = None,
+        coalesce_gets: bool = False,
+        idempotency_keys: bool = True,
+        circuit_breakers: typing.Optional[
+            typing.Dict[ServiceName, CircuitBreaker]
+        ] = None,
+        rate_limiters: typing.Optional[typing.Dict[str, RateLimiter]] = None,
+        document_cache: typing.Optional[DocumentCache] = None,
     ):
-        """Initialize root client"""
+        """
+        Initialize root client
+
+        `token` is a static bearer token. To refresh tokens as they expire, pass a
+        `token_provider` instead, such as a `ClientCredentialsTokenProvider`.
+
+        The pool settings (`max_connections`, `max_keepalive_connections`, `keepalive_expiry`
+        and `http2`) configure the connection pool shared by every service, unless
+        `httpx_client` is given. Services listed in `pools` get a dedicated connection pool
+        whose settings override the shared ones.
+
+        `retry` is the retry policy applied to every request, unless overridden through the
+        `retry` request option. Requests are not retried by default.
+
+        `hedge` is the hedge policy applied to every `GET` request, unless overridden through
+        the `hedge` request option. Requests are not hedged by default.
+
+        With `coalesce_gets`, identical `GET` requests made while one of them is in flight
+        share its response, parsed once, instead of each being sent.
+
+        With `idempotency_keys`, every `POST` request is sent with a generated
+        `Idempotency-Key` header, which its retries reuse. A key of your own can be given
+        through the `idempotency_key` request option.
+
+        `circuit_breakers` maps a service to the `CircuitBreaker` that stops sending requests
+        to it while it is failing.
+
+        `rate_limiters` maps a service (`"dem"`), or an endpoint of a service given as
+        `"<service>:<METHOD> <path pattern>"` (`"sign:POST /documents"`), to the `RateLimiter`
+        pacing its requests. A request waits for every limiter matching it.
+
+        With a `document_cache`, `sign.upload_document` and `sign.upload_document_stream`
+        reuse the document already uploaded with the same content and content type, as
+        identified by its SHA256, instead of uploading it again.
+        """
+        options = _pool_options(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
         self._base_client = SyncBaseClient(
             base_url={
                 "dem": _get_base_url(environment, "dem", Environment.DEM.value),
                 "sign": _get_base_url(environment, "sign", Environment.SIGN.value),
             },
-            httpx_client=httpx.Client(timeout=timeout)
-            if httpx_client is None
-            else httpx_client,
-            auths={"bearerAuth": AuthBearer(token=token)},
+            httpx_client=(
+                httpx.Client(timeout=timeout, **_httpx_client_kwargs(options))
+                if httpx_client is None
+                else httpx_client
+            ),
+            auths={
+                "bearerAuth": _bearer_auth(token=token, token_provider=token_provider)
+            },
+            service_httpx_clients={
+                service: httpx.Client(
+                    timeout=timeout,
+                    **_httpx_client_kwargs(_merge_pool_options(options, pool)),
+                )
+                for service, pool in (pools or {}).items()
+            },
+            retry=retry,
+            hedge=hedge,
+            coalesce_gets=coalesce_gets,
+            idempotency_keys=idempotency_keys,
+            circuit_breakers={
+                service: breaker
+                for service, breaker in (circuit_breakers or {}).items()
+            },
+            rate_limiters=rate_limiters,
+        )
+        self.sign = SignClient(
+            base_client=self._base_client, document_cache=document_cache
         )
-        self.sign = SignClient(base_client=self._base_client)
         self.dem = DemClient(base_client=self._base_client)
 
 
@@ -39,17 +160,110 @@ class AsyncClient:
         httpx_client: typing.Optional[httpx.AsyncClient] = None,
         environment: ServerGroup = DEFAULT,
         token: typing.Optional[str] = None,
+        token_provider: typing.Optional[TokenProvider] = None,
+        max_connections: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        max_keepalive_connections: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        keepalive_expiry: typing.Union[
+            typing.Optional[float], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        http2: bool = False,
+        pools: typing.Optional[typing.Dict[ServiceName, PoolOptions]] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        hedge: typing.Optional[HedgePolicy] = None,
+        coalesce_gets: bool = False,
+        idempotency_keys: bool = True,
+        circuit_breakers: typing.Optional[
+            typing.Dict[ServiceName, CircuitBreaker]
+        ] = None,
+        rate_limiters: typing.Optional[typing.Dict[str, RateLimiter]] = None,
+        document_cache: typing.Optional[DocumentCache] = None,
+        adaptive_concurrency: typing.Optional[
+            typing.Dict[ServiceName, AdaptiveConcurrencyLimiter]
+        ] = None,
     ):
-        """Initialize root client"""
+        """
+        Initialize root client
+
+        `token` is a static bearer token. To refresh tokens as they expire, pass a
+        `token_provider` instead, such as a `ClientCredentialsTokenProvider`.
+
+        The pool settings (`max_connections`, `max_keepalive_connections`, `keepalive_expiry`
+        and `http2`) configure the connection pool shared by every service, unless
+        `httpx_client` is given. Services listed in `pools` get a dedicated connection pool
+        whose settings override the shared ones.
+
+        `retry` is the retry policy applied to every request, unless overridden through the
+        `retry` request option. Requests are not retried by default.
+
+        `hedge` is the hedge policy applied to every `GET` request, unless overridden through
+        the `hedge` request option. Requests are not hedged by default.
+
+        With `coalesce_gets`, identical `GET` requests made while one of them is in flight
+        share its response, parsed once, instead of each being sent.
+
+        With `idempotency_keys`, every `POST` request is sent with a generated
+        `Idempotency-Key` header, which its retries reuse. A key of your own can be given
+        through the `idempotency_key` request option.
+
+        `circuit_breakers` maps a service to the `CircuitBreaker` that stops sending requests
+        to it while it is failing.
+
+        `rate_limiters` maps a service (`"dem"`), or an endpoint of a service given as
+        `"<service>:<METHOD> <path pattern>"` (`"sign:POST /documents"`), to the `RateLimiter`
+        pacing its requests. A request waits for every limiter matching it.
+
+        `adaptive_concurrency` maps a service to the `AdaptiveConcurrencyLimiter` bounding
+        its requests in flight, which adapts the bound to the latency and errors observed.
+
+        With a `document_cache`, `sign.upload_document` and `sign.upload_document_stream`
+        reuse the document already uploaded with the same content and content type, as
+        identified by its SHA256, instead of uploading it again.
+        """
+        options = _pool_options(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
         self._base_client = AsyncBaseClient(
             base_url={
                 "dem": _get_base_url(environment, "dem", Environment.DEM.value),
                 "sign": _get_base_url(environment, "sign", Environment.SIGN.value),
             },
-            httpx_client=httpx.AsyncClient(timeout=timeout)
-            if httpx_client is None
-            else httpx_client,
-            auths={"bearerAuth": AuthBearer(token=token)},
+            httpx_client=(
+                httpx.AsyncClient(timeout=timeout, **_httpx_client_kwargs(options))
+                if httpx_client is None
+                else httpx_client
+            ),
+            auths={
+                "bearerAuth": _bearer_auth(token=token, token_provider=token_provider)
+            },
+            service_httpx_clients={
+                service: httpx.AsyncClient(
+                    timeout=timeout,
+                    **_httpx_client_kwargs(_merge_pool_options(options, pool)),
+                )
+                for service, pool in (pools or {}).items()
+            },
+            retry=retry,
+            hedge=hedge,
+            coalesce_gets=coalesce_gets,
+            idempotency_keys=idempotency_keys,
+            circuit_breakers={
+                service: breaker
+                for service, breaker in (circuit_breakers or {}).items()
+            },
+            rate_limiters=rate_limiters,
+            adaptive_concurrency={
+                service: limiter
+                for service, limiter in (adaptive_concurrency or {}).items()
+            },
+        )
+        self.sign = AsyncSignClient(
+            base_client=self._base_client, document_cache=document_cache
         )
-        self.sign = AsyncSignClient(base_client=self._base_client)
         self.dem = AsyncDemClient(base_client=self._base_client)
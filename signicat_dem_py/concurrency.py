@@ -0,0 +1,314 @@
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import threading
+import typing
+
+K = typing.TypeVar("K")
+T = typing.TypeVar("T")
+
+
+def map_bounded(
+    fn: typing.Callable[[K], T],
+    items: typing.Iterable[K],
+    *,
+    concurrency: int,
+) -> typing.List[typing.Union[T, Exception]]:
+    """
+    Calls `fn` for every item on up to `concurrency` threads and returns the results,
+    or the exception raised for an item, in input order. Each thread runs in a copy of the
+    caller's context, so context variables such as the enclosing `deadline` still apply.
+    """
+    indexed = enumerate(items)
+    results: typing.List[typing.Any] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with lock:
+                try:
+                    index, item = next(indexed)
+                except StopIteration:
+                    return
+                results.append(None)
+            try:
+                results[index] = fn(item)
+            except Exception as e:
+                results[index] = e
+
+    if concurrency <= 1:
+        worker()
+        return results
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, worker)
+            for _ in range(concurrency)
+        ]
+        for future in futures:
+            future.result()
+    return results
+
+
+async def amap_bounded(
+    fn: typing.Callable[[K], typing.Awaitable[T]],
+    items: typing.Iterable[K],
+    *,
+    concurrency: int,
+) -> typing.List[typing.Union[T, Exception]]:
+    """
+    Awaits `fn` for every item with up to `concurrency` calls in flight and returns the
+    results, or the exception raised for an item, in input order
+    """
+    indexed = enumerate(items)
+    results: typing.List[typing.Any] = []
+
+    async def worker() -> None:
+        for index, item in indexed:
+            results.append(None)
+            try:
+                results[index] = await fn(item)
+            except Exception as e:
+                results[index] = e
+
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return results
+
+
+class PrefetchIterator(typing.Generic[T]):
+    """
+    Iterates over `fetch(key)` for every key in order while the following
+    `depth` calls are already running in background threads, each in a copy of
+    the context it was started from
+    """
+
+    def __init__(
+        self,
+        fetch: typing.Callable[[K], T],
+        keys: typing.Iterable[K],
+        *,
+        depth: int,
+    ):
+        self._fetch = typing.cast(typing.Callable[[typing.Any], T], fetch)
+        self._keys: typing.Iterator[typing.Any] = iter(keys)
+        self._executor = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=depth)
+            if depth > 0
+            else None
+        )
+        self._pending: typing.Deque["concurrent.futures.Future[T]"] = (
+            collections.deque()
+        )
+        self._submit(depth)
+
+    def _submit(self, count: int) -> None:
+        if self._executor is None:
+            return
+        for _ in range(count):
+            try:
+                key = next(self._keys)
+            except StopIteration:
+                return
+            self._pending.append(
+                self._executor.submit(contextvars.copy_context().run, self._fetch, key)
+            )
+
+    def __iter__(self) -> "PrefetchIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._executor is None:
+            return self._fetch(next(self._keys))
+        if not self._pending:
+            self.close()
+            raise StopIteration
+        try:
+            result = self._pending[0].result()
+            self._pending.popleft()
+        except BaseException:
+            self.close()
+            raise
+        self._submit(1)
+        return result
+
+    def close(self) -> None:
+        """Cancels every fetch that has not started yet and releases the worker threads"""
+        while self._pending:
+            self._pending.popleft().cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def __enter__(self) -> "PrefetchIterator[T]":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+class AsyncPrefetchIterator(typing.Generic[T]):
+    """
+    Asynchronously iterates over `await fetch(key)` for every key while up to
+    `depth` calls are running as tasks. Results are produced in key order unless
+    `ordered` is `False`, in which case they are produced as soon as they complete.
+    """
+
+    def __init__(
+        self,
+        fetch: typing.Callable[[K], typing.Awaitable[T]],
+        keys: typing.Iterable[K],
+        *,
+        depth: int,
+        ordered: bool = True,
+    ):
+        self._fetch = typing.cast(
+            typing.Callable[[typing.Any], typing.Awaitable[T]], fetch
+        )
+        self._keys: typing.Iterator[typing.Any] = iter(keys)
+        self._depth = depth
+        self._ordered = ordered
+        self._pending: typing.Deque["asyncio.Future[T]"] = collections.deque()
+        self._submit(depth)
+
+    def _submit(self, count: int) -> None:
+        for _ in range(count):
+            try:
+                key = next(self._keys)
+            except StopIteration:
+                return
+            self._pending.append(asyncio.ensure_future(self._fetch(key)))
+
+    def __aiter__(self) -> "AsyncPrefetchIterator[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        if self._depth <= 0:
+            try:
+                key = next(self._keys)
+            except StopIteration:
+                raise StopAsyncIteration
+            return await self._fetch(key)
+        if not self._pending:
+            raise StopAsyncIteration
+        try:
+            if not self._ordered:
+                done, _ = await asyncio.wait(
+                    self._pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                task = done.pop()
+                self._pending.remove(task)
+                self._pending.appendleft(task)
+            result = await self._pending[0]
+            self._pending.popleft()
+        except BaseException:
+            self.close()
+            raise
+        self._submit(1)
+        return result
+
+    def close(self) -> None:
+        """Cancels every fetch that is still running"""
+        while self._pending:
+            task = self._pending.popleft()
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # mark the outcome as retrieved so failed prefetches are not reported
+                task.exception()
+
+    async def __aenter__(self) -> "AsyncPrefetchIterator[T]":
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+async def amerge(
+    iterables: typing.Sequence[typing.AsyncIterable[T]],
+    *,
+    concurrency: int,
+    buffer: int = 1000,
+) -> typing.AsyncIterator[T]:
+    """
+    Drains up to `concurrency` of the async iterables at the same time and yields their
+    items as they arrive. At most `buffer` items are held between producers and consumer.
+    """
+    queue: "asyncio.Queue[typing.Tuple[bool, typing.Any]]" = asyncio.Queue(buffer)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def drain(iterable: typing.AsyncIterable[T]) -> None:
+        try:
+            async with semaphore:
+                async for item in iterable:
+                    await queue.put((False, item))
+        except Exception as e:
+            await queue.put((True, e))
+        else:
+            await queue.put((True, None))
+
+    tasks = [asyncio.ensure_future(drain(iterable)) for iterable in iterables]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            done, value = await queue.get()
+            if not done:
+                yield value
+            elif value is not None:
+                raise value
+            else:
+                remaining -= 1
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key across threads: while a call for a key
+    is running, other callers asking for that key wait for and share its outcome
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: typing.Dict[
+            typing.Hashable, "concurrent.futures.Future[typing.Any]"
+        ] = {}
+
+    def do(self, key: typing.Hashable, fn: typing.Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = concurrent.futures.Future()
+        if not leader:
+            return typing.cast(T, future.result())
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    Collapses concurrent calls for the same key across tasks: while a call for a key is
+    running, other callers asking for that key await and share its outcome. Cancelling one
+    caller does not cancel the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: typing.Dict[typing.Hashable, "asyncio.Future[typing.Any]"] = {}
+
+    async def do(
+        self, key: typing.Hashable, fn: typing.Callable[[], typing.Awaitable[T]]
+    ) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return typing.cast(T, await asyncio.shield(task))
@@ -0,0 +1,87 @@
+import contextlib
+import contextvars
+import httpx
+import time
+import typing
+
+
+_deadline: contextvars.ContextVar[typing.Optional[float]] = contextvars.ContextVar(
+    "signicat_dem_py_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of sending a request once the budget of the enclosing `deadline` is spent"""
+
+    def __init__(self, *, method: str, url: str):
+        super().__init__(f"deadline exceeded, not sending {method} {url}")
+        self.method = method
+        self.url = url
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> typing.Iterator[None]:
+    """
+    Gives the requests made within the block, by any client, a shared budget of `seconds`.
+
+    Each request's timeout is cut to the time remaining, and a request that would start
+    after the budget is spent raises `DeadlineExceeded` instead. Retries are only attempted
+    when their backoff ends before the deadline. A nested deadline can shorten the budget but
+    never extend it. The deadline is held in a context variable, so it follows the code
+    through `await`s and into the tasks it starts.
+
+    Examples:
+    ```py
+    with deadline(5):
+        document = client.sign.upload_document(content_type="application/pdf", data=pdf)
+        collection = client.sign.create_document_collection(documents=[...])
+        session = client.sign.create_signing_session(data=[...])
+    ```
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> typing.Optional[float]:
+    """Seconds left until the enclosing `deadline`, `None` outside of one"""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def _check_deadline(*, method: str, url: str) -> None:
+    """Raises `DeadlineExceeded` when the enclosing deadline has passed"""
+    left = time_remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(method=method, url=url)
+
+
+def _within_deadline(delay: float) -> bool:
+    """Whether waiting `delay` seconds still leaves time before the enclosing deadline"""
+    left = time_remaining()
+    return left is None or delay < left
+
+
+def _clamp_timeout(
+    timeout: httpx._types.TimeoutTypes, *, method: str, url: str
+) -> httpx._types.TimeoutTypes:
+    """
+    Cuts every part of `timeout` to the time left before the enclosing deadline, raising
+    `DeadlineExceeded` when it has passed
+    """
+    left = time_remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded(method=method, url=url)
+    timeout = httpx.Timeout(timeout)
+    return httpx.Timeout(
+        connect=left if timeout.connect is None else min(timeout.connect, left),
+        read=left if timeout.read is None else min(timeout.read, left),
+        write=left if timeout.write is None else min(timeout.write, left),
+        pool=left if timeout.pool is None else min(timeout.pool, left),
+    )
@@ -0,0 +1,199 @@
+import abc
+import collections
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+import typing
+
+from signicat_dem_py.types import models
+
+
+class DocumentCache(abc.ABC):
+    """
+    Remembers the documents already uploaded, keyed by the SHA256 and content type of their
+    content, so that uploading byte-identical content again reuses the stored document
+    instead of sending it.
+
+    Entries older than `ttl` seconds are not reused, so set it below the time the API keeps
+    documents. With `verify`, a document is looked up with `get_document_info` before it is
+    reused, and uploaded again when it no longer exists.
+    """
+
+    def __init__(self, *, ttl: typing.Optional[float] = None, verify: bool = False):
+        self.ttl = ttl
+        self.verify = verify
+
+    @abc.abstractmethod
+    def get(self, sha256: str, *, content_type: str) -> typing.Optional[str]:
+        """Returns the ID of the document stored with this content, if known and fresh"""
+
+    @abc.abstractmethod
+    def put(self, sha256: str, *, content_type: str, document_id: str) -> None:
+        """Records the ID of the document stored with this content"""
+
+    @abc.abstractmethod
+    def discard(self, sha256: str, *, content_type: str) -> None:
+        """Forgets the document stored with this content"""
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at >= self.ttl
+
+
+class MemoryDocumentCache(DocumentCache):
+    """
+    Keeps up to `max_entries` documents in memory, evicting the least recently used.
+
+    Examples:
+    ```py
+    client = Client(
+        token=getenv("API_TOKEN"),
+        document_cache=MemoryDocumentCache(max_entries=1000, ttl=24 * 3600),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        ttl: typing.Optional[float] = None,
+        verify: bool = False,
+    ):
+        super().__init__(ttl=ttl, verify=verify)
+        self.max_entries = max(max_entries, 1)
+        self._entries: "collections.OrderedDict[str, typing.Tuple[str, float]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, sha256: str, *, content_type: str) -> typing.Optional[str]:
+        key = _cache_key(sha256, content_type=content_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[1]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, sha256: str, *, content_type: str, document_id: str) -> None:
+        key = _cache_key(sha256, content_type=content_type)
+        with self._lock:
+            self._entries[key] = (document_id, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, sha256: str, *, content_type: str) -> None:
+        with self._lock:
+            self._entries.pop(_cache_key(sha256, content_type=content_type), None)
+
+
+class FileDocumentCache(DocumentCache):
+    """
+    Keeps up to `max_entries` documents in an SQLite database at `path`, evicting the least
+    recently used. The database survives restarts and can be shared by every process on the
+    host using the same `path`.
+
+    Examples:
+    ```py
+    client = Client(
+        token=getenv("API_TOKEN"),
+        document_cache=FileDocumentCache("/var/cache/signicat/documents.db", ttl=86400),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        path: typing.Union[str, "os.PathLike[str]"],
+        *,
+        max_entries: int = 100_000,
+        ttl: typing.Optional[float] = None,
+        verify: bool = False,
+    ):
+        super().__init__(ttl=ttl, verify=verify)
+        self.path = os.fspath(path)
+        self.max_entries = max(max_entries, 1)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "key TEXT PRIMARY KEY, document_id TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+
+    def get(self, sha256: str, *, content_type: str) -> typing.Optional[str]:
+        key = _cache_key(sha256, content_type=content_type)
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT document_id, stored_at FROM documents WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                connection.execute("DELETE FROM documents WHERE key = ?", (key,))
+                return None
+            connection.execute(
+                "UPDATE documents SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            return typing.cast(str, row[0])
+
+    def put(self, sha256: str, *, content_type: str, document_id: str) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                (_cache_key(sha256, content_type=content_type), document_id, now, now),
+            )
+            connection.execute(
+                "DELETE FROM documents WHERE key NOT IN "
+                "(SELECT key FROM documents ORDER BY used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def discard(self, sha256: str, *, content_type: str) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM documents WHERE key = ?",
+                (_cache_key(sha256, content_type=content_type),),
+            )
+
+    @contextlib.contextmanager
+    def _connect(self) -> typing.Iterator[sqlite3.Connection]:
+        """Opens a connection, committing on success and rolling back on failure"""
+        with contextlib.closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+
+def _cache_key(sha256: str, *, content_type: str) -> str:
+    return f"{content_type.lower()}:{sha256}"
+
+
+def _cached_response(
+    document_id: str, *, sha256: str, content_type: str
+) -> models.PostDocumentResponse:
+    """The upload response of a document reused from the cache"""
+    return models.PostDocumentResponse.model_validate(
+        {
+            "documentId": document_id,
+            "mimeType": content_type,
+            "documentHash": {"hash": sha256, "hashAlgorithm": "SHA256"},
+        }
+    )
+
+
+def _remember_document(
+    cache: typing.Optional[DocumentCache],
+    response: models.PostDocumentResponse,
+    *,
+    sha256: typing.Optional[str],
+    content_type: str,
+) -> None:
+    """Records an uploaded document in `cache`, when its content hash is known"""
+    if cache is not None and sha256 is not None and response.document_id is not None:
+        cache.put(sha256, content_type=content_type, document_id=response.document_id)
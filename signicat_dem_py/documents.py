@@ -0,0 +1,506 @@
+import asyncio
+import contextlib
+import hashlib
+import httpx
+import io
+import mimetypes
+import mmap
+import os
+import stat
+import typing
+
+from make_api_request import (
+    ApiError,
+    AsyncBaseClient,
+    RequestOptions,
+    SyncBaseClient,
+    default_request_options,
+)
+from signicat_dem_py.types import models
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"<?xml", "application/xml"),
+)
+"""Leading bytes of the document formats recognized by `_detect_content_type`"""
+
+DocumentSource = typing.Union[
+    bytes,
+    str,
+    "os.PathLike[str]",
+    typing.BinaryIO,
+    typing.Iterable[bytes],
+    typing.AsyncIterable[bytes],
+]
+
+DownloadDestination = typing.Union[str, "os.PathLike[str]", typing.BinaryIO]
+
+ProgressCallback = typing.Callable[[int, typing.Optional[int]], None]
+"""Called with the number of bytes of the document received so far and its size, if known"""
+
+
+class DocumentStream:
+    """
+    Request body of a streamed document upload, computing its SHA256 while it is sent.
+
+    `source` is `bytes`, a path, a binary file object or an iterable of `bytes` (an async
+    iterable with the async client). A path to a regular file is memory-mapped, and slices of
+    the mapping are hashed and sent without being copied into intermediate `bytes`. Files
+    are read `chunk_size` bytes at a time. Regular files and seekable file objects can be sent
+    again on a retry; pipes, devices and iterables are sent once, as they come.
+
+    Examples:
+    ```py
+    stream = DocumentStream("contract.pdf")
+    client.sign.upload_document_stream(content_type="application/pdf", source=stream)
+    stream.sha256
+    ```
+    """
+
+    def __init__(self, source: DocumentSource, *, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        self.source = source
+        self.chunk_size = max(chunk_size, 1)
+        self.sha256: typing.Optional[str] = None
+        """Hex SHA256 of the content, once it has been sent in full"""
+        self._start: typing.Optional[int] = None
+        self._consumed = False
+        if _is_file(source):
+            file = typing.cast(typing.BinaryIO, source)
+            if file.seekable():
+                self._start = file.tell()
+
+    @property
+    def rewindable(self) -> bool:
+        """Whether the content can be read again, e.g. to retry its upload"""
+        return _is_regular_file(self.source) or self._start is not None
+
+    @property
+    def size(self) -> typing.Optional[int]:
+        """Length of the content in bytes, `None` when it is only known once read"""
+        if _is_regular_file(self.source):
+            return os.stat(typing.cast(str, self.source)).st_size
+        if self._start is not None:
+            file = typing.cast(typing.BinaryIO, self.source)
+            position = file.tell()
+            try:
+                return file.seek(0, io.SEEK_END) - self._start
+            finally:
+                file.seek(position)
+        return None
+
+    def document_hash(self) -> typing.Optional[models.DocumentHash]:
+        """The SHA256 of the content as a `DocumentHash`, once it has been sent in full"""
+        if self.sha256 is None:
+            return None
+        return models.DocumentHash.model_validate(
+            {"hash": self.sha256, "hashAlgorithm": "SHA256"}
+        )
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        self._begin()
+        digest = hashlib.sha256()
+        if _is_regular_file(self.source):
+            with _mapped(typing.cast(str, self.source)) as view:
+                for start in range(0, len(view), self.chunk_size):
+                    piece = view[start : start + self.chunk_size]
+                    digest.update(piece)
+                    yield typing.cast(bytes, piece)
+        elif _is_path(self.source) or _is_file(self.source):
+            with self._open() as file:
+                chunk = file.read(self.chunk_size)
+                while chunk:
+                    digest.update(chunk)
+                    yield chunk
+                    chunk = file.read(self.chunk_size)
+        elif isinstance(self.source, typing.AsyncIterable):
+            raise TypeError(
+                "an async iterable can only be uploaded by the async client"
+            )
+        else:
+            for chunk in typing.cast(typing.Iterable[bytes], self.source):
+                digest.update(chunk)
+                yield chunk
+        self.sha256 = digest.hexdigest()
+
+    async def _aiter(self) -> typing.AsyncIterator[bytes]:
+        self._begin()
+        digest = hashlib.sha256()
+        loop = asyncio.get_running_loop()
+        if _is_regular_file(self.source):
+            with _mapped(typing.cast(str, self.source)) as view:
+                for start in range(0, len(view), self.chunk_size):
+                    piece = view[start : start + self.chunk_size]
+                    await loop.run_in_executor(None, digest.update, piece)
+                    yield typing.cast(bytes, piece)
+        elif _is_path(self.source) or _is_file(self.source):
+
+            def read(file: typing.BinaryIO) -> bytes:
+                chunk = file.read(self.chunk_size)
+                digest.update(chunk)
+                return chunk
+
+            with self._open() as file:
+                chunk = await loop.run_in_executor(None, read, file)
+                while chunk:
+                    yield chunk
+                    chunk = await loop.run_in_executor(None, read, file)
+        elif isinstance(self.source, typing.AsyncIterable):
+            async for chunk in self.source:
+                digest.update(chunk)
+                yield chunk
+        else:
+            for chunk in typing.cast(typing.Iterable[bytes], self.source):
+                digest.update(chunk)
+                yield chunk
+        self.sha256 = digest.hexdigest()
+
+    def _begin(self) -> None:
+        if self._consumed and not self.rewindable:
+            raise RuntimeError("the document stream cannot be read again")
+        self._consumed = True
+        self.sha256 = None
+
+    def _open(self) -> typing.ContextManager[typing.BinaryIO]:
+        if _is_path(self.source):
+            return open(typing.cast(str, self.source), "rb")
+        file = typing.cast(typing.BinaryIO, self.source)
+        if self._start is not None:
+            file.seek(self._start)
+        return contextlib.nullcontext(file)
+
+
+class _AsyncDocumentBody:
+    """Async request body reading a `DocumentStream`, as httpx's async client requires"""
+
+    def __init__(self, stream: DocumentStream):
+        self._stream = stream
+
+    def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        return self._stream._aiter()
+
+
+def _is_path(source: typing.Any) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _is_file(source: typing.Any) -> bool:
+    return hasattr(source, "read")
+
+
+def _is_regular_file(source: typing.Any) -> bool:
+    return _is_path(source) and stat.S_ISREG(os.stat(source).st_mode)
+
+
+@contextlib.contextmanager
+def _mapped(path: str) -> typing.Iterator[memoryview]:
+    """Maps the regular file at `path` into memory, read-only"""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            mapping.close()
+        except BufferError:
+            # slices still held by the transport keep the mapping open until released
+            pass
+
+
+class _MappedFile:
+    """Read-only file object over a memory mapping, reading slices of it without copying"""
+
+    def __init__(self, view: memoryview, *, name: str):
+        self.name = name
+        self._view = view
+        self._position = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size < 0 else self._position + size
+        piece = self._view[self._position : end]
+        self._position += len(piece)
+        return piece
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class _UnsizedFile:
+    """File object exposing only `read`, so that its length is not taken from its stat"""
+
+    def __init__(self, file: typing.BinaryIO):
+        self.name = file.name
+        self._file = file
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+
+@contextlib.contextmanager
+def _multipart_document(data: typing.Any) -> typing.Iterator[typing.Any]:
+    """
+    The file part of `upload_document`: `data` itself, or for an `os.PathLike` the memory
+    mapping of a regular file, or the pipe or device read once, as it comes
+    """
+    if not isinstance(data, os.PathLike):
+        yield data
+    elif _is_regular_file(data):
+        with _mapped(os.fspath(data)) as view:
+            yield _MappedFile(view, name=os.fspath(data))
+    else:
+        with open(data, "rb") as file:
+            yield _UnsizedFile(file)
+
+
+def _content_sha256(source: typing.Any) -> typing.Optional[str]:
+    """
+    Hex SHA256 of `bytes`, a regular file or a seekable file object, which is left at its
+    position, or `None` for content that can only be read once
+    """
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    if _is_regular_file(source):
+        with _mapped(typing.cast(str, source)) as view:
+            return hashlib.sha256(view).hexdigest()
+    if not _is_file(source) or not source.seekable():
+        return None
+    digest = hashlib.sha256()
+    position = source.tell()
+    try:
+        chunk = source.read(DEFAULT_CHUNK_SIZE)
+        while chunk:
+            digest.update(chunk)
+            chunk = source.read(DEFAULT_CHUNK_SIZE)
+    finally:
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def _body_sha256(data: typing.Any) -> typing.Optional[str]:
+    """
+    Hex SHA256 of the document of `upload_document`: `str` content, sent encoded as UTF-8,
+    `bytes`, an `os.PathLike` to a regular file or a seekable file object, which is left at
+    its position. `None` for anything else.
+    """
+    if isinstance(data, str):
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+    return _content_sha256(data)
+
+
+def _detect_content_type(source: typing.Any) -> str:
+    """
+    Content type of a document, guessed from the extension of a path or else from the
+    leading bytes of `bytes`, a regular file or a seekable file object, which is left at its
+    position. Falls back to `application/octet-stream`.
+    """
+    if isinstance(source, DocumentStream):
+        source = source.source
+    if _is_path(source):
+        guessed, _ = mimetypes.guess_type(os.fspath(source))
+        if guessed is not None:
+            return guessed
+        head = b""
+        if _is_regular_file(source):
+            with open(source, "rb") as file:
+                head = file.read(16)
+    elif isinstance(source, bytes):
+        head = source[:16]
+    elif _is_file(source) and source.seekable():
+        position = source.tell()
+        try:
+            head = source.read(16)
+        finally:
+            source.seek(position)
+    else:
+        head = b""
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return "application/octet-stream"
+
+
+def _stream_upload_headers(
+    stream: DocumentStream, *, content_type: str
+) -> typing.Dict[str, str]:
+    """Headers of a streamed upload, with its length when known up front"""
+    headers = {"Content-Type": content_type}
+    size = stream.size
+    if size is not None:
+        headers["Content-Length"] = str(size)
+    return headers
+
+
+def _with_document_hash(
+    response: models.PostDocumentResponse, stream: DocumentStream
+) -> models.PostDocumentResponse:
+    """Fills in the hash of an uploaded document when the API did not return it"""
+    if response.document_hash is None:
+        response.document_hash = stream.document_hash()
+    return response
+
+
+def _resume_offset(dest: DownloadDestination, *, resume: bool) -> int:
+    """Number of bytes of the document already in `dest` when resuming a download"""
+    if not resume:
+        return 0
+    if _is_path(dest):
+        path = typing.cast(str, dest)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+    return typing.cast(typing.BinaryIO, dest).tell()
+
+
+def _range_headers(offset: int) -> typing.Dict[str, str]:
+    return {"Range": f"bytes={offset}-"} if offset > 0 else {}
+
+
+def _is_complete(response: httpx.Response, *, offset: int) -> bool:
+    """Whether a resumed download was refused because `dest` already holds the document"""
+    if response.status_code != 416 or offset == 0:
+        return False
+    _, _, total = response.headers.get("Content-Range", "").rpartition("/")
+    return total == str(offset)
+
+
+def _download_start(
+    response: httpx.Response, *, offset: int
+) -> typing.Tuple[int, typing.Optional[int]]:
+    """
+    Returns the offset at which the response body starts within the document, `offset` for
+    a partial response and zero for a full one, and the size of the document when known
+    """
+    if response.status_code == 206:
+        _, _, total = response.headers.get("Content-Range", "").rpartition("/")
+        return offset, int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length")
+    if length is None or not length.isdigit() or "Content-Encoding" in response.headers:
+        return 0, None
+    return 0, int(length)
+
+
+def _open_destination(
+    dest: DownloadDestination, *, offset: int, start: int
+) -> typing.ContextManager[typing.BinaryIO]:
+    """
+    Opens `dest` for writing at `start`: appending to the `offset` bytes already there, or
+    replacing them when the download starts over
+    """
+    if _is_path(dest):
+        return open(typing.cast(str, dest), "ab" if start else "wb")
+    file = typing.cast(typing.BinaryIO, dest)
+    if offset and not start:
+        file.seek(file.tell() - offset)
+        file.truncate()
+    return contextlib.nullcontext(file)
+
+
+def _download(
+    base_client: SyncBaseClient,
+    *,
+    path: str,
+    service_name: str,
+    auth_names: typing.Optional[typing.List[str]],
+    dest: DownloadDestination,
+    resume: bool,
+    progress: typing.Optional[ProgressCallback],
+    chunk_size: int,
+    request_options: typing.Optional[RequestOptions],
+) -> int:
+    """Streams the body of a `GET` request to `dest` and returns the size of the document"""
+    offset = _resume_offset(dest, resume=resume)
+    response = base_client.stream_request(
+        method="GET",
+        path=path,
+        service_name=service_name,
+        auth_names=auth_names,
+        headers=_range_headers(offset),
+        cast_to=bytes,
+        request_options=request_options or default_request_options(),
+    ).response
+    try:
+        if _is_complete(response, offset=offset):
+            return offset
+        if not response.is_success:
+            response.read()
+            raise ApiError(response=response)
+        received, total = _download_start(response, offset=offset)
+        with _open_destination(dest, offset=offset, start=received) as file:
+            if progress is not None:
+                progress(received, total)
+            for chunk in response.iter_bytes(chunk_size):
+                file.write(chunk)
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+        return received
+    finally:
+        response.close()
+
+
+async def _adownload(
+    base_client: AsyncBaseClient,
+    *,
+    path: str,
+    service_name: str,
+    auth_names: typing.Optional[typing.List[str]],
+    dest: DownloadDestination,
+    resume: bool,
+    progress: typing.Optional[ProgressCallback],
+    chunk_size: int,
+    request_options: typing.Optional[RequestOptions],
+) -> int:
+    """
+    Streams the body of a `GET` request to `dest` and returns the size of the document,
+    writing to `dest` in an executor
+    """
+    offset = _resume_offset(dest, resume=resume)
+    response = (
+        await base_client.stream_request(
+            method="GET",
+            path=path,
+            service_name=service_name,
+            auth_names=auth_names,
+            headers=_range_headers(offset),
+            cast_to=bytes,
+            request_options=request_options or default_request_options(),
+        )
+    ).response
+    try:
+        if _is_complete(response, offset=offset):
+            return offset
+        if not response.is_success:
+            await response.aread()
+            raise ApiError(response=response)
+        loop = asyncio.get_running_loop()
+        received, total = _download_start(response, offset=offset)
+        with _open_destination(dest, offset=offset, start=received) as file:
+            if progress is not None:
+                progress(received, total)
+            async for chunk in response.aiter_bytes(chunk_size):
+                await loop.run_in_executor(None, file.write, chunk)
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+        return received
+    finally:
+        await response.aclose()
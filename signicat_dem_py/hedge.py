@@ -0,0 +1,74 @@
+import collections
+import math
+import threading
+import typing
+
+
+class HedgePolicy:
+    """
+    Sends a second copy of a slow `GET` request and keeps whichever response arrives first.
+
+    The policy records the latency of the requests it applies to. Once `min_samples`
+    latencies are known, a request still unanswered after the `percentile` of the recent
+    latencies (or after `delay` seconds, when given) is hedged: an identical request is sent,
+    the first response to arrive is returned and the other request is cancelled.
+
+    Hedges are limited to `budget` times the number of requests (5% by default), so that
+    hedging adds a bounded amount of load even when the service slows down as a whole.
+
+    Examples:
+    ```py
+    hedge = HedgePolicy(percentile=90)
+    client.sign.get_signing_session(session_id="...", request_options={"hedge": hedge})
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window_size: int = 1000,
+        delay: typing.Optional[float] = None,
+    ):
+        self.percentile = min(max(percentile, 0.0), 100.0)
+        self.budget = budget
+        self.min_samples = max(min_samples, 1)
+        self.delay = delay
+        self._latencies: typing.Deque[float] = collections.deque(
+            maxlen=max(window_size, self.min_samples)
+        )
+        self._cached_delay: typing.Optional[float] = None
+        self._samples_since_update = 0
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> typing.Optional[float]:
+        """Seconds after which a request is hedged, `None` while there are too few samples"""
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            if self._cached_delay is None or self._samples_since_update >= 16:
+                ordered = sorted(self._latencies)
+                index = math.ceil(self.percentile / 100 * len(ordered)) - 1
+                self._cached_delay = ordered[min(max(index, 0), len(ordered) - 1)]
+                self._samples_since_update = 0
+            return self._cached_delay
+
+    def record(self, latency: float) -> None:
+        """Records the latency of a request and earns hedging budget"""
+        with self._lock:
+            self._latencies.append(latency)
+            self._samples_since_update += 1
+            self._credit = min(self._credit + self.budget, max(self.budget * 100, 1.0))
+
+    def try_hedge(self) -> bool:
+        """Spends budget on a hedge, returning whether the hedge may be sent"""
+        with self._lock:
+            if self._credit + 1e-9 < 1:
+                return False
+            self._credit -= 1
+            return True
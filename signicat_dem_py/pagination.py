@@ -0,0 +1,66 @@
+import itertools
+import typing
+
+from signicat_dem_py.types import models
+
+
+def signing_session_offsets(
+    first_page: models.PaginatedSigningSessionResponse, *, offset: int
+) -> typing.Iterable[int]:
+    """
+    Returns the offsets of the pages following `first_page`, which was requested at `offset`.
+
+    The offsets are bounded by `total` when the API reports it; otherwise they are
+    unbounded and the caller stops at the first short page.
+    """
+    data = first_page.data or []
+    page_size = first_page.limit or len(data)
+    if page_size <= 0 or len(data) < page_size:
+        return ()
+    if first_page.total is not None:
+        return range(offset + page_size, first_page.total, page_size)
+    return itertools.count(offset + page_size, page_size)
+
+
+def is_last_signing_session_page(
+    page: models.PaginatedSigningSessionResponse, *, page_size: int
+) -> bool:
+    """Whether `page` is the final page of a signing session listing"""
+    data = page.data or []
+    return len(data) == 0 or len(data) < page_size
+
+
+def query_page_records(
+    page: typing.Dict[str, typing.Any],
+) -> typing.List[models.RecordResponse]:
+    """
+    Extracts the records from a page returned by `POST /records/query`, which is either
+    a plain page (`content`) or a HAL page (`_embedded`)
+    """
+    records = page.get("content")
+    embedded = page.get("_embedded")
+    if not isinstance(records, list) and isinstance(embedded, dict):
+        records = next((v for v in embedded.values() if isinstance(v, list)), None)
+    if not isinstance(records, list):
+        return []
+    return [models.RecordResponse.model_validate(record) for record in records]
+
+
+def is_last_query_page(
+    page: typing.Dict[str, typing.Any],
+    *,
+    page_number: int,
+    page_size: int,
+    record_count: int,
+) -> bool:
+    """Whether `page` is the final page of a `POST /records/query` result"""
+    info = page.get("page")
+    if not isinstance(info, dict):
+        info = page
+    if page.get("last") is True or record_count == 0:
+        return True
+    total_pages = info.get("totalPages")
+    if isinstance(total_pages, int) and page_number + 1 >= total_pages:
+        return True
+    size = info.get("size")
+    return record_count < (size if isinstance(size, int) and size > 0 else page_size)
@@ -0,0 +1,52 @@
+import httpx
+import typing
+import typing_extensions
+
+
+class PoolOptions(typing_extensions.TypedDict):
+    """
+    Connection pool settings. HTTP/2 requires the `h2` package (`pip install httpx[http2]`).
+    """
+
+    max_connections: typing_extensions.NotRequired[typing.Optional[int]]
+    """
+    Maximum number of open connections, `None` for no limit
+    """
+    max_keepalive_connections: typing_extensions.NotRequired[typing.Optional[int]]
+    """
+    Maximum number of idle connections kept open, `None` for no limit
+    """
+    keepalive_expiry: typing_extensions.NotRequired[typing.Optional[float]]
+    """
+    Seconds an idle connection is kept open, `None` to keep it open indefinitely
+    """
+    http2: typing_extensions.NotRequired[bool]
+    """
+    Whether HTTP/2 is negotiated with the server
+    """
+
+
+DEFAULT_POOL_OPTIONS: PoolOptions = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 5.0,
+    "http2": False,
+}
+
+
+def _merge_pool_options(*options: typing.Optional[PoolOptions]) -> PoolOptions:
+    merged: PoolOptions = {**DEFAULT_POOL_OPTIONS}
+    for option in options:
+        merged.update(option or {})
+    return merged
+
+
+def _httpx_client_kwargs(options: PoolOptions) -> typing.Dict[str, typing.Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=options.get("max_connections"),
+            max_keepalive_connections=options.get("max_keepalive_connections"),
+            keepalive_expiry=options.get("keepalive_expiry"),
+        ),
+        "http2": options.get("http2", False),
+    }
@@ -0,0 +1,98 @@
+import asyncio
+import fnmatch
+import threading
+import time
+import typing
+
+
+class RateLimiter:
+    """
+    Token bucket admitting `rate` requests per second on average, with bursts of up to
+    `burst` requests.
+
+    Each caller reserves a token as it arrives, and the bucket may go into debt, so callers
+    are admitted in the order they arrived, whether they block (`acquire`) or await
+    (`aacquire`). One limiter can be shared by any number of threads, tasks and clients.
+
+    Examples:
+    ```py
+    client = Client(
+        token=getenv("API_TOKEN"),
+        rate_limiters={
+            "dem": RateLimiter(rate=50),
+            "sign:POST /documents": RateLimiter(rate=5, burst=10),
+        },
+    )
+    ```
+    """
+
+    def __init__(self, *, rate: float, burst: typing.Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Takes `tokens` from the bucket and returns the seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= tokens
+            return max(-self._tokens / self.rate, 0.0)
+
+    def refund(self, tokens: float = 1) -> None:
+        """Returns reserved tokens that were not used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + tokens)
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Waits until a request may be sent"""
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.refund()
+            raise
+
+
+def _matching_rate_limiters(
+    rate_limiters: typing.Dict[str, RateLimiter],
+    *,
+    service_name: typing.Optional[str],
+    method: str,
+    path: str,
+) -> typing.List[RateLimiter]:
+    """
+    Returns the limiters applying to a request: the one keyed by its service and those
+    keyed by `<service>:<METHOD> <path pattern>` matching its method and path
+    """
+    service = service_name or ""
+    path = "/" + path.lstrip("/")
+    limiters: typing.List[RateLimiter] = []
+    for key, limiter in rate_limiters.items():
+        key_service, _, endpoint = key.partition(":")
+        if key_service != service:
+            continue
+        if not endpoint:
+            limiters.append(limiter)
+            continue
+        key_method, _, pattern = endpoint.strip().partition(" ")
+        if key_method.upper() == method.upper() and fnmatch.fnmatchcase(
+            path, "/" + pattern.strip().lstrip("/")
+        ):
+            limiters.append(limiter)
+    return limiters
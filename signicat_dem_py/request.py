@@ -0,0 +1,39 @@
+import make_api_request
+import typing
+import typing_extensions
+
+from signicat_dem_py.hedge import HedgePolicy
+from signicat_dem_py.retry import RetryPolicy
+
+
+class RequestOptions(make_api_request.RequestOptions):
+    """
+    Additional options for customizing request behavior.
+
+    Attributes:
+        timeout: Number of seconds to await an API call before timing out
+        additional_headers: Extra headers to include in the request
+        additional_params: Extra query parameters to include in the request
+        retry: Retry policy for this request, overriding the client's; `None` disables retries
+        idempotent: Whether the request may safely be retried, overriding the default
+            derived from its HTTP method
+        idempotency_key: Key sent in the `Idempotency-Key` header of this `POST` request,
+            instead of a generated one; the request may then be retried
+        hedge: Hedge policy for this `GET` request, overriding the client's; `None` disables
+            hedging
+        coalesce: Whether this `GET` request shares the response of an identical request
+            already in flight, overriding the client's `coalesce_gets`
+    """
+
+    retry: typing_extensions.NotRequired[typing.Optional[RetryPolicy]]
+    idempotent: typing_extensions.NotRequired[bool]
+    idempotency_key: typing_extensions.NotRequired[str]
+    hedge: typing_extensions.NotRequired[typing.Optional[HedgePolicy]]
+    coalesce: typing_extensions.NotRequired[bool]
+
+
+def _idempotent_by_default(
+    request_options: typing.Optional[make_api_request.RequestOptions],
+) -> RequestOptions:
+    """Marks a request as safe to retry, unless its options say otherwise"""
+    return typing.cast(RequestOptions, {"idempotent": True, **(request_options or {})})
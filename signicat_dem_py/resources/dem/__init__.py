@@ -1,4 +1,12 @@
 from .client import AsyncDemClient, DemClient
+from .relations import RecordGraph
+from .writer import AsyncDemRecordWriter, DemRecordWriter
 
 
-__all__ = ["AsyncDemClient", "DemClient"]
+__all__ = [
+    "AsyncDemClient",
+    "AsyncDemRecordWriter",
+    "DemClient",
+    "DemRecordWriter",
+    "RecordGraph",
+]
@@ -1,22 +1,51 @@
+import asyncio
+import datetime
+import itertools
+import time
 import typing
 
 from make_api_request import (
+    ApiError,
     AsyncBaseClient,
     BinaryResponse,
     QueryParams,
-    RequestOptions,
     SyncBaseClient,
     default_request_options,
     encode_query_param,
     to_encodable,
     type_utils,
 )
+from signicat_dem_py import pagination
+from signicat_dem_py.adaptive import _bulk_concurrency
+from signicat_dem_py.concurrency import (
+    AsyncPrefetchIterator,
+    AsyncSingleFlight,
+    PrefetchIterator,
+    SingleFlight,
+    amap_bounded,
+    amerge,
+    map_bounded,
+)
+from signicat_dem_py.documents import (
+    DEFAULT_CHUNK_SIZE,
+    DownloadDestination,
+    ProgressCallback,
+    _adownload,
+    _download,
+)
+from signicat_dem_py.request import RequestOptions
+from signicat_dem_py.resources.dem import relations, sharding
 from signicat_dem_py.types import models, params
 
 
+REJECTED_CHUNK_STATUSES: typing.FrozenSet[int] = frozenset({400, 413, 422})
+"""Statuses of a bulk update rejected for its chunk, which is then updated ID by ID"""
+
+
 class DemClient:
     def __init__(self, *, base_client: SyncBaseClient):
         self._base_client = base_client
+        self._record_flight = SingleFlight()
 
     def signicat(
         self, *, request_options: typing.Optional[RequestOptions] = None
@@ -181,6 +210,97 @@ class DemClient:
             request_options=request_options or default_request_options(),
         )
 
+    def get_records(
+        self,
+        *,
+        ids: typing.Iterable[str],
+        concurrency: int = 8,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Dict[str, typing.Union[models.RecordResponse, Exception]]:
+        """
+        Get many records by ID
+
+        Retrieves every distinct ID with up to `concurrency` requests in flight. When another
+        thread or task is already retrieving one of the IDs through this client, the record
+        is taken from that request instead of being requested again.
+
+        GET /records/{id}
+
+        Args:
+            ids: Unique identifiers of the records to retrieve.
+            concurrency: Maximum number of requests in flight at the same time.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The record, or the exception raised while retrieving it, for every distinct ID
+
+        Examples:
+        ```py
+        client.dem.get_records(
+            ids=[
+                "123e4567-e89b-12d3-a456-556642440000",
+                "123e4567-e89b-12d3-a456-556642440001",
+            ]
+        )
+        ```
+        """
+        unique_ids = list(dict.fromkeys(ids))
+
+        def get(id: str) -> models.RecordResponse:
+            return self._record_flight.do(
+                id,
+                lambda: self.get_record_by_id(id=id, request_options=request_options),
+            )
+
+        results = map_bounded(get, unique_ids, concurrency=concurrency)
+        return dict(zip(unique_ids, results))
+
+    def walk_relations(
+        self,
+        *,
+        root_id: str,
+        max_depth: int = 5,
+        type_filter: typing.Optional[typing.Collection[str]] = None,
+        concurrency: int = 8,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> relations.RecordGraph:
+        """
+        Walk the relation graph of a record
+
+        Retrieves the record `root_id` and, breadth-first, the records it relates to up to
+        `max_depth` relations away. Each level is retrieved as one concurrent batch, every record
+        is retrieved at most once and cycles are not followed again.
+
+        GET /records/{id}
+
+        Args:
+            root_id: Unique identifier of the record the walk starts at.
+            max_depth: Maximum number of relations between the root and a retrieved record.
+            type_filter: Relation types to follow, all relations are followed when omitted.
+            concurrency: Maximum number of requests in flight at the same time.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The retrieved records and the relations between them
+
+        Examples:
+        ```py
+        client.dem.walk_relations(
+            root_id="123e4567-e89b-12d3-a456-556642440000", max_depth=3, type_filter=["GDPR"]
+        )
+        ```
+        """
+        graph = relations.RecordGraph(root_id=root_id)
+        level = [root_id]
+        for _ in range(max_depth + 1):
+            fetched = self.get_records(
+                ids=level, concurrency=concurrency, request_options=request_options
+            )
+            level = graph.add_level(fetched, type_filter=type_filter)
+            if not level:
+                break
+        return graph
+
     def generate_report(
         self, *, id: str, request_options: typing.Optional[RequestOptions] = None
     ) -> BinaryResponse:
@@ -215,6 +335,62 @@ class DemClient:
             request_options=request_options or default_request_options(),
         )
 
+    def download_report(
+        self,
+        *,
+        id: str,
+        dest: DownloadDestination,
+        resume: bool = False,
+        progress: typing.Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> int:
+        """
+        Downloads a generated PDF report for a record
+
+        Streams the generated PDF report to `dest`, a path or a writable binary file
+        object, `chunk_size` bytes at a time, so that it is never held in memory as a
+        whole. With `resume`, only the part missing from `dest` is requested, through a
+        `Range` header; when the server sends the whole report instead, `dest` is
+        rewritten. `progress` is called with the number of bytes received so far and the
+        total size, when known.
+
+        GET /reports/{id}
+
+        Args:
+            id: Unique identifier for a record.
+            dest: Path or writable binary file object the report is written to
+            resume: Whether to continue a partial download already in `dest`
+            progress: Callback receiving the bytes received so far and the total size
+            chunk_size: Maximum number of bytes held in memory at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The size of the report in bytes
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        client.dem.download_report(
+            id="123e4567-e89b-12d3-a456-556642440000", dest="downloads/file.pdf"
+        )
+        ```
+        """
+        return _download(
+            self._base_client,
+            path=f"/reports/{id}",
+            service_name="dem",
+            auth_names=None,
+            dest=dest,
+            resume=resume,
+            progress=progress,
+            chunk_size=chunk_size,
+            request_options=request_options,
+        )
+
     def set_expiry_dates(
         self,
         *,
@@ -302,6 +478,84 @@ class DemClient:
             request_options=request_options or default_request_options(),
         )
 
+    def set_expiry_for_ids(
+        self,
+        *,
+        ids: typing.Iterable[str],
+        ttl: int,
+        chunk_size: int = 500,
+        concurrency: int = 8,
+        id_field: str = "id",
+        rejected_statuses: typing.Collection[int] = REJECTED_CHUNK_STATUSES,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Dict[str, typing.Optional[Exception]]:
+        """
+        Update the expiry of many records by ID
+
+        Groups the IDs into chunks of `chunk_size` and updates each chunk with a single
+        `PATCH /records` whose query matches the chunk with an `in` condition on `id_field`.
+        The IDs of a chunk the server rejects with one of `rejected_statuses` are updated one by
+        one through `PATCH /records/{id}` with up to `concurrency` requests in flight; any other
+        error of a chunk, such as a `429` or `5xx`, is returned for each of its IDs instead.
+
+        PATCH /records
+
+        Args:
+            ids: Unique identifiers of the records to update.
+            ttl: int
+            chunk_size: Maximum number of IDs matched by a single bulk update.
+            concurrency: Maximum number of requests in flight at the same time.
+            id_field: Field the `in` condition of the bulk update applies to.
+            rejected_statuses: Statuses of a bulk update that make its IDs be updated one by one.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            `None` for every updated ID, or the exception raised while updating it
+
+        Examples:
+        ```py
+        client.dem.set_expiry_for_ids(
+            ids=["123e4567-e89b-12d3-a456-556642440000"], ttl=365
+        )
+        ```
+        """
+
+        def update_chunk(chunk: typing.List[str]) -> str:
+            return self.set_expiry_dates(
+                query={"and_": [{"field": id_field, "operator": "in", "value": chunk}]},
+                ttl=ttl,
+                request_options=request_options,
+            )
+
+        def update_one(id: str) -> None:
+            self.set_expiry_date(id=id, ttl=ttl, request_options=request_options)
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        unique_ids = list(dict.fromkeys(ids))
+        chunks = [
+            unique_ids[i : i + chunk_size]
+            for i in range(0, len(unique_ids), chunk_size)
+        ]
+        results: typing.Dict[str, typing.Optional[Exception]] = {}
+        rejected: typing.List[str] = []
+        for chunk, outcome in zip(
+            chunks, map_bounded(update_chunk, chunks, concurrency=concurrency)
+        ):
+            if (
+                isinstance(outcome, ApiError)
+                and outcome.status_code in rejected_statuses
+            ):
+                rejected.extend(chunk)
+            else:
+                error = outcome if isinstance(outcome, Exception) else None
+                results.update((id, error) for id in chunk)
+        for id, error in zip(
+            rejected, map_bounded(update_one, rejected, concurrency=concurrency)
+        ):
+            results[id] = error
+        return results
+
     def post_new_record(
         self,
         *,
@@ -365,6 +619,57 @@ class DemClient:
             request_options=request_options or default_request_options(),
         )
 
+    def post_records_bulk(
+        self,
+        *,
+        records: typing.Iterable[params.RecordRequest],
+        concurrency: int = 8,
+        records_per_second: typing.Optional[float] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.List[typing.Union[models.RecordResponse, Exception]]:
+        """
+        Create many records
+
+        Posts every record with up to `concurrency` requests in flight over the pooled connections.
+        When `records_per_second` is set, requests are paced to stay at that throughput target.
+        A record that fails does not stop the others; its exception is returned in its place.
+
+        POST /records
+
+        Args:
+            records: The records to create.
+            concurrency: Maximum number of requests in flight at the same time.
+            records_per_second: Optional throughput target the requests are paced to.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The created record, or the exception raised while creating it, for every input record in input order
+
+        Examples:
+        ```py
+        client.dem.post_records_bulk(
+            records=[
+                {"core_data": {}, "metadata": {}, "ttl": 123, "type_": "LOG_IN"},
+                {"core_data": {}, "metadata": {}, "ttl": 123, "type_": "SIGNATURE"},
+            ],
+            concurrency=16,
+        )
+        ```
+        """
+        started = time.monotonic()
+
+        def post(
+            indexed: typing.Tuple[int, params.RecordRequest],
+        ) -> models.RecordResponse:
+            index, record = indexed
+            if records_per_second:
+                delay = started + index / records_per_second - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            return self.post_new_record(**record, request_options=request_options)
+
+        return map_bounded(post, enumerate(records), concurrency=concurrency)
+
     def query(
         self,
         *,
@@ -436,10 +741,82 @@ class DemClient:
             request_options=request_options or default_request_options(),
         )
 
+    def iter_query(
+        self,
+        *,
+        data: typing.Union[
+            typing.Optional[params.QueryRequestBody], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        page_size: int = 100,
+        page: int = 0,
+        prefetch: int = 1,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Iterator[models.RecordResponse]:
+        """
+        Iterate over every record matching a query
+
+        Runs the query page by page and yields the matching records one at a time, so only the pages
+        in flight are held in memory. While a page is being consumed, the following `prefetch` pages
+        are already being retrieved in background threads.
+
+        POST /records/query
+
+        Args:
+            data: An object containing up to three lists of <code>QueryCondition</code> objects. If no body is included, every record is returned.
+            page_size: Number of records requested per page.
+            page: Number of the first page to retrieve.
+            prefetch: Number of pages to retrieve ahead of the page being consumed, `0` disables prefetching.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            An iterator over every matching record
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        for record in client.dem.iter_query(
+            data={"and_": [{"field": "metadata.type", "operator": "eq", "value": "LOG_IN"}]},
+            page_size=500,
+        ):
+            print(record.id)
+        ```
+        """
+
+        def fetch(page_number: int) -> typing.Tuple[int, typing.Dict[str, typing.Any]]:
+            result = self.query(
+                data=data,
+                page=page_number,
+                size=page_size,
+                request_options=request_options,
+            )
+            return page_number, result
+
+        pages = PrefetchIterator(fetch, itertools.count(page), depth=prefetch)
+        with pages:
+            for page_number, result in pages:
+                records = pagination.query_page_records(result)
+                yield from records
+                if pagination.is_last_query_page(
+                    result,
+                    page_number=page_number,
+                    page_size=page_size,
+                    record_count=len(records),
+                ):
+                    break
+
 
 class AsyncDemClient:
     def __init__(self, *, base_client: AsyncBaseClient):
         self._base_client = base_client
+        self._record_flight = AsyncSingleFlight()
+
+    def _concurrency(self, concurrency: typing.Optional[int]) -> int:
+        return _bulk_concurrency(
+            self._base_client, service_name="dem", concurrency=concurrency
+        )
 
     async def signicat(
         self, *, request_options: typing.Optional[RequestOptions] = None
@@ -604,6 +981,101 @@ class AsyncDemClient:
             request_options=request_options or default_request_options(),
         )
 
+    async def get_records(
+        self,
+        *,
+        ids: typing.Iterable[str],
+        concurrency: typing.Optional[int] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Dict[str, typing.Union[models.RecordResponse, Exception]]:
+        """
+        Get many records by ID
+
+        Retrieves every distinct ID with up to `concurrency` requests in flight. When another
+        thread or task is already retrieving one of the IDs through this client, the record
+        is taken from that request instead of being requested again.
+
+        GET /records/{id}
+
+        Args:
+            ids: Unique identifiers of the records to retrieve.
+            concurrency: Maximum number of requests in flight at the same time. Defaults to the
+                `max_limit` of the service's adaptive concurrency limiter, if any, or 8.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The record, or the exception raised while retrieving it, for every distinct ID
+
+        Examples:
+        ```py
+        await client.dem.get_records(
+            ids=[
+                "123e4567-e89b-12d3-a456-556642440000",
+                "123e4567-e89b-12d3-a456-556642440001",
+            ]
+        )
+        ```
+        """
+        unique_ids = list(dict.fromkeys(ids))
+
+        async def get(id: str) -> models.RecordResponse:
+            return await self._record_flight.do(
+                id,
+                lambda: self.get_record_by_id(id=id, request_options=request_options),
+            )
+
+        results = await amap_bounded(
+            get, unique_ids, concurrency=self._concurrency(concurrency)
+        )
+        return dict(zip(unique_ids, results))
+
+    async def walk_relations(
+        self,
+        *,
+        root_id: str,
+        max_depth: int = 5,
+        type_filter: typing.Optional[typing.Collection[str]] = None,
+        concurrency: typing.Optional[int] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> relations.RecordGraph:
+        """
+        Walk the relation graph of a record
+
+        Retrieves the record `root_id` and, breadth-first, the records it relates to up to
+        `max_depth` relations away. Each level is retrieved as one concurrent batch, every record
+        is retrieved at most once and cycles are not followed again.
+
+        GET /records/{id}
+
+        Args:
+            root_id: Unique identifier of the record the walk starts at.
+            max_depth: Maximum number of relations between the root and a retrieved record.
+            type_filter: Relation types to follow, all relations are followed when omitted.
+            concurrency: Maximum number of requests in flight at the same time. Defaults to the
+                `max_limit` of the service's adaptive concurrency limiter, if any, or 8.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The retrieved records and the relations between them
+
+        Examples:
+        ```py
+        await client.dem.walk_relations(
+            root_id="123e4567-e89b-12d3-a456-556642440000", max_depth=3, type_filter=["GDPR"]
+        )
+        ```
+        """
+        graph = relations.RecordGraph(root_id=root_id)
+        level = [root_id]
+        for _ in range(max_depth + 1):
+            fetched = await self.get_records(
+                ids=level, concurrency=concurrency, request_options=request_options
+            )
+            level = graph.add_level(fetched, type_filter=type_filter)
+            if not level:
+                break
+        return graph
+
     async def generate_report(
         self, *, id: str, request_options: typing.Optional[RequestOptions] = None
     ) -> BinaryResponse:
@@ -638,6 +1110,62 @@ class AsyncDemClient:
             request_options=request_options or default_request_options(),
         )
 
+    async def download_report(
+        self,
+        *,
+        id: str,
+        dest: DownloadDestination,
+        resume: bool = False,
+        progress: typing.Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> int:
+        """
+        Downloads a generated PDF report for a record
+
+        Streams the generated PDF report to `dest`, a path or a writable binary file
+        object, `chunk_size` bytes at a time, so that it is never held in memory as a
+        whole. With `resume`, only the part missing from `dest` is requested, through a
+        `Range` header; when the server sends the whole report instead, `dest` is
+        rewritten. `progress` is called with the number of bytes received so far and the
+        total size, when known.
+
+        GET /reports/{id}
+
+        Args:
+            id: Unique identifier for a record.
+            dest: Path or writable binary file object the report is written to
+            resume: Whether to continue a partial download already in `dest`
+            progress: Callback receiving the bytes received so far and the total size
+            chunk_size: Maximum number of bytes held in memory at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The size of the report in bytes
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        await client.dem.download_report(
+            id="123e4567-e89b-12d3-a456-556642440000", dest="downloads/file.pdf"
+        )
+        ```
+        """
+        return await _adownload(
+            self._base_client,
+            path=f"/reports/{id}",
+            service_name="dem",
+            auth_names=None,
+            dest=dest,
+            resume=resume,
+            progress=progress,
+            chunk_size=chunk_size,
+            request_options=request_options,
+        )
+
     async def set_expiry_dates(
         self,
         *,
@@ -727,6 +1255,86 @@ class AsyncDemClient:
             request_options=request_options or default_request_options(),
         )
 
+    async def set_expiry_for_ids(
+        self,
+        *,
+        ids: typing.Iterable[str],
+        ttl: int,
+        chunk_size: int = 500,
+        concurrency: typing.Optional[int] = None,
+        id_field: str = "id",
+        rejected_statuses: typing.Collection[int] = REJECTED_CHUNK_STATUSES,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Dict[str, typing.Optional[Exception]]:
+        """
+        Update the expiry of many records by ID
+
+        Groups the IDs into chunks of `chunk_size` and updates each chunk with a single
+        `PATCH /records` whose query matches the chunk with an `in` condition on `id_field`.
+        The IDs of a chunk the server rejects with one of `rejected_statuses` are updated one by
+        one through `PATCH /records/{id}` with up to `concurrency` requests in flight; any other
+        error of a chunk, such as a `429` or `5xx`, is returned for each of its IDs instead.
+
+        PATCH /records
+
+        Args:
+            ids: Unique identifiers of the records to update.
+            ttl: int
+            chunk_size: Maximum number of IDs matched by a single bulk update.
+            concurrency: Maximum number of requests in flight at the same time. Defaults to the
+                `max_limit` of the service's adaptive concurrency limiter, if any, or 8.
+            id_field: Field the `in` condition of the bulk update applies to.
+            rejected_statuses: Statuses of a bulk update that make its IDs be updated one by one.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            `None` for every updated ID, or the exception raised while updating it
+
+        Examples:
+        ```py
+        await client.dem.set_expiry_for_ids(
+            ids=["123e4567-e89b-12d3-a456-556642440000"], ttl=365
+        )
+        ```
+        """
+
+        async def update_chunk(chunk: typing.List[str]) -> str:
+            return await self.set_expiry_dates(
+                query={"and_": [{"field": id_field, "operator": "in", "value": chunk}]},
+                ttl=ttl,
+                request_options=request_options,
+            )
+
+        async def update_one(id: str) -> None:
+            await self.set_expiry_date(id=id, ttl=ttl, request_options=request_options)
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        concurrency = self._concurrency(concurrency)
+        unique_ids = list(dict.fromkeys(ids))
+        chunks = [
+            unique_ids[i : i + chunk_size]
+            for i in range(0, len(unique_ids), chunk_size)
+        ]
+        results: typing.Dict[str, typing.Optional[Exception]] = {}
+        rejected: typing.List[str] = []
+        for chunk, outcome in zip(
+            chunks, await amap_bounded(update_chunk, chunks, concurrency=concurrency)
+        ):
+            if (
+                isinstance(outcome, ApiError)
+                and outcome.status_code in rejected_statuses
+            ):
+                rejected.extend(chunk)
+            else:
+                error = outcome if isinstance(outcome, Exception) else None
+                results.update((id, error) for id in chunk)
+        for id, error in zip(
+            rejected, await amap_bounded(update_one, rejected, concurrency=concurrency)
+        ):
+            results[id] = error
+        return results
+
     async def post_new_record(
         self,
         *,
@@ -792,6 +1400,60 @@ class AsyncDemClient:
             request_options=request_options or default_request_options(),
         )
 
+    async def post_records_bulk(
+        self,
+        *,
+        records: typing.Iterable[params.RecordRequest],
+        concurrency: typing.Optional[int] = None,
+        records_per_second: typing.Optional[float] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.List[typing.Union[models.RecordResponse, Exception]]:
+        """
+        Create many records
+
+        Posts every record with up to `concurrency` requests in flight over the pooled connections.
+        When `records_per_second` is set, requests are paced to stay at that throughput target.
+        A record that fails does not stop the others; its exception is returned in its place.
+
+        POST /records
+
+        Args:
+            records: The records to create.
+            concurrency: Maximum number of requests in flight at the same time. Defaults to the
+                `max_limit` of the service's adaptive concurrency limiter, if any, or 8.
+            records_per_second: Optional throughput target the requests are paced to.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The created record, or the exception raised while creating it, for every input record in input order
+
+        Examples:
+        ```py
+        await client.dem.post_records_bulk(
+            records=[
+                {"core_data": {}, "metadata": {}, "ttl": 123, "type_": "LOG_IN"},
+                {"core_data": {}, "metadata": {}, "ttl": 123, "type_": "SIGNATURE"},
+            ],
+            concurrency=16,
+        )
+        ```
+        """
+        started = time.monotonic()
+
+        async def post(
+            indexed: typing.Tuple[int, params.RecordRequest],
+        ) -> models.RecordResponse:
+            index, record = indexed
+            if records_per_second:
+                delay = started + index / records_per_second - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            return await self.post_new_record(**record, request_options=request_options)
+
+        return await amap_bounded(
+            post, enumerate(records), concurrency=self._concurrency(concurrency)
+        )
+
     async def query(
         self,
         *,
@@ -862,3 +1524,144 @@ class AsyncDemClient:
             cast_to=typing.Dict[str, typing.Any],
             request_options=request_options or default_request_options(),
         )
+
+    async def aiter_query(
+        self,
+        *,
+        data: typing.Union[
+            typing.Optional[params.QueryRequestBody], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        page_size: int = 100,
+        page: int = 0,
+        prefetch: int = 1,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.AsyncIterator[models.RecordResponse]:
+        """
+        Iterate over every record matching a query
+
+        Runs the query page by page and yields the matching records one at a time, so only the pages
+        in flight are held in memory. While a page is being consumed, the following `prefetch` pages
+        are already being retrieved as background tasks.
+
+        POST /records/query
+
+        Args:
+            data: An object containing up to three lists of <code>QueryCondition</code> objects. If no body is included, every record is returned.
+            page_size: Number of records requested per page.
+            page: Number of the first page to retrieve.
+            prefetch: Number of pages to retrieve ahead of the page being consumed, `0` disables prefetching.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            An async iterator over every matching record
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        async for record in client.dem.aiter_query(
+            data={"and_": [{"field": "metadata.type", "operator": "eq", "value": "LOG_IN"}]},
+            page_size=500,
+        ):
+            print(record.id)
+        ```
+        """
+
+        async def fetch(
+            page_number: int,
+        ) -> typing.Tuple[int, typing.Dict[str, typing.Any]]:
+            result = await self.query(
+                data=data,
+                page=page_number,
+                size=page_size,
+                request_options=request_options,
+            )
+            return page_number, result
+
+        pages = AsyncPrefetchIterator(fetch, itertools.count(page), depth=prefetch)
+        async with pages:
+            async for page_number, result in pages:
+                records = pagination.query_page_records(result)
+                for record in records:
+                    yield record
+                if pagination.is_last_query_page(
+                    result,
+                    page_number=page_number,
+                    page_size=page_size,
+                    record_count=len(records),
+                ):
+                    break
+
+    async def query_sharded(
+        self,
+        *,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        data: typing.Union[
+            typing.Optional[params.QueryRequestBody], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        shards: int = 4,
+        concurrency: typing.Optional[int] = None,
+        page_size: int = 100,
+        field: str = sharding.CREATED_DATE_TIME_FIELD,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.AsyncIterator[models.RecordResponse]:
+        """
+        Run a query over a time window split into parallel shards
+
+        Splits `[start, end)` into `shards` adjacent sub-windows, adds a `gte`/`lt` condition on `field`
+        for each of them to the `and` list of the query and pages through the resulting sub-queries in
+        parallel. Every sub-query stays on shallow page numbers, which the server answers much faster
+        than deep pages of a single large query. Records are yielded as they arrive, so their order
+        across shards is not preserved.
+
+        POST /records/query
+
+        Args:
+            start: Inclusive lower bound of the time window.
+            end: Exclusive upper bound of the time window.
+            data: An object containing up to three lists of <code>QueryCondition</code> objects.
+            shards: Number of sub-windows the time window is split into.
+            concurrency: Maximum number of sub-queries running at the same time. Defaults to the
+                `max_limit` of the service's adaptive concurrency limiter, if any, or 8.
+            page_size: Number of records requested per page.
+            field: Date-time field the time window applies to.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            An async iterator over every matching record
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        async for record in client.dem.query_sharded(
+            start=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+            end=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+            shards=12,
+        ):
+            print(record.id)
+        ```
+        """
+        windows = sharding.split_time_range(start, end, shards)
+        sub_queries = [
+            self.aiter_query(
+                data=sharding.with_time_range(
+                    data or None, start=window_start, end=window_end, field=field
+                ),
+                page_size=page_size,
+                prefetch=0,
+                request_options=request_options,
+            )
+            for window_start, window_end in windows
+        ]
+        async for record in amerge(
+            sub_queries,
+            concurrency=self._concurrency(concurrency),
+            buffer=page_size * shards,
+        ):
+            yield record
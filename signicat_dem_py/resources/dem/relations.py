@@ -0,0 +1,61 @@
+import pydantic
+import typing
+
+from signicat_dem_py.types import models
+
+
+class RecordGraph(pydantic.BaseModel):
+    """
+    Records reachable from `root_id` through their relations, as an adjacency list
+    """
+
+    model_config = pydantic.ConfigDict(
+        arbitrary_types_allowed=True,
+    )
+
+    root_id: str
+    records: typing.Dict[str, models.RecordResponse] = pydantic.Field(
+        default_factory=dict
+    )
+    """
+    Every retrieved record by ID
+    """
+    edges: typing.Dict[str, typing.List[typing.Tuple[str, typing.Optional[str]]]] = (
+        pydantic.Field(default_factory=dict)
+    )
+    """
+    The `(relation_id, type_)` pairs of the followed relations of every retrieved record
+    """
+    errors: typing.Dict[str, Exception] = pydantic.Field(default_factory=dict)
+    """
+    The exception raised for every record that could not be retrieved
+    """
+
+    def add_level(
+        self,
+        fetched: typing.Dict[str, typing.Union[models.RecordResponse, Exception]],
+        *,
+        type_filter: typing.Optional[typing.Collection[str]] = None,
+    ) -> typing.List[str]:
+        """
+        Adds one breadth-first level of retrieved records and returns the IDs they relate to
+        which have not been visited yet
+        """
+        for id, result in fetched.items():
+            if isinstance(result, Exception):
+                self.errors[id] = result
+                continue
+            self.records[id] = result
+            self.edges[id] = [
+                (relation.relation_id, relation.type_)
+                for relation in result.relations or []
+                if relation.relation_id is not None
+                and (type_filter is None or relation.type_ in type_filter)
+            ]
+        discovered = (
+            target
+            for id in fetched
+            for target, _ in self.edges.get(id, [])
+            if target not in self.records and target not in self.errors
+        )
+        return list(dict.fromkeys(discovered))
@@ -0,0 +1,41 @@
+import datetime
+import typing
+
+from signicat_dem_py.types import params
+
+
+CREATED_DATE_TIME_FIELD = "systemMetadata.createdDateTime"
+
+
+def split_time_range(
+    start: datetime.datetime, end: datetime.datetime, shards: int
+) -> typing.List[typing.Tuple[datetime.datetime, datetime.datetime]]:
+    """
+    Splits the half-open window `[start, end)` into `shards` adjacent windows of equal length
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    if end <= start:
+        raise ValueError("end must be later than start")
+    step = (end - start) / shards
+    bounds = [start + step * i for i in range(shards)] + [end]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def with_time_range(
+    data: typing.Optional[params.QueryRequestBody],
+    *,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    field: str = CREATED_DATE_TIME_FIELD,
+) -> params.QueryRequestBody:
+    """
+    Returns a copy of the query which additionally requires `field` to lie within `[start, end)`
+    """
+    query: params.QueryRequestBody = {**data} if data else {}
+    query["and_"] = [
+        *query.get("and_", []),
+        {"field": field, "operator": "gte", "value": start.isoformat()},
+        {"field": field, "operator": "lt", "value": end.isoformat()},
+    ]
+    return query
@@ -0,0 +1,414 @@
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import typing
+
+from signicat_dem_py.resources.dem.client import AsyncDemClient, DemClient
+from signicat_dem_py.types import models, params
+
+
+logger = logging.getLogger(__name__)
+
+ErrorHandler = typing.Callable[[params.RecordRequest, Exception], None]
+
+
+class _Journal:
+    """Append-only JSON lines file holding records that could not be posted"""
+
+    def __init__(self, path: typing.Union[str, "os.PathLike[str]"]):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+
+    def append(
+        self, records: typing.Iterable[params.RecordRequest]
+    ) -> typing.List[typing.Tuple[params.RecordRequest, Exception]]:
+        """
+        Appends every record that can be serialised, and returns the others with the error
+        raised while serialising them
+        """
+        lines: typing.List[str] = []
+        rejected: typing.List[typing.Tuple[params.RecordRequest, Exception]] = []
+        for record in records:
+            try:
+                lines.append(json.dumps(record) + "\n")
+            except (TypeError, ValueError) as e:
+                rejected.append((record, e))
+        if lines:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        return rejected
+
+    def take(self) -> typing.List[params.RecordRequest]:
+        """Returns every journaled record and empties the journal"""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return []
+            with open(self.path, "r+", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+                f.truncate(0)
+            return records
+
+
+class _RecordWriterBase:
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        concurrency: int,
+        journal_path: typing.Optional[typing.Union[str, "os.PathLike[str]"]],
+        on_error: typing.Optional[ErrorHandler],
+    ):
+        self._batch_size = max(batch_size, 1)
+        self._concurrency = concurrency
+        self._journal = _Journal(journal_path) if journal_path is not None else None
+        self._on_error = on_error
+        self._closed = False
+
+    def _handle_results(
+        self,
+        batch: typing.List[params.RecordRequest],
+        results: typing.List[typing.Union[models.RecordResponse, Exception]],
+    ) -> None:
+        failed: typing.List[params.RecordRequest] = []
+        for record, result in zip(batch, results):
+            if not isinstance(result, Exception):
+                continue
+            failed.append(record)
+            if self._on_error is not None:
+                self._on_error(record, result)
+            elif self._journal is None:
+                logger.error("failed to post DEM record", exc_info=result)
+        self._spill(failed)
+
+    def _spill(self, records: typing.List[params.RecordRequest]) -> None:
+        if self._journal is None or not records:
+            return
+        for record, error in self._journal.append(records):
+            if self._on_error is not None:
+                self._on_error(record, error)
+            else:
+                logger.error("failed to journal DEM record", exc_info=error)
+
+    def _abandon(self, records: typing.List[params.RecordRequest]) -> None:
+        """
+        Journals the records still queued when `close` stops waiting, or reports them as
+        lost through `on_error` or the logger when there is no journal
+        """
+        if not records:
+            return
+        if self._journal is not None:
+            self._spill(records)
+            return
+        error = TimeoutError("the writer was closed before the record was posted")
+        if self._on_error is not None:
+            for record in records:
+                self._on_error(record, error)
+        else:
+            logger.error(
+                "dropped %d DEM records still queued when the writer was closed",
+                len(records),
+            )
+
+
+class DemRecordWriter(_RecordWriterBase):
+    """
+    Write-behind buffer for DEM records.
+
+    `write` only places the record on a bounded in-memory queue; a background thread
+    posts the queued records in batches through `DemClient.post_records_bulk`. When the
+    queue is full, `write` blocks until there is room again. With a `journal_path`, records
+    that cannot be posted or queued are appended to that JSON lines file instead of being
+    lost, and are posted again by the next writer opened on the same journal.
+
+    Every queued record is flushed by `close`, which is also registered to run at
+    interpreter exit.
+
+    Examples:
+    ```py
+    with DemRecordWriter(client.dem, journal_path="dem-records.jsonl") as writer:
+        writer.write({"core_data": {}, "metadata": {}, "ttl": 30, "type_": "LOG_IN"})
+    ```
+    """
+
+    def __init__(
+        self,
+        dem: DemClient,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        journal_path: typing.Optional[typing.Union[str, "os.PathLike[str]"]] = None,
+        on_error: typing.Optional[ErrorHandler] = None,
+    ):
+        super().__init__(
+            batch_size=batch_size,
+            concurrency=concurrency,
+            journal_path=journal_path,
+            on_error=on_error,
+        )
+        self._dem = dem
+        self._queue: "queue.Queue[typing.Optional[params.RecordRequest]]" = (
+            queue.Queue(max_queue)
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="dem-record-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+        if self._journal is not None:
+            for record in self._journal.take():
+                self.write(record)
+
+    def write(
+        self,
+        record: params.RecordRequest,
+        *,
+        block: bool = True,
+        timeout: typing.Optional[float] = None,
+    ) -> None:
+        """
+        Queues a record to be posted.
+
+        Blocks while the queue is full unless `block` is `False` or `timeout` elapses, in which
+        case the record is journaled, or `queue.Full` is raised when there is no journal.
+        """
+        if self._closed:
+            raise RuntimeError("cannot write to a closed DemRecordWriter")
+        try:
+            self._queue.put(record, block=block, timeout=timeout)
+        except queue.Full:
+            if self._journal is None:
+                raise
+            self._spill([record])
+
+    def flush(self) -> None:
+        """Blocks until every record queued so far has been posted"""
+        self._queue.join()
+
+    def close(self, timeout: typing.Optional[float] = None) -> None:
+        """
+        Stops accepting records and waits for every queued record to be posted. Records still
+        queued once `timeout` elapses are journaled, or else passed to `on_error` with a
+        `TimeoutError`, or logged.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        start = time.monotonic()
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            self._thread.join(
+                None if timeout is None else timeout - (time.monotonic() - start)
+            )
+        if not self._thread.is_alive():
+            return
+        remaining: typing.List[params.RecordRequest] = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            if record is not None:
+                remaining.append(record)
+        # the worker is still posting a batch; let it stop once that is done
+        self._queue.put_nowait(None)
+        self._abandon(remaining)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            batch: typing.List[params.RecordRequest] = []
+            if first is None:
+                stopping = True
+            else:
+                batch.append(first)
+            while len(batch) < self._batch_size and not stopping:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                else:
+                    batch.append(record)
+            try:
+                if batch:
+                    results = self._dem.post_records_bulk(
+                        records=batch, concurrency=self._concurrency
+                    )
+                    self._handle_results(batch, results)
+            except Exception:
+                logger.exception("DEM record writer failed to handle a batch")
+            finally:
+                for _ in range(len(batch) + (1 if stopping else 0)):
+                    self._queue.task_done()
+
+    def __enter__(self) -> "DemRecordWriter":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+class AsyncDemRecordWriter(_RecordWriterBase):
+    """
+    Write-behind buffer for DEM records on the asynchronous client.
+
+    `write` places the record on a bounded queue and only waits while the queue is full;
+    a background task posts the queued records in batches through
+    `AsyncDemClient.post_records_bulk`. With a `journal_path`, records that cannot be posted
+    or queued are appended to that JSON lines file and are posted again by the next writer
+    opened on the same journal. Use the writer as an async context manager, or call `close`,
+    so that every queued record is flushed before the event loop stops.
+
+    Examples:
+    ```py
+    async with AsyncDemRecordWriter(client.dem) as writer:
+        await writer.write({"core_data": {}, "metadata": {}, "ttl": 30, "type_": "LOG_IN"})
+    ```
+    """
+
+    def __init__(
+        self,
+        dem: AsyncDemClient,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        journal_path: typing.Optional[typing.Union[str, "os.PathLike[str]"]] = None,
+        on_error: typing.Optional[ErrorHandler] = None,
+    ):
+        super().__init__(
+            batch_size=batch_size,
+            concurrency=concurrency,
+            journal_path=journal_path,
+            on_error=on_error,
+        )
+        self._dem = dem
+        self._max_queue = max_queue
+        self._queue: typing.Optional[
+            "asyncio.Queue[typing.Optional[params.RecordRequest]]"
+        ] = None
+        self._task: typing.Optional["asyncio.Task[None]"] = None
+
+    async def start(self) -> None:
+        """Starts the background task and queues the records left in the journal"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(self._max_queue)
+        self._task = asyncio.ensure_future(self._run(self._queue))
+        if self._journal is not None:
+            for record in self._journal.take():
+                await self.write(record)
+
+    async def write(self, record: params.RecordRequest) -> None:
+        """Queues a record to be posted, waiting while the queue is full"""
+        if self._closed:
+            raise RuntimeError("cannot write to a closed AsyncDemRecordWriter")
+        await self.start()
+        assert self._queue is not None
+        await self._queue.put(record)
+
+    def write_nowait(self, record: params.RecordRequest) -> None:
+        """
+        Queues a record to be posted without waiting. When the queue is full the record is
+        journaled, or `asyncio.QueueFull` is raised when there is no journal.
+        """
+        if self._closed:
+            raise RuntimeError("cannot write to a closed AsyncDemRecordWriter")
+        if self._queue is None:
+            raise RuntimeError("AsyncDemRecordWriter has not been started")
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            if self._journal is None:
+                raise
+            self._spill([record])
+
+    async def flush(self) -> None:
+        """Waits until every record queued so far has been posted"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self, timeout: typing.Optional[float] = None) -> None:
+        """
+        Stops accepting records and waits for every queued record to be posted. Records still
+        queued once `timeout` elapses are journaled, or else passed to `on_error` with a
+        `TimeoutError`, or logged.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue is None or self._task is None:
+            return
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await asyncio.wait_for(self._queue.put(None), timeout)
+            await asyncio.wait_for(
+                asyncio.shield(self._task),
+                None if timeout is None else timeout - (loop.time() - start),
+            )
+        except asyncio.TimeoutError:
+            pass
+        if self._task.done():
+            return
+        remaining: typing.List[params.RecordRequest] = []
+        while not self._queue.empty():
+            record = self._queue.get_nowait()
+            self._queue.task_done()
+            if record is not None:
+                remaining.append(record)
+        # the task is still posting a batch; let it stop once that is done
+        self._queue.put_nowait(None)
+        self._abandon(remaining)
+
+    async def _run(
+        self, records: "asyncio.Queue[typing.Optional[params.RecordRequest]]"
+    ) -> None:
+        stopping = False
+        while not stopping:
+            first = await records.get()
+            batch: typing.List[params.RecordRequest] = []
+            if first is None:
+                stopping = True
+            else:
+                batch.append(first)
+            while len(batch) < self._batch_size and not stopping:
+                try:
+                    record = records.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if record is None:
+                    stopping = True
+                else:
+                    batch.append(record)
+            try:
+                if batch:
+                    results = await self._dem.post_records_bulk(
+                        records=batch, concurrency=self._concurrency
+                    )
+                    self._handle_results(batch, results)
+            except Exception:
+                logger.exception("DEM record writer failed to handle a batch")
+            finally:
+                for _ in range(len(batch) + (1 if stopping else 0)):
+                    records.task_done()
+
+    async def __aenter__(self) -> "AsyncDemRecordWriter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.close()
@@ -1,23 +1,87 @@
+import asyncio
 import httpx
+import os
 import typing
 import typing_extensions
+import uuid
 
 from make_api_request import (
+    ApiError,
     AsyncBaseClient,
     QueryParams,
-    RequestOptions,
     SyncBaseClient,
     default_request_options,
     encode_query_param,
     to_encodable,
     type_utils,
 )
+from signicat_dem_py import pagination
+from signicat_dem_py.adaptive import _bulk_concurrency
+from signicat_dem_py.concurrency import (
+    AsyncPrefetchIterator,
+    PrefetchIterator,
+    amap_bounded,
+    map_bounded,
+)
+from signicat_dem_py.document_cache import (
+    DocumentCache,
+    _cached_response,
+    _remember_document,
+)
+from signicat_dem_py.documents import (
+    DEFAULT_CHUNK_SIZE,
+    DocumentSource,
+    DocumentStream,
+    DownloadDestination,
+    ProgressCallback,
+    _AsyncDocumentBody,
+    _adownload,
+    _body_sha256,
+    _content_sha256,
+    _detect_content_type,
+    _download,
+    _is_regular_file,
+    _multipart_document,
+    _stream_upload_headers,
+    _with_document_hash,
+)
+from signicat_dem_py.request import RequestOptions, _idempotent_by_default
+from signicat_dem_py.retry import _was_retried
 from signicat_dem_py.types import models, params
 
 
 class SignClient:
-    def __init__(self, *, base_client: SyncBaseClient):
+    def __init__(
+        self,
+        *,
+        base_client: SyncBaseClient,
+        document_cache: typing.Optional[DocumentCache] = None,
+    ):
         self._base_client = base_client
+        self._document_cache = document_cache
+
+    def _reuse_document(
+        self, sha256: typing.Optional[str], *, content_type: str
+    ) -> typing.Optional[models.PostDocumentResponse]:
+        """
+        Returns the upload response of a document already stored with the same content, if
+        the document cache knows one
+        """
+        cache = self._document_cache
+        if cache is None or sha256 is None:
+            return None
+        document_id = cache.get(sha256, content_type=content_type)
+        if document_id is None:
+            return None
+        if cache.verify:
+            try:
+                self.get_document_info(document_id=document_id)
+            except ApiError as e:
+                if e.status_code != 404:
+                    raise
+                cache.discard(sha256, content_type=content_type)
+                return None
+        return _cached_response(document_id, sha256=sha256, content_type=content_type)
 
     def delete_document_collection(
         self,
@@ -213,6 +277,62 @@ class SignClient:
             request_options=request_options or default_request_options(),
         )
 
+    def download_document(
+        self,
+        *,
+        document_id: str,
+        dest: DownloadDestination,
+        resume: bool = False,
+        progress: typing.Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> int:
+        """
+        Download a single document
+
+        Streams the binary contents of the stored document to `dest`, a path or a
+        writable binary file object, `chunk_size` bytes at a time, so that it is never
+        held in memory as a whole. With `resume`, only the part missing from `dest` is
+        requested, through a `Range` header; when the server sends the whole document
+        instead, `dest` is rewritten. `progress` is called with the number of bytes
+        received so far and the total size, when known.
+
+        GET /documents/{documentId}
+
+        Args:
+            document_id: Document ID parameter
+            dest: Path or writable binary file object the document is written to
+            resume: Whether to continue a partial download already in `dest`
+            progress: Callback receiving the bytes received so far and the total size
+            chunk_size: Maximum number of bytes held in memory at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The size of the document in bytes
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        client.sign.download_document(
+            document_id="3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", dest="downloads/file.pdf"
+        )
+        ```
+        """
+        return _download(
+            self._base_client,
+            path=f"/documents/{document_id}",
+            service_name="sign",
+            auth_names=["bearerAuth"],
+            dest=dest,
+            resume=resume,
+            progress=progress,
+            chunk_size=chunk_size,
+            request_options=request_options,
+        )
+
     def get_document_info(
         self,
         *,
@@ -325,6 +445,68 @@ class SignClient:
             request_options=request_options or default_request_options(),
         )
 
+    def iter_signing_sessions(
+        self,
+        *,
+        limit: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        offset: int = 0,
+        sort: typing.Union[
+            typing.Optional[typing.List[str]], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        prefetch: int = 1,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Iterator[models.SigningSession]:
+        """
+        Iterate over all signing sessions
+
+        Walks the paginated list of signing sessions and yields them one at a time. While a page is
+        being consumed, the following `prefetch` pages are already being retrieved in background threads.
+
+        GET /signing-sessions
+
+        Args:
+            limit: Maximum number of rows to return per page.
+            offset: Number of rows to skip before returning results.
+            sort: Sorting field. Default value is -createdAt. E.g., +dueDate
+            prefetch: Number of pages to retrieve ahead of the page being consumed, `0` disables prefetching.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            An iterator over every signing session
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        for session in client.sign.iter_signing_sessions(limit=100, prefetch=2):
+            print(session.id)
+        ```
+        """
+        first_page = self.list_signing_sessions(
+            limit=limit, offset=offset, sort=sort, request_options=request_options
+        )
+        page_size = first_page.limit or len(first_page.data or [])
+        pages = PrefetchIterator(
+            lambda page_offset: self.list_signing_sessions(
+                limit=limit,
+                offset=page_offset,
+                sort=sort,
+                request_options=request_options,
+            ),
+            pagination.signing_session_offsets(first_page, offset=offset),
+            depth=prefetch,
+        )
+        with pages:
+            yield from first_page.data or []
+            for page in pages:
+                yield from page.data or []
+                if pagination.is_last_signing_session_page(page, page_size=page_size):
+                    break
+
     def get_signing_session(
         self,
         *,
@@ -465,6 +647,9 @@ class SignClient:
 
         Creates new document collection. A document collection is a logical grouping of documents that will be signed together.
 
+        A collection without an `id` gets a generated one, so that the request can be
+        retried: when a retry finds the collection already created, it is returned.
+
         POST /document-collections
 
         Args:
@@ -494,30 +679,42 @@ class SignClient:
         )
         ```
         """
+        collection_id = id if isinstance(id, str) else str(uuid.uuid4())
         _json = to_encodable(
             item={
-                "id": id,
+                "id": collection_id,
                 "output": output,
                 "package_to": package_to,
                 "documents": documents,
             },
             dump_with=params._SerializerDocumentCollection,
         )
-        return self._base_client.request(
-            method="POST",
-            path="/document-collections",
-            service_name="sign",
-            auth_names=["bearerAuth"],
-            json=_json,
-            cast_to=models.DocumentCollection,
-            request_options=request_options or default_request_options(),
-        )
+        try:
+            return self._base_client.request(
+                method="POST",
+                path="/document-collections",
+                service_name="sign",
+                auth_names=["bearerAuth"],
+                json=_json,
+                cast_to=models.DocumentCollection,
+                request_options=_idempotent_by_default(request_options),
+            )
+        except ApiError as e:
+            if (
+                isinstance(id, str)
+                or e.status_code != 409
+                or not _was_retried(e.response)
+            ):
+                raise
+            return self.get_document_collection(
+                document_collection_id=collection_id, request_options=request_options
+            )
 
     def upload_document(
         self,
         *,
         content_type: str,
-        data: httpx._types.FileTypes,
+        data: typing.Union[httpx._types.FileTypes, "os.PathLike[str]"],
         request_options: typing.Optional[RequestOptions] = None,
     ) -> models.PostDocumentResponse:
         """
@@ -526,12 +723,17 @@ class SignClient:
         Uploads the document as a binary stream; MIME type is defined by the
         Content-Type header. The response will be the resulting document reference.
 
+        When `data` is an `os.PathLike`, such as a `pathlib.Path`, the file is sent as the file
+        part of the multipart body like any other `data`. A regular file is memory-mapped and
+        slices of the mapping are sent without being copied; a pipe or device is read once,
+        so its upload is never retried.
+
 
         POST /documents
 
         Args:
             content_type: Content type header
-            data: httpx._types.FileTypes
+            data: httpx._types.FileTypes, or the path of a local file
             request_options: Additional options to customize the HTTP request
 
         Returns:
@@ -548,18 +750,153 @@ class SignClient:
         )
         ```
         """
+        sha256 = _body_sha256(data) if self._document_cache is not None else None
+        reused = self._reuse_document(sha256, content_type=content_type)
+        if reused is not None:
+            return reused
+        options = request_options or default_request_options()
+        if isinstance(data, os.PathLike) and not _is_regular_file(data):
+            options = typing.cast(RequestOptions, {**options, "idempotent": False})
         _header: typing.Dict[str, str] = {}
         _header["Content-Type"] = str(content_type)
-        return self._base_client.request(
+        with _multipart_document(data) as file:
+            response: models.PostDocumentResponse = self._base_client.request(
+                method="POST",
+                path="/documents",
+                service_name="sign",
+                auth_names=["bearerAuth"],
+                headers=_header,
+                files={"file": file},
+                cast_to=models.PostDocumentResponse,
+                request_options=options,
+            )
+        _remember_document(
+            self._document_cache, response, sha256=sha256, content_type=content_type
+        )
+        return response
+
+    def upload_document_stream(
+        self,
+        *,
+        content_type: str,
+        source: typing.Union[DocumentSource, DocumentStream],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> models.PostDocumentResponse:
+        """
+        Upload a new document from a stream
+
+        Sends the document as the request body, read from `source` `chunk_size` bytes at a
+        time, so that it is never held in memory as a whole. The SHA256 of the content is
+        computed in the same pass, and returned as `document_hash` when the API does not
+        return one. Iterables can only be read once, so their upload is never retried.
+
+        POST /documents
+
+        Args:
+            content_type: Content type header
+            source: Path, binary file object, iterable of bytes or `DocumentStream`
+            chunk_size: Number of bytes read at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            Successful upload, returns new document ID
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        client.sign.upload_document_stream(
+            content_type="application/pdf", source="uploads/file.pdf"
+        )
+        ```
+        """
+        stream = (
+            source
+            if isinstance(source, DocumentStream)
+            else DocumentStream(source, chunk_size=chunk_size)
+        )
+        sha256 = (
+            _content_sha256(stream.source) if self._document_cache is not None else None
+        )
+        reused = self._reuse_document(sha256, content_type=content_type)
+        if reused is not None:
+            stream.sha256 = sha256
+            return reused
+        options = typing.cast(
+            RequestOptions, dict(request_options or default_request_options())
+        )
+        if not stream.rewindable:
+            options["idempotent"] = False
+        response: models.PostDocumentResponse = self._base_client.request(
             method="POST",
             path="/documents",
             service_name="sign",
             auth_names=["bearerAuth"],
-            headers=_header,
-            files={"file": data},
+            headers=_stream_upload_headers(stream, content_type=content_type),
+            content=stream,
             cast_to=models.PostDocumentResponse,
-            request_options=request_options or default_request_options(),
+            request_options=options,
         )
+        _remember_document(
+            self._document_cache,
+            response,
+            sha256=stream.sha256,
+            content_type=content_type,
+        )
+        return _with_document_hash(response, stream)
+
+    def upload_documents(
+        self,
+        *,
+        sources: typing.Sequence[typing.Union[DocumentSource, DocumentStream]],
+        content_type: typing.Optional[str] = None,
+        concurrency: int = 8,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.List[typing.Union[models.PostDocumentResponse, Exception]]:
+        """
+        Upload many documents
+
+        Streams every document with up to `concurrency` uploads in flight, as
+        `upload_document_stream` does, computing the SHA256 of each. Unless `content_type`
+        is given, the content type of each document is detected from the extension of its
+        path or its leading bytes, falling back to `application/octet-stream`. A document
+        that fails does not stop the others; its exception is returned in its place.
+
+        POST /documents
+
+        Args:
+            sources: Paths, binary file objects, iterables of bytes or `DocumentStream`s
+            content_type: Content type of every document, detected per document when omitted
+            concurrency: Maximum number of uploads in flight at the same time.
+            chunk_size: Number of bytes read at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The uploaded document, or the exception raised while uploading it, for every source in input order
+
+        Examples:
+        ```py
+        client.sign.upload_documents(
+            sources=["uploads/contract.pdf", "uploads/annex.pdf"], concurrency=8
+        )
+        ```
+        """
+
+        def upload(
+            source: typing.Union[DocumentSource, DocumentStream],
+        ) -> models.PostDocumentResponse:
+            return self.upload_document_stream(
+                content_type=content_type or _detect_content_type(source),
+                source=source,
+                chunk_size=chunk_size,
+                request_options=request_options,
+            )
+
+        return map_bounded(upload, sources, concurrency=concurrency)
 
     def create_signing_session(
         self,
@@ -572,6 +909,9 @@ class SignClient:
 
         Creates a new signing session.
 
+        Sessions without an `id` get a generated one, so that the request can be retried:
+        when a retry finds the sessions already created, they are returned.
+
         POST /signing-sessions
 
         Args:
@@ -618,23 +958,76 @@ class SignClient:
         )
         ```
         """
+        sessions = [
+            (
+                session
+                if session.get("id")
+                else typing.cast(
+                    params.SigningSession, {**session, "id": str(uuid.uuid4())}
+                )
+            )
+            for session in data
+        ]
         _json = to_encodable(
-            item=data, dump_with=typing.List[params._SerializerSigningSession]
-        )
-        return self._base_client.request(
-            method="POST",
-            path="/signing-sessions",
-            service_name="sign",
-            auth_names=["bearerAuth"],
-            json=_json,
-            cast_to=typing.List[models.SigningSession],
-            request_options=request_options or default_request_options(),
+            item=sessions, dump_with=typing.List[params._SerializerSigningSession]
         )
+        try:
+            return self._base_client.request(
+                method="POST",
+                path="/signing-sessions",
+                service_name="sign",
+                auth_names=["bearerAuth"],
+                json=_json,
+                cast_to=typing.List[models.SigningSession],
+                request_options=_idempotent_by_default(request_options),
+            )
+        except ApiError as e:
+            if (
+                any(session.get("id") for session in data)
+                or e.status_code != 409
+                or not _was_retried(e.response)
+            ):
+                raise
+            return [
+                self.get_signing_session(
+                    session_id=session["id"], request_options=request_options
+                )
+                for session in sessions
+            ]
 
 
 class AsyncSignClient:
-    def __init__(self, *, base_client: AsyncBaseClient):
+    def __init__(
+        self,
+        *,
+        base_client: AsyncBaseClient,
+        document_cache: typing.Optional[DocumentCache] = None,
+    ):
         self._base_client = base_client
+        self._document_cache = document_cache
+
+    async def _reuse_document(
+        self, sha256: typing.Optional[str], *, content_type: str
+    ) -> typing.Optional[models.PostDocumentResponse]:
+        """
+        Returns the upload response of a document already stored with the same content, if
+        the document cache knows one
+        """
+        cache = self._document_cache
+        if cache is None or sha256 is None:
+            return None
+        document_id = cache.get(sha256, content_type=content_type)
+        if document_id is None:
+            return None
+        if cache.verify:
+            try:
+                await self.get_document_info(document_id=document_id)
+            except ApiError as e:
+                if e.status_code != 404:
+                    raise
+                cache.discard(sha256, content_type=content_type)
+                return None
+        return _cached_response(document_id, sha256=sha256, content_type=content_type)
 
     async def delete_document_collection(
         self,
@@ -834,6 +1227,62 @@ class AsyncSignClient:
             request_options=request_options or default_request_options(),
         )
 
+    async def download_document(
+        self,
+        *,
+        document_id: str,
+        dest: DownloadDestination,
+        resume: bool = False,
+        progress: typing.Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> int:
+        """
+        Download a single document
+
+        Streams the binary contents of the stored document to `dest`, a path or a
+        writable binary file object, `chunk_size` bytes at a time, so that it is never
+        held in memory as a whole. With `resume`, only the part missing from `dest` is
+        requested, through a `Range` header; when the server sends the whole document
+        instead, `dest` is rewritten. `progress` is called with the number of bytes
+        received so far and the total size, when known.
+
+        GET /documents/{documentId}
+
+        Args:
+            document_id: Document ID parameter
+            dest: Path or writable binary file object the document is written to
+            resume: Whether to continue a partial download already in `dest`
+            progress: Callback receiving the bytes received so far and the total size
+            chunk_size: Maximum number of bytes held in memory at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The size of the document in bytes
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        await client.sign.download_document(
+            document_id="3e4666bf-d5e5-4aa7-b8ce-cefe41c7568a", dest="downloads/file.pdf"
+        )
+        ```
+        """
+        return await _adownload(
+            self._base_client,
+            path=f"/documents/{document_id}",
+            service_name="sign",
+            auth_names=["bearerAuth"],
+            dest=dest,
+            resume=resume,
+            progress=progress,
+            chunk_size=chunk_size,
+            request_options=request_options,
+        )
+
     async def get_document_info(
         self,
         *,
@@ -946,6 +1395,145 @@ class AsyncSignClient:
             request_options=request_options or default_request_options(),
         )
 
+    async def aiter_signing_sessions(
+        self,
+        *,
+        limit: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        offset: int = 0,
+        sort: typing.Union[
+            typing.Optional[typing.List[str]], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        prefetch: int = 1,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.AsyncIterator[models.SigningSession]:
+        """
+        Iterate over all signing sessions
+
+        Walks the paginated list of signing sessions and yields them one at a time. While a page is
+        being consumed, the following `prefetch` pages are already being retrieved as background tasks.
+
+        GET /signing-sessions
+
+        Args:
+            limit: Maximum number of rows to return per page.
+            offset: Number of rows to skip before returning results.
+            sort: Sorting field. Default value is -createdAt. E.g., +dueDate
+            prefetch: Number of pages to retrieve ahead of the page being consumed, `0` disables prefetching.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            An async iterator over every signing session
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        async for session in client.sign.aiter_signing_sessions(limit=100, prefetch=2):
+            print(session.id)
+        ```
+        """
+        first_page = await self.list_signing_sessions(
+            limit=limit, offset=offset, sort=sort, request_options=request_options
+        )
+        page_size = first_page.limit or len(first_page.data or [])
+        pages = AsyncPrefetchIterator(
+            lambda page_offset: self.list_signing_sessions(
+                limit=limit,
+                offset=page_offset,
+                sort=sort,
+                request_options=request_options,
+            ),
+            pagination.signing_session_offsets(first_page, offset=offset),
+            depth=prefetch,
+        )
+        async with pages:
+            for session in first_page.data or []:
+                yield session
+            async for page in pages:
+                for session in page.data or []:
+                    yield session
+                if pagination.is_last_signing_session_page(page, page_size=page_size):
+                    break
+
+    async def scan_signing_sessions(
+        self,
+        *,
+        limit: typing.Union[
+            typing.Optional[int], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        offset: int = 0,
+        sort: typing.Union[
+            typing.Optional[typing.List[str]], type_utils.NotGiven
+        ] = type_utils.NOT_GIVEN,
+        concurrency: int = 4,
+        ordered: bool = True,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.AsyncIterator[models.SigningSession]:
+        """
+        Scan all signing sessions concurrently
+
+        Retrieves the first page of signing sessions, derives every remaining offset from its `total`
+        and retrieves up to `concurrency` of those pages at the same time. Sessions are yielded in
+        listing order, or page by page as soon as each page arrives when `ordered` is `False`.
+        Listings that do not report a `total` are walked with `concurrency` pages of prefetch instead.
+
+        GET /signing-sessions
+
+        Args:
+            limit: Maximum number of rows to return per page.
+            offset: Number of rows to skip before returning results.
+            sort: Sorting field. Default value is -createdAt. E.g., +dueDate
+            concurrency: Maximum number of pages being retrieved at the same time.
+            ordered: Whether sessions are yielded in listing order.
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            An async iterator over every signing session
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        async for session in client.sign.scan_signing_sessions(
+            limit=100, concurrency=8, ordered=False
+        ):
+            print(session.id)
+        ```
+        """
+        first_page = await self.list_signing_sessions(
+            limit=limit, offset=offset, sort=sort, request_options=request_options
+        )
+        if first_page.total is None:
+            ordered = True
+        page_size = first_page.limit or len(first_page.data or [])
+        pages = AsyncPrefetchIterator(
+            lambda page_offset: self.list_signing_sessions(
+                limit=limit,
+                offset=page_offset,
+                sort=sort,
+                request_options=request_options,
+            ),
+            pagination.signing_session_offsets(first_page, offset=offset),
+            depth=max(concurrency, 1),
+            ordered=ordered,
+        )
+        async with pages:
+            for session in first_page.data or []:
+                yield session
+            async for page in pages:
+                for session in page.data or []:
+                    yield session
+                if ordered and pagination.is_last_signing_session_page(
+                    page, page_size=page_size
+                ):
+                    break
+
     async def get_signing_session(
         self,
         *,
@@ -1086,6 +1674,9 @@ class AsyncSignClient:
 
         Creates new document collection. A document collection is a logical grouping of documents that will be signed together.
 
+        A collection without an `id` gets a generated one, so that the request can be
+        retried: when a retry finds the collection already created, it is returned.
+
         POST /document-collections
 
         Args:
@@ -1115,30 +1706,42 @@ class AsyncSignClient:
         )
         ```
         """
+        collection_id = id if isinstance(id, str) else str(uuid.uuid4())
         _json = to_encodable(
             item={
-                "id": id,
+                "id": collection_id,
                 "output": output,
                 "package_to": package_to,
                 "documents": documents,
             },
             dump_with=params._SerializerDocumentCollection,
         )
-        return await self._base_client.request(
-            method="POST",
-            path="/document-collections",
-            service_name="sign",
-            auth_names=["bearerAuth"],
-            json=_json,
-            cast_to=models.DocumentCollection,
-            request_options=request_options or default_request_options(),
-        )
+        try:
+            return await self._base_client.request(
+                method="POST",
+                path="/document-collections",
+                service_name="sign",
+                auth_names=["bearerAuth"],
+                json=_json,
+                cast_to=models.DocumentCollection,
+                request_options=_idempotent_by_default(request_options),
+            )
+        except ApiError as e:
+            if (
+                isinstance(id, str)
+                or e.status_code != 409
+                or not _was_retried(e.response)
+            ):
+                raise
+            return await self.get_document_collection(
+                document_collection_id=collection_id, request_options=request_options
+            )
 
     async def upload_document(
         self,
         *,
         content_type: str,
-        data: httpx._types.FileTypes,
+        data: typing.Union[httpx._types.FileTypes, "os.PathLike[str]"],
         request_options: typing.Optional[RequestOptions] = None,
     ) -> models.PostDocumentResponse:
         """
@@ -1147,12 +1750,17 @@ class AsyncSignClient:
         Uploads the document as a binary stream; MIME type is defined by the
         Content-Type header. The response will be the resulting document reference.
 
+        When `data` is an `os.PathLike`, such as a `pathlib.Path`, the file is sent as the file
+        part of the multipart body like any other `data`. A regular file is memory-mapped and
+        slices of the mapping are sent without being copied; a pipe or device is read once,
+        so its upload is never retried.
+
 
         POST /documents
 
         Args:
             content_type: Content type header
-            data: httpx._types.FileTypes
+            data: httpx._types.FileTypes, or the path of a local file
             request_options: Additional options to customize the HTTP request
 
         Returns:
@@ -1169,17 +1777,172 @@ class AsyncSignClient:
         )
         ```
         """
+        sha256 = (
+            await asyncio.get_running_loop().run_in_executor(None, _body_sha256, data)
+            if self._document_cache is not None
+            else None
+        )
+        reused = await self._reuse_document(sha256, content_type=content_type)
+        if reused is not None:
+            return reused
+        options = request_options or default_request_options()
+        if isinstance(data, os.PathLike) and not _is_regular_file(data):
+            options = typing.cast(RequestOptions, {**options, "idempotent": False})
         _header: typing.Dict[str, str] = {}
         _header["Content-Type"] = str(content_type)
-        return await self._base_client.request(
+        with _multipart_document(data) as file:
+            response: models.PostDocumentResponse = await self._base_client.request(
+                method="POST",
+                path="/documents",
+                service_name="sign",
+                auth_names=["bearerAuth"],
+                headers=_header,
+                files={"file": file},
+                cast_to=models.PostDocumentResponse,
+                request_options=options,
+            )
+        _remember_document(
+            self._document_cache, response, sha256=sha256, content_type=content_type
+        )
+        return response
+
+    async def upload_document_stream(
+        self,
+        *,
+        content_type: str,
+        source: typing.Union[DocumentSource, DocumentStream],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> models.PostDocumentResponse:
+        """
+        Upload a new document from a stream
+
+        Sends the document as the request body, read from `source` `chunk_size` bytes at a
+        time, so that it is never held in memory as a whole. The SHA256 of the content is
+        computed in the same pass, and returned as `document_hash` when the API does not
+        return one. Iterables can only be read once, so their upload is never retried.
+
+        POST /documents
+
+        Args:
+            content_type: Content type header
+            source: Path, binary file object, iterable of bytes or `DocumentStream`
+            chunk_size: Number of bytes read at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            Successful upload, returns new document ID
+
+        Raises:
+            ApiError: A custom exception class that provides additional context
+                for API errors, including the HTTP status code and response body.
+
+        Examples:
+        ```py
+        await client.sign.upload_document_stream(
+            content_type="application/pdf", source="uploads/file.pdf"
+        )
+        ```
+        """
+        stream = (
+            source
+            if isinstance(source, DocumentStream)
+            else DocumentStream(source, chunk_size=chunk_size)
+        )
+        sha256 = (
+            await asyncio.get_running_loop().run_in_executor(
+                None, _content_sha256, stream.source
+            )
+            if self._document_cache is not None
+            else None
+        )
+        reused = await self._reuse_document(sha256, content_type=content_type)
+        if reused is not None:
+            stream.sha256 = sha256
+            return reused
+        options = typing.cast(
+            RequestOptions, dict(request_options or default_request_options())
+        )
+        if not stream.rewindable:
+            options["idempotent"] = False
+        response: models.PostDocumentResponse = await self._base_client.request(
             method="POST",
             path="/documents",
             service_name="sign",
             auth_names=["bearerAuth"],
-            headers=_header,
-            files={"file": data},
+            headers=_stream_upload_headers(stream, content_type=content_type),
+            content=_AsyncDocumentBody(stream),
             cast_to=models.PostDocumentResponse,
-            request_options=request_options or default_request_options(),
+            request_options=options,
+        )
+        _remember_document(
+            self._document_cache,
+            response,
+            sha256=stream.sha256,
+            content_type=content_type,
+        )
+        return _with_document_hash(response, stream)
+
+    async def upload_documents(
+        self,
+        *,
+        sources: typing.Sequence[typing.Union[DocumentSource, DocumentStream]],
+        content_type: typing.Optional[str] = None,
+        concurrency: typing.Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.List[typing.Union[models.PostDocumentResponse, Exception]]:
+        """
+        Upload many documents
+
+        Streams every document with up to `concurrency` uploads in flight, as
+        `upload_document_stream` does, computing the SHA256 of each. Unless `content_type`
+        is given, the content type of each document is detected from the extension of its
+        path or its leading bytes, falling back to `application/octet-stream`. A document
+        that fails does not stop the others; its exception is returned in its place.
+
+        POST /documents
+
+        Args:
+            sources: Paths, binary file objects, iterables of bytes or `DocumentStream`s
+            content_type: Content type of every document, detected per document when omitted
+            concurrency: Maximum number of uploads in flight at the same time. Defaults to the
+                `max_limit` of the service's adaptive concurrency limiter, if any, or 8.
+            chunk_size: Number of bytes read at a time
+            request_options: Additional options to customize the HTTP request
+
+        Returns:
+            The uploaded document, or the exception raised while uploading it, for every source in input order
+
+        Examples:
+        ```py
+        await client.sign.upload_documents(
+            sources=["uploads/contract.pdf", "uploads/annex.pdf"], concurrency=8
+        )
+        ```
+        """
+
+        async def upload(
+            source: typing.Union[DocumentSource, DocumentStream],
+        ) -> models.PostDocumentResponse:
+            detected = content_type
+            if detected is None:
+                detected = await asyncio.get_running_loop().run_in_executor(
+                    None, _detect_content_type, source
+                )
+            return await self.upload_document_stream(
+                content_type=detected,
+                source=source,
+                chunk_size=chunk_size,
+                request_options=request_options,
+            )
+
+        return await amap_bounded(
+            upload,
+            sources,
+            concurrency=_bulk_concurrency(
+                self._base_client, service_name="sign", concurrency=concurrency
+            ),
         )
 
     async def create_signing_session(
@@ -1193,6 +1956,9 @@ class AsyncSignClient:
 
         Creates a new signing session.
 
+        Sessions without an `id` get a generated one, so that the request can be retried:
+        when a retry finds the sessions already created, they are returned.
+
         POST /signing-sessions
 
         Args:
@@ -1239,15 +2005,43 @@ class AsyncSignClient:
         )
         ```
         """
+        sessions = [
+            (
+                session
+                if session.get("id")
+                else typing.cast(
+                    params.SigningSession, {**session, "id": str(uuid.uuid4())}
+                )
+            )
+            for session in data
+        ]
         _json = to_encodable(
-            item=data, dump_with=typing.List[params._SerializerSigningSession]
-        )
-        return await self._base_client.request(
-            method="POST",
-            path="/signing-sessions",
-            service_name="sign",
-            auth_names=["bearerAuth"],
-            json=_json,
-            cast_to=typing.List[models.SigningSession],
-            request_options=request_options or default_request_options(),
+            item=sessions, dump_with=typing.List[params._SerializerSigningSession]
         )
+        try:
+            return await self._base_client.request(
+                method="POST",
+                path="/signing-sessions",
+                service_name="sign",
+                auth_names=["bearerAuth"],
+                json=_json,
+                cast_to=typing.List[models.SigningSession],
+                request_options=_idempotent_by_default(request_options),
+            )
+        except ApiError as e:
+            if (
+                any(session.get("id") for session in data)
+                or e.status_code != 409
+                or not _was_retried(e.response)
+            ):
+                raise
+            return list(
+                await asyncio.gather(
+                    *(
+                        self.get_signing_session(
+                            session_id=session["id"], request_options=request_options
+                        )
+                        for session in sessions
+                    )
+                )
+            )
@@ -0,0 +1,108 @@
+import email.utils
+import httpx
+import random
+import time
+import typing
+
+
+DEFAULT_RETRY_STATUSES: typing.FrozenSet[int] = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS: typing.FrozenSet[str] = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+)
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+_ATTEMPT_EXTENSION = "signicat_dem_py.attempt"
+"""Response extension holding the number of the attempt that received the response"""
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is sent again and how long to wait before doing so.
+
+    A request is retried when its response status is in `statuses` or sending it raised one
+    of `exceptions`, up to `max_attempts` attempts in total. Only idempotent requests are
+    retried: those using a method in `IDEMPOTENT_METHODS`, `POST`s sent with an
+    `idempotency_key` request option, or any request sent with the `idempotent` request
+    option set to `True`.
+
+    The wait before attempt `n + 1` is drawn uniformly between zero and
+    `min(backoff_max, backoff_base * 2 ** (n - 1))` ("full jitter"). When the response
+    carries a `Retry-After` header, that wait is used instead, capped at `retry_after_max`.
+
+    Examples:
+    ```py
+    client = Client(token=getenv("API_TOKEN"), retry=RetryPolicy(max_attempts=5))
+    client.dem.post_new_record(
+        ...,
+        request_options={"retry": RetryPolicy(max_attempts=3), "idempotent": True},
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        statuses: typing.Iterable[int] = DEFAULT_RETRY_STATUSES,
+        exceptions: typing.Tuple[typing.Type[BaseException], ...] = (
+            httpx.TransportError,
+        ),
+        backoff_base: float = 0.5,
+        backoff_max: float = 30,
+        retry_after_max: float = 60,
+    ):
+        self.max_attempts = max(max_attempts, 1)
+        self.statuses = frozenset(statuses)
+        self.exceptions = exceptions
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+
+    def is_retryable(
+        self,
+        *,
+        attempt: int,
+        method: str,
+        idempotent: typing.Optional[bool] = None,
+        response: typing.Optional[httpx.Response] = None,
+        exception: typing.Optional[BaseException] = None,
+    ) -> bool:
+        """Whether the request should be sent again after `attempt` attempts"""
+        if attempt >= self.max_attempts:
+            return False
+        if not (idempotent if idempotent is not None else method in IDEMPOTENT_METHODS):
+            return False
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return response is not None and response.status_code in self.statuses
+
+    def delay(
+        self, *, attempt: int, response: typing.Optional[httpx.Response] = None
+    ) -> float:
+        """Returns the number of seconds to wait before the attempt following `attempt`"""
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.retry_after_max)
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+def _retry_after(response: httpx.Response) -> typing.Optional[float]:
+    """Parses a `Retry-After` header given in seconds or as an HTTP date"""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _was_retried(response: httpx.Response) -> bool:
+    """Whether an earlier attempt of the request that received `response` was sent"""
+    return typing.cast(int, response.extensions.get(_ATTEMPT_EXTENSION, 1)) > 1
@@ -0,0 +1,69 @@
+import asyncio
+import httpx
+import pytest
+import typing
+
+from signicat_dem_py import AdaptiveConcurrencyLimiter, AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_limiter_grows_while_healthy_and_shrinks_on_errors() -> None:
+    """Tests the additive increase and multiplicative decrease of the limit"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=6)
+
+    for _ in range(40):
+        await asyncio.gather(*(limiter.acquire() for _ in range(limiter.limit)))
+        for _ in range(limiter.in_flight):
+            limiter.release(latency=0.01, failed=False)
+    assert limiter.limit == 6
+
+    await limiter.acquire()
+    limiter.release(latency=0.01, failed=True)
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_requests_beyond_the_limit() -> None:
+    """Tests that waiting requests are admitted in order as slots are freed"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    order: typing.List[int] = []
+
+    async def request(n: int) -> None:
+        await limiter.acquire()
+        order.append(n)
+        await asyncio.sleep(0)
+        limiter.release(latency=0.01, failed=False)
+
+    await asyncio.gather(*(request(n) for n in range(5)))
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_client_bounds_requests_in_flight() -> None:
+    """Tests that the async client keeps a service's requests within the limit"""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        adaptive_concurrency={"dem": limiter},
+    )
+
+    records = await client.dem.get_records(
+        ids=[str(i) for i in range(12)], concurrency=12
+    )
+
+    assert len(records) == 12
+    assert peak == 3
+    assert limiter.in_flight == 0
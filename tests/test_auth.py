@@ -0,0 +1,192 @@
+import asyncio
+import httpx
+import json
+import pathlib
+import pytest
+import threading
+import time
+import typing
+import urllib.parse
+
+from signicat_dem_py import (
+    AsyncClient,
+    Client,
+    ClientCredentialsTokenProvider,
+    FileTokenStore,
+)
+
+
+class _TokenEndpoint:
+    """Stand-in OAuth token endpoint issuing numbered tokens"""
+
+    def __init__(self, expires_in: int = 3600):
+        self.expires_in = expires_in
+        self.forms: typing.List[typing.Dict[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(0.01)
+        with self._lock:
+            self.forms.append(dict(urllib.parse.parse_qsl(request.content.decode())))
+            token = f"token-{len(self.forms)}"
+        return httpx.Response(
+            200, json={"access_token": token, "expires_in": self.expires_in}
+        )
+
+
+def _authorization_recorder(
+    seen: typing.List[str],
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"data": []})
+
+    return handler
+
+
+def test_client_credentials_token_is_cached_and_refreshed() -> None:
+    """Tests that tokens are reused until they are due for a refresh"""
+    endpoint = _TokenEndpoint(expires_in=3600)
+    provider = ClientCredentialsTokenProvider(
+        client_id="id",
+        client_secret="secret",
+        scope="signicat-api",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(endpoint)),
+    )
+    seen: typing.List[str] = []
+    client = Client(
+        token_provider=provider,
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(_authorization_recorder(seen))
+        ),
+    )
+
+    client.sign.list_signing_sessions()
+    client.sign.list_signing_sessions()
+    assert seen == ["Bearer token-1", "Bearer token-1"]
+    assert endpoint.forms == [
+        {
+            "grant_type": "client_credentials",
+            "client_id": "id",
+            "client_secret": "secret",
+            "scope": "signicat-api",
+        }
+    ]
+
+    endpoint.expires_in = 30
+    provider.invalidate()
+    client.sign.list_signing_sessions()
+    client.sign.list_signing_sessions()
+    assert seen[2:] == ["Bearer token-2", "Bearer token-2"]
+
+    endpoint.expires_in = 0
+    provider.invalidate()
+    client.sign.list_signing_sessions()
+    client.sign.list_signing_sessions()
+    assert seen[4:] == ["Bearer token-3", "Bearer token-4"]
+
+
+def test_concurrent_requests_share_one_token_fetch() -> None:
+    """Tests that concurrent threads needing a token trigger a single fetch"""
+    endpoint = _TokenEndpoint()
+    provider = ClientCredentialsTokenProvider(
+        client_id="id",
+        client_secret="secret",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(endpoint)),
+    )
+
+    tokens: typing.List[str] = []
+    threads = [
+        threading.Thread(target=lambda: tokens.append(provider.get_token()))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(endpoint.forms) == 1
+    assert set(tokens) == {"token-1"}
+
+
+@pytest.mark.asyncio
+async def test_async_requests_share_one_token_fetch() -> None:
+    """Tests that a burst of asynchronous requests triggers a single token fetch"""
+    endpoint = _TokenEndpoint()
+    provider = ClientCredentialsTokenProvider(
+        client_id="id",
+        client_secret="secret",
+        async_httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(endpoint)),
+    )
+    seen: typing.List[str] = []
+    client = AsyncClient(
+        token_provider=provider,
+        httpx_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(_authorization_recorder(seen))
+        ),
+    )
+
+    await asyncio.gather(*(client.sign.list_signing_sessions() for _ in range(500)))
+
+    assert len(endpoint.forms) == 1
+    assert seen == ["Bearer token-1"] * 500
+
+
+@pytest.mark.asyncio
+async def test_async_request_uses_the_token_obtained_before_it_was_built() -> None:
+    """Tests that an async request never fetches a token synchronously on the event loop"""
+    endpoint = _TokenEndpoint(expires_in=0)
+    provider = ClientCredentialsTokenProvider(
+        client_id="id",
+        client_secret="secret",
+        async_httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(endpoint)),
+    )
+    provider.fetch_token = None  # type: ignore[assignment]
+    seen: typing.List[str] = []
+    client = AsyncClient(
+        token_provider=provider,
+        httpx_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(_authorization_recorder(seen))
+        ),
+    )
+
+    await client.sign.list_signing_sessions()
+    await client.sign.list_signing_sessions()
+
+    assert seen == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_file_token_store_shares_one_refresh(tmp_path: pathlib.Path) -> None:
+    """Tests that providers sharing a token file fetch a single token between them"""
+    endpoint = _TokenEndpoint()
+    path = tmp_path / "token.json"
+    providers = [
+        ClientCredentialsTokenProvider(
+            client_id="id",
+            client_secret="secret",
+            httpx_client=httpx.Client(transport=httpx.MockTransport(endpoint)),
+            store=FileTokenStore(path),
+        )
+        for _ in range(8)
+    ]
+
+    tokens: typing.List[str] = []
+    threads = [
+        threading.Thread(target=lambda p=p: tokens.append(p.get_token()))
+        for p in providers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(endpoint.forms) == 1
+    assert tokens == ["token-1"] * 8
+    assert json.loads(path.read_text())["access_token"] == "token-1"
+
+    providers[0].invalidate()
+    assert providers[0].get_token() == "token-2"
+    assert providers[1].cached_token() == "token-1"
+    providers[1].invalidate()
+    assert providers[1].get_token() == "token-2"
+    assert len(endpoint.forms) == 2
@@ -0,0 +1,218 @@
+import asyncio
+import concurrent.futures
+import httpx
+import json
+import pytest
+import threading
+import time
+import typing
+
+from signicat_dem_py import ApiError, AsyncClient, Client
+from signicat_dem_py.types import models, params
+
+
+def _records_handler(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    if body["type"] == "FAIL":
+        return httpx.Response(400, json={"message": "invalid type"})
+    return httpx.Response(200, json={"id": body["metadata"]["n"]})
+
+
+def _record(n: str, type_: str = "LOG_IN") -> params.RecordRequest:
+    return {"core_data": {}, "metadata": {"n": n}, "ttl": 30, "type_": type_}
+
+
+def test_post_records_bulk_keeps_input_order() -> None:
+    """Tests that post_records_bulk returns results and errors in input order"""
+    transport = httpx.MockTransport(_records_handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    results = client.dem.post_records_bulk(
+        records=[_record("0"), _record("1", "FAIL"), _record("2")], concurrency=3
+    )
+
+    assert isinstance(results[0], models.RecordResponse) and results[0].id == "0"
+    assert isinstance(results[1], ApiError)
+    assert isinstance(results[2], models.RecordResponse) and results[2].id == "2"
+
+
+@pytest.mark.asyncio
+async def test_post_records_bulk_async() -> None:
+    """Tests the asynchronous post_records_bulk over a generator of records"""
+    transport = httpx.MockTransport(_records_handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    results = await client.dem.post_records_bulk(
+        records=(_record(str(i)) for i in range(20)), concurrency=4
+    )
+
+    ids: typing.List[typing.Optional[str]] = [
+        r.id for r in results if isinstance(r, models.RecordResponse)
+    ]
+    assert ids == [str(i) for i in range(20)]
+
+
+def test_set_expiry_for_ids_groups_and_falls_back() -> None:
+    """Tests that IDs are grouped into `in` queries and rejected chunks fall back to per-ID calls"""
+    bulk_calls: typing.List[typing.List[str]] = []
+    single_calls: typing.List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/records"):
+            ids = json.loads(request.content)["query"]["and"][0]["value"]
+            bulk_calls.append(ids)
+            if "bad" in ids:
+                return httpx.Response(400, json={"message": "rejected"})
+            return httpx.Response(200, text="updated")
+        record_id = request.url.path.rsplit("/", 1)[-1]
+        single_calls.append(record_id)
+        return httpx.Response(404 if record_id == "bad" else 204)
+
+    transport = httpx.MockTransport(handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    results = client.dem.set_expiry_for_ids(
+        ids=["a", "b", "a", "c", "bad", "d"], ttl=30, chunk_size=2
+    )
+
+    assert sorted(bulk_calls) == [["a", "b"], ["c", "bad"], ["d"]]
+    assert sorted(single_calls) == ["bad", "c"]
+    assert [k for k, v in results.items() if v is None] == ["a", "b", "d", "c"]
+    assert isinstance(results["bad"], ApiError)
+
+
+def test_set_expiry_for_ids_does_not_fan_out_throttled_chunks() -> None:
+    """Tests that a chunk failing with a status other than a rejection is not split"""
+    single_calls: typing.List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/records"):
+            return httpx.Response(429, json={"message": "slow down"})
+        single_calls.append(request.url.path)
+        return httpx.Response(204)
+
+    transport = httpx.MockTransport(handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    results = client.dem.set_expiry_for_ids(
+        ids=[str(i) for i in range(10)], ttl=30, chunk_size=5
+    )
+
+    assert single_calls == []
+    assert len(results) == 10
+    assert all(
+        isinstance(error, ApiError) and error.status_code == 429
+        for error in results.values()
+    )
+
+
+def test_set_expiry_for_ids_rejects_an_empty_chunk_size() -> None:
+    """Tests that a chunk size below 1 is refused instead of updating nothing"""
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="updated"))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    with pytest.raises(ValueError):
+        client.dem.set_expiry_for_ids(ids=["a"], ttl=30, chunk_size=0)
+
+
+def test_get_records_deduplicates_in_flight_requests() -> None:
+    """Tests that get_records fetches each ID once, also across concurrent callers"""
+    requested: typing.List[str] = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        record_id = request.url.path.rsplit("/", 1)[-1]
+        requested.append(record_id)
+        release.wait(1)
+        if record_id == "missing":
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"id": record_id})
+
+    transport = httpx.MockTransport(handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(client.dem.get_records, ids=["a", "b", "a", "missing"])
+        second = executor.submit(client.dem.get_records, ids=["b", "a"])
+        time.sleep(0.1)
+        release.set()
+        results, other = first.result(), second.result()
+
+    assert sorted(requested) == ["a", "b", "missing"]
+    assert list(results) == ["a", "b", "missing"]
+    assert isinstance(results["missing"], ApiError)
+    assert other["a"] is results["a"]
+
+
+@pytest.mark.asyncio
+async def test_get_records_async_shares_concurrent_requests() -> None:
+    """Tests that concurrent async get_records calls share in-flight requests"""
+    requested: typing.List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path.rsplit("/", 1)[-1])
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": requested[-1]})
+
+    transport = httpx.MockTransport(handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    first, second = await asyncio.gather(
+        client.dem.get_records(ids=["a", "b"]), client.dem.get_records(ids=["b", "c"])
+    )
+
+    assert sorted(requested) == ["a", "b", "c"]
+    assert first["b"] is second["b"]
+
+
+def _relation_graph_handler(
+    graph: typing.Dict[str, typing.List[typing.Tuple[str, str]]],
+    requested: typing.List[str],
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        record_id = request.url.path.rsplit("/", 1)[-1]
+        requested.append(record_id)
+        relations = [{"relationID": r, "type": t} for r, t in graph[record_id]]
+        return httpx.Response(200, json={"id": record_id, "relations": relations})
+
+    return handler
+
+
+def test_walk_relations_visits_each_record_once() -> None:
+    """Tests that walk_relations follows relations breadth-first and detects cycles"""
+    graph = {
+        "root": [("a", "GDPR"), ("b", "KYC")],
+        "a": [("root", "GDPR"), ("c", "GDPR")],
+        "b": [("c", "GDPR")],
+        "c": [("d", "GDPR")],
+        "d": [],
+    }
+    requested: typing.List[str] = []
+    transport = httpx.MockTransport(_relation_graph_handler(graph, requested))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    result = client.dem.walk_relations(root_id="root", max_depth=2)
+
+    assert sorted(requested) == ["a", "b", "c", "root"]
+    assert result.edges["a"] == [("root", "GDPR"), ("c", "GDPR")]
+    assert "d" not in result.records
+
+
+@pytest.mark.asyncio
+async def test_walk_relations_async_filters_types() -> None:
+    """Tests that the asynchronous walk_relations only follows the requested types"""
+    graph = {"root": [("a", "GDPR"), ("b", "KYC")], "a": [], "b": []}
+    requested: typing.List[str] = []
+    transport = httpx.MockTransport(_relation_graph_handler(graph, requested))
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    result = await client.dem.walk_relations(root_id="root", type_filter=["GDPR"])
+
+    assert sorted(result.records) == ["a", "root"]
+    assert result.edges["root"] == [("a", "GDPR")]
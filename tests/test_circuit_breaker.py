@@ -0,0 +1,121 @@
+import httpx
+import pytest
+import time
+import typing
+
+from signicat_dem_py import (
+    ApiError,
+    AsyncClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    Client,
+    RateLimiter,
+)
+
+
+def _status_handler(
+    statuses: typing.List[int], calls: typing.List[str]
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(statuses.pop(0) if statuses else 200, text="OK")
+
+    return handler
+
+
+def test_breaker_opens_fails_fast_and_recovers() -> None:
+    """Tests the closed, open and half-open transitions of a service's breaker"""
+    calls: typing.List[str] = []
+    breaker = CircuitBreaker(window_size=4, minimum_calls=4, open_duration=0.05)
+    transport = httpx.MockTransport(_status_handler([503, 200, 503, 503], calls))
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=transport),
+        circuit_breakers={"dem": breaker},
+    )
+
+    for _ in range(4):
+        try:
+            client.dem.signicat()
+        except ApiError:
+            pass
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        client.dem.signicat()
+    assert exc_info.value.service_name == "dem"
+    assert len(calls) == 4
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert client.dem.signicat() == "OK"
+    assert breaker.state == "closed"
+    assert len(calls) == 5
+
+
+def test_breaker_trips_on_slow_calls_and_uses_fallback() -> None:
+    """Tests that slow responses open the breaker and the fallback replaces the error"""
+    breaker = CircuitBreaker(
+        slow_call_duration=0,
+        slow_call_rate_threshold=1,
+        window_size=2,
+        minimum_calls=2,
+        fallback=lambda error: f"fallback for {error.method}",
+    )
+    calls: typing.List[str] = []
+    transport = httpx.MockTransport(_status_handler([], calls))
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=transport),
+        circuit_breakers={"dem": breaker},
+    )
+
+    assert client.dem.signicat() == "OK"
+    assert client.dem.signicat() == "OK"
+    assert client.dem.signicat() == "fallback for GET"
+    assert len(calls) == 2
+
+
+def test_open_breaker_fails_fast_without_taking_rate_limit_tokens() -> None:
+    """Tests that a call rejected by an open breaker does not wait for its rate limiter"""
+    calls: typing.List[str] = []
+    breaker = CircuitBreaker(window_size=1, minimum_calls=1, open_duration=60)
+    limiter = RateLimiter(rate=1, burst=1)
+    transport = httpx.MockTransport(_status_handler([503], calls))
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=transport),
+        circuit_breakers={"dem": breaker},
+        rate_limiters={"dem": limiter},
+    )
+
+    with pytest.raises(ApiError):
+        client.dem.signicat()
+    start = time.monotonic()
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            client.dem.signicat()
+
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 1
+    assert limiter.reserve() < 1.5
+
+
+@pytest.mark.asyncio
+async def test_async_breaker_only_guards_its_service() -> None:
+    """Tests that an open breaker rejects its own service only"""
+    calls: typing.List[str] = []
+    transport = httpx.MockTransport(_status_handler([500], calls))
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=transport),
+        circuit_breakers={"dem": CircuitBreaker(window_size=1, minimum_calls=1)},
+    )
+
+    with pytest.raises(ApiError):
+        await client.dem.signicat()
+    with pytest.raises(CircuitOpenError):
+        await client.dem.signicat()
+    await client.sign.list_signing_sessions()
+
+    assert calls == ["/dem/.ping", "/sign/signing-sessions"]
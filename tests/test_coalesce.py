@@ -0,0 +1,82 @@
+import asyncio
+import httpx
+import pytest
+import threading
+import time
+import typing
+
+from signicat_dem_py import ApiError, AsyncClient, Client
+
+
+def _session(id: str) -> typing.Dict[str, typing.Any]:
+    return {"id": id, "documents": [], "signingSetup": [], "title": "Contract"}
+
+
+@pytest.mark.asyncio
+async def test_identical_async_gets_share_one_request() -> None:
+    """Tests that concurrent identical GETs share one request and its parsed result"""
+    paths: typing.List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=_session(request.url.path.rsplit("/", 1)[-1]))
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        coalesce_gets=True,
+    )
+
+    sessions = await asyncio.gather(
+        *(client.sign.get_signing_session(session_id="a") for _ in range(10)),
+        client.sign.get_signing_session(session_id="b"),
+    )
+
+    assert sorted(paths) == ["/sign/signing-sessions/a", "/sign/signing-sessions/b"]
+    assert all(session is sessions[0] for session in sessions[:10])
+    assert sessions[10].id == "b"
+
+    await client.sign.get_signing_session(session_id="a")
+    assert len(paths) == 3
+
+
+def test_sync_gets_share_errors_and_respect_the_request_option() -> None:
+    """Tests that threads share a failed GET and that `coalesce` opts a call out"""
+    calls: typing.List[str] = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        release.wait(1)
+        return httpx.Response(404, json={"message": "not found"})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        coalesce_gets=True,
+    )
+    errors: typing.List[Exception] = []
+
+    def get(coalesce: bool) -> None:
+        try:
+            client.sign.get_signing_session(
+                session_id="a", request_options={"coalesce": coalesce}
+            )
+        except ApiError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=get, args=(True,)) for _ in range(4)]
+    threads.append(threading.Thread(target=get, args=(False,)))
+    for thread in threads:
+        thread.start()
+    for _ in range(100):
+        if len(calls) == 2:
+            break
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 2
+    assert len(errors) == 5
@@ -0,0 +1,136 @@
+import httpx
+import pytest
+import time
+import typing
+
+from signicat_dem_py import (
+    ApiError,
+    AsyncClient,
+    Client,
+    DeadlineExceeded,
+    RetryPolicy,
+    deadline,
+    time_remaining,
+)
+
+
+def test_nested_deadline_never_extends_the_budget() -> None:
+    """Tests that the tightest enclosing deadline applies and is restored on exit"""
+    assert time_remaining() is None
+    with deadline(1):
+        with deadline(60):
+            remaining = time_remaining()
+            assert remaining is not None and remaining <= 1
+        with deadline(0.5):
+            remaining = time_remaining()
+            assert remaining is not None and remaining <= 0.5
+    assert time_remaining() is None
+
+
+def test_request_timeout_is_cut_to_the_time_remaining() -> None:
+    """Tests that each request's timeout is cut to the remaining budget"""
+    timeouts: typing.List[typing.Dict[str, typing.Optional[float]]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, text="OK")
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler), timeout=60),
+    )
+
+    client.dem.signicat()
+    with deadline(2):
+        client.dem.signicat()
+
+    assert timeouts[0]["read"] == 60
+    read = timeouts[1]["read"]
+    assert read is not None and 0 < read <= 2
+
+
+def test_request_fails_fast_once_the_budget_is_spent() -> None:
+    """Tests that no request is sent after the deadline has passed"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="OK")
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    with deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            client.dem.signicat()
+    assert requests == []
+
+
+def test_retry_is_skipped_when_its_backoff_outlasts_the_deadline() -> None:
+    """Tests that the last response is returned instead of sleeping past the deadline"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(503, headers={"Retry-After": "30"})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry=RetryPolicy(max_attempts=3),
+    )
+
+    start = time.monotonic()
+    with deadline(5):
+        with pytest.raises(ApiError):
+            client.dem.signicat()
+    assert len(requests) == 1
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_async_request_fails_fast_once_the_budget_is_spent() -> None:
+    """Tests that the deadline also applies to the async client"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="OK")
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    with deadline(1):
+        assert await client.dem.signicat() == "OK"
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            await client.dem.signicat()
+    assert len(requests) == 1
+
+
+def test_deadline_applies_to_requests_on_worker_threads() -> None:
+    """Tests that bulk helpers sending from worker threads honour the deadline"""
+    timeouts: typing.List[typing.Optional[float]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler), timeout=60),
+    )
+
+    with deadline(2):
+        client.dem.get_records(ids=["a", "b", "c", "d"], concurrency=4)
+    with deadline(0):
+        results = client.dem.get_records(ids=["e", "f"], concurrency=2)
+
+    assert len(timeouts) == 4
+    assert all(read is not None and read <= 2 for read in timeouts)
+    assert all(isinstance(error, DeadlineExceeded) for error in results.values())
@@ -0,0 +1,159 @@
+import hashlib
+import httpx
+import pytest
+import time
+import typing
+
+from signicat_dem_py import (
+    AsyncClient,
+    Client,
+    FileDocumentCache,
+    MemoryDocumentCache,
+)
+
+
+_PDF = b"%PDF-1.7 contract"
+_SHA256 = hashlib.sha256(_PDF).hexdigest()
+
+
+def test_memory_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    """Tests the LRU bound and the `ttl` of the in-memory cache"""
+    cache = MemoryDocumentCache(max_entries=2)
+    cache.put("a", content_type="application/pdf", document_id="doc-a")
+    cache.put("b", content_type="application/pdf", document_id="doc-b")
+    assert cache.get("a", content_type="application/pdf") == "doc-a"
+    cache.put("c", content_type="application/pdf", document_id="doc-c")
+
+    assert cache.get("b", content_type="application/pdf") is None
+    assert cache.get("a", content_type="application/pdf") == "doc-a"
+    assert cache.get("a", content_type="text/plain") is None
+
+    expiring = MemoryDocumentCache(ttl=0.01)
+    expiring.put("a", content_type="application/pdf", document_id="doc-a")
+    time.sleep(0.02)
+    assert expiring.get("a", content_type="application/pdf") is None
+
+
+def test_file_cache_persists_across_instances(tmp_path: typing.Any) -> None:
+    """Tests that the SQLite cache is shared by every instance using the same path"""
+    path = tmp_path / "documents.db"
+    FileDocumentCache(path).put(
+        "a", content_type="application/pdf", document_id="doc-a"
+    )
+
+    cache = FileDocumentCache(path, max_entries=1)
+    assert cache.get("a", content_type="application/pdf") == "doc-a"
+    cache.put("b", content_type="application/pdf", document_id="doc-b")
+    assert cache.get("a", content_type="application/pdf") is None
+    cache.discard("b", content_type="application/pdf")
+    assert cache.get("b", content_type="application/pdf") is None
+
+
+def test_identical_upload_reuses_the_stored_document() -> None:
+    """Tests that uploading the same content twice sends it only once"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"documentId": f"doc-{len(requests)}"})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        document_cache=MemoryDocumentCache(),
+    )
+
+    first = client.sign.upload_document(content_type="application/pdf", data=_PDF)
+    second = client.sign.upload_document(content_type="application/pdf", data=_PDF)
+    other = client.sign.upload_document(content_type="text/plain", data=_PDF)
+
+    assert first.document_id == second.document_id == "doc-1"
+    assert second.document_hash is not None and second.document_hash.hash == _SHA256
+    assert other.document_id == "doc-2"
+    assert len(requests) == 2
+
+
+def test_verified_entry_is_uploaded_again_once_the_document_is_gone() -> None:
+    """Tests that a cached document the API no longer has is uploaded again"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"documentId": "doc-new"})
+
+    cache = MemoryDocumentCache(verify=True)
+    cache.put(_SHA256, content_type="application/pdf", document_id="doc-gone")
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        document_cache=cache,
+    )
+
+    document = client.sign.upload_document(content_type="application/pdf", data=_PDF)
+
+    assert [request.method for request in requests] == ["GET", "POST"]
+    assert requests[0].url.path.endswith("/documents/doc-gone/metadata")
+    assert document.document_id == "doc-new"
+    assert cache.get(_SHA256, content_type="application/pdf") == "doc-new"
+
+
+@pytest.mark.asyncio
+async def test_async_stream_upload_is_remembered(tmp_path: typing.Any) -> None:
+    """Tests that a file streamed by the async client is reused on the next upload"""
+    requests: typing.List[httpx.Request] = []
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(_PDF)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await request.aread()
+        return httpx.Response(200, json={"documentId": "doc-1"})
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        document_cache=FileDocumentCache(tmp_path / "documents.db"),
+    )
+
+    first = await client.sign.upload_document_stream(
+        content_type="application/pdf", source=path
+    )
+    second = await client.sign.upload_document_stream(
+        content_type="application/pdf", source=path
+    )
+
+    assert first.document_id == second.document_id == "doc-1"
+    assert len(requests) == 1
+
+
+def test_str_content_is_hashed_as_content_not_opened_as_a_path(
+    tmp_path: typing.Any,
+) -> None:
+    """Tests that `str` data is keyed by its UTF-8 bytes, even when it names a file"""
+    requests: typing.List[httpx.Request] = []
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(_PDF)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"documentId": f"doc-{len(requests)}"})
+
+    cache = MemoryDocumentCache()
+    cache.put(_SHA256, content_type="text/plain", document_id="doc-file")
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        document_cache=cache,
+    )
+
+    first = client.sign.upload_document(content_type="text/plain", data="hello world")
+    again = client.sign.upload_document(content_type="text/plain", data="hello world")
+    long = client.sign.upload_document(content_type="text/plain", data="x" * 5000)
+    named = client.sign.upload_document(content_type="text/plain", data=str(path))
+
+    assert first.document_id == again.document_id == "doc-1"
+    assert long.document_id == "doc-2"
+    assert named.document_id == "doc-3"
+    assert str(path).encode() in requests[-1].content
@@ -0,0 +1,135 @@
+import httpx
+import io
+import pathlib
+import pytest
+import typing
+
+from signicat_dem_py import ApiError, AsyncClient, Client
+
+
+_CONTENT = bytes(range(256)) * 1024
+
+
+def _ranged_handler(
+    ranges: typing.List[typing.Optional[str]], *, honour_range: bool = True
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("Range")
+        ranges.append(header)
+        if header is None or not honour_range:
+            return httpx.Response(200, content=_CONTENT)
+        start = int(header[len("bytes=") : -1])
+        if start >= len(_CONTENT):
+            return httpx.Response(
+                416, headers={"Content-Range": f"bytes */{len(_CONTENT)}"}
+            )
+        return httpx.Response(
+            206,
+            headers={
+                "Content-Range": f"bytes {start}-{len(_CONTENT) - 1}/{len(_CONTENT)}"
+            },
+            content=_CONTENT[start:],
+        )
+
+    return handler
+
+
+def test_document_is_streamed_to_a_path_with_progress(tmp_path: pathlib.Path) -> None:
+    """Tests that the document is written in chunks and progress is reported"""
+    ranges: typing.List[typing.Optional[str]] = []
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(_ranged_handler(ranges))
+        ),
+    )
+    dest = tmp_path / "document.pdf"
+    progress: typing.List[typing.Tuple[int, typing.Optional[int]]] = []
+
+    size = client.sign.download_document(
+        document_id="document",
+        dest=dest,
+        progress=lambda received, total: progress.append((received, total)),
+        chunk_size=64 * 1024,
+    )
+
+    assert size == len(_CONTENT)
+    assert dest.read_bytes() == _CONTENT
+    assert ranges == [None]
+    assert progress[0] == (0, len(_CONTENT))
+    assert progress[-1] == (len(_CONTENT), len(_CONTENT))
+    assert len(progress) == 5
+
+
+def test_resumed_download_requests_only_the_missing_part(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Tests resuming with a partial response, a full response and a complete file"""
+    dest = tmp_path / "document.pdf"
+    dest.write_bytes(_CONTENT[:1000])
+    ranges: typing.List[typing.Optional[str]] = []
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(_ranged_handler(ranges))
+        ),
+    )
+
+    assert client.sign.download_document(
+        document_id="document", dest=dest, resume=True
+    ) == len(_CONTENT)
+    assert dest.read_bytes() == _CONTENT
+    assert client.sign.download_document(
+        document_id="document", dest=dest, resume=True
+    ) == len(_CONTENT)
+    assert ranges == ["bytes=1000-", f"bytes={len(_CONTENT)}-"]
+
+    dest.write_bytes(b"stale")
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(_ranged_handler(ranges, honour_range=False))
+        ),
+    )
+    client.sign.download_document(document_id="document", dest=dest, resume=True)
+    assert dest.read_bytes() == _CONTENT
+
+
+def test_failed_download_raises_without_writing(tmp_path: pathlib.Path) -> None:
+    """Tests that an error response raises ApiError and leaves `dest` untouched"""
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(404, json={"error": "not found"})
+            )
+        ),
+    )
+    dest = tmp_path / "report.pdf"
+
+    with pytest.raises(ApiError) as exc_info:
+        client.dem.download_report(id="record", dest=dest)
+    assert exc_info.value.status_code == 404
+    assert not dest.exists()
+
+
+@pytest.mark.asyncio
+async def test_async_report_is_streamed_to_a_file_object() -> None:
+    """Tests that the async client streams into a writable file object"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=_CONTENT)
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    dest = io.BytesIO()
+
+    size = await client.dem.download_report(id="record", dest=dest, chunk_size=1000)
+
+    assert size == len(_CONTENT)
+    assert dest.getvalue() == _CONTENT
+    assert requests[0].url.path.endswith("/reports/record")
@@ -0,0 +1,101 @@
+import asyncio
+import httpx
+import pytest
+import threading
+import time
+import typing
+
+from signicat_dem_py import AsyncClient, Client, HedgePolicy
+
+
+def test_hedge_policy_delay_follows_percentile_and_budget() -> None:
+    """Tests the hedge delay percentile and the hedging budget"""
+    policy = HedgePolicy(percentile=90, budget=0.1, min_samples=10)
+    assert policy.hedge_delay() is None
+
+    for latency in range(1, 11):
+        policy.record(latency / 100)
+
+    assert policy.hedge_delay() == 0.09
+    assert policy.try_hedge() is True
+    assert policy.try_hedge() is False
+
+
+def test_slow_get_is_hedged_and_fast_copy_wins() -> None:
+    """Tests that a second request is sent after the delay and its response is returned"""
+    calls: typing.List[int] = []
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            calls.append(len(calls))
+            n = calls[-1]
+        if n == 0:
+            time.sleep(0.3)
+        return httpx.Response(200, text=f"response-{n}")
+
+    hedge = HedgePolicy(delay=0.02, budget=1)
+    hedge.record(0.01)
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        hedge=hedge,
+    )
+
+    start = time.monotonic()
+    assert client.dem.signicat() == "response-1"
+    assert time.monotonic() - start < 0.25
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_hedge_cancels_the_slower_request() -> None:
+    """Tests that the asynchronous client cancels the request that loses the race"""
+    cancelled: typing.List[int] = []
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        n = calls
+        try:
+            await asyncio.sleep(0.5 if n == 1 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return httpx.Response(200, text=f"response-{n}")
+
+    hedge = HedgePolicy(delay=0.02, budget=1)
+    hedge.record(0.01)
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    result = await client.dem.signicat(request_options={"hedge": hedge})
+    await asyncio.sleep(0)
+
+    assert result == "response-2"
+    assert cancelled == [1]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_not_hedged_without_budget() -> None:
+    """Tests that an exhausted budget lets slow requests run without a hedge"""
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text="OK")
+
+    hedge = HedgePolicy(delay=0.01, budget=0.01)
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        hedge=hedge,
+    )
+
+    assert await client.dem.signicat() == "OK"
+    assert calls == 1
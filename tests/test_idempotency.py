@@ -0,0 +1,138 @@
+import httpx
+import json
+import pytest
+import typing
+
+from signicat_dem_py import ApiError, AsyncClient, Client, RetryPolicy
+
+
+_NO_BACKOFF = RetryPolicy(max_attempts=3, backoff_base=0)
+
+_RECORD: typing.Dict[str, typing.Any] = {
+    "core_data": {},
+    "metadata": {},
+    "ttl": 30,
+    "type_": "LOG_IN",
+}
+
+
+def test_post_retries_reuse_the_generated_idempotency_key() -> None:
+    """Tests that every attempt of a POST carries the same generated key"""
+    keys: typing.List[typing.Optional[str]] = []
+    statuses = [503, 503, 200, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        keys.append(request.headers.get("Idempotency-Key"))
+        return httpx.Response(statuses.pop(0), json={"id": "record"})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry=_NO_BACKOFF,
+    )
+
+    client.dem.post_new_record(**_RECORD, request_options={"idempotent": True})
+    client.dem.post_new_record(**_RECORD)
+
+    assert len(keys) == 4
+    assert keys[0] is not None and keys[:3] == [keys[0]] * 3
+    assert keys[3] is not None and keys[3] != keys[0]
+
+
+def test_own_idempotency_key_is_sent_and_makes_the_post_retryable() -> None:
+    """Tests the `idempotency_key` request option and the `idempotency_keys` switch"""
+    keys: typing.List[typing.Optional[str]] = []
+    statuses = [502, 200, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        keys.append(request.headers.get("Idempotency-Key"))
+        return httpx.Response(statuses.pop(0), json={"id": "record"})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry=_NO_BACKOFF,
+        idempotency_keys=False,
+    )
+
+    client.dem.post_new_record(
+        **_RECORD, request_options={"idempotency_key": "order-42"}
+    )
+    client.dem.post_new_record(**_RECORD)
+
+    assert keys == ["order-42", "order-42", None]
+
+
+def test_retried_collection_creation_returns_the_existing_collection() -> None:
+    """Tests the generated collection ID and the fallback to GET on a 409 conflict"""
+    requests: typing.List[httpx.Request] = []
+    statuses = [504, 409]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(200, json={"id": "existing", "documents": []})
+        return httpx.Response(statuses.pop(0))
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry=_NO_BACKOFF,
+    )
+
+    collection = client.sign.create_document_collection(documents=[])
+
+    sent_id = json.loads(requests[0].content)["id"]
+    assert json.loads(requests[1].content)["id"] == sent_id
+    assert requests[2].url.path.endswith(f"/document-collections/{sent_id}")
+    assert collection.id == "existing"
+
+
+@pytest.mark.asyncio
+async def test_async_signing_session_ids_are_generated_once() -> None:
+    """Tests that sessions without an ID get one that is reused on retries"""
+    ids: typing.List[typing.List[str]] = []
+    statuses = [503, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sessions = json.loads(request.content)
+        ids.append([session["id"] for session in sessions])
+        return httpx.Response(statuses.pop(0), json=sessions)
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        retry=_NO_BACKOFF,
+    )
+
+    sessions = await client.sign.create_signing_session(
+        data=[
+            {"documents": [], "signing_setup": [], "title": "Contract"},
+            {"documents": [], "signing_setup": [], "title": "Annex", "id": "mine"},
+        ]
+    )
+
+    assert len(ids) == 2 and ids[0] == ids[1]
+    assert ids[0][1] == "mine"
+    assert [session.id for session in sessions] == ids[0]
+
+
+def test_conflict_on_the_first_attempt_is_raised() -> None:
+    """Tests that a 409 not preceded by an earlier attempt is not taken for a retry"""
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(409, json={"title": "Conflict"})
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry=_NO_BACKOFF,
+    )
+
+    with pytest.raises(ApiError) as raised:
+        client.sign.create_document_collection(documents=[])
+
+    assert raised.value.status_code == 409
+    assert [request.method for request in requests] == ["POST"]
@@ -0,0 +1,220 @@
+import asyncio
+import datetime
+import httpx
+import json
+import pytest
+import typing
+
+from signicat_dem_py import AsyncClient, Client
+
+
+def _session(session_id: int) -> typing.Dict[str, typing.Any]:
+    return {
+        "id": str(session_id),
+        "documents": [],
+        "signingSetup": [],
+        "title": "Business Process",
+    }
+
+
+def _signing_sessions_handler(
+    total: int, requested: typing.List[int]
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params.get("limit", "10"))
+        offset = int(request.url.params.get("offset", "0"))
+        requested.append(offset)
+        ids = list(range(offset, min(offset + limit, total)))
+        body = {
+            "count": len(ids),
+            "data": [_session(i) for i in ids],
+            "limit": limit,
+            "offset": offset,
+            "total": total,
+        }
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_iter_signing_sessions_walks_every_page() -> None:
+    """Tests that iter_signing_sessions follows the offsets up to `total`"""
+    requested: typing.List[int] = []
+    transport = httpx.MockTransport(_signing_sessions_handler(25, requested))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    sessions = list(client.sign.iter_signing_sessions(limit=10, prefetch=2))
+
+    assert [s.id for s in sessions] == [str(i) for i in range(25)]
+    assert sorted(requested) == [0, 10, 20]
+
+
+def test_iter_signing_sessions_without_prefetch() -> None:
+    """Tests that prefetch=0 fetches the pages sequentially"""
+    requested: typing.List[int] = []
+    transport = httpx.MockTransport(_signing_sessions_handler(20, requested))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    sessions = list(client.sign.iter_signing_sessions(limit=10, prefetch=0))
+
+    assert len(sessions) == 20
+    assert requested == [0, 10]
+
+
+def test_iter_signing_sessions_stops_on_short_page_without_total() -> None:
+    """Tests that a listing without `total` ends at the first short page"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        ids = list(range(offset, min(offset + 5, 12)))
+        return httpx.Response(
+            200, json={"data": [_session(i) for i in ids], "limit": 5}
+        )
+
+    transport = httpx.MockTransport(handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    sessions = list(client.sign.iter_signing_sessions(limit=5, prefetch=3))
+
+    assert [s.id for s in sessions] == [str(i) for i in range(12)]
+
+
+@pytest.mark.asyncio
+async def test_aiter_signing_sessions_walks_every_page() -> None:
+    """Tests that aiter_signing_sessions follows the offsets up to `total`"""
+    requested: typing.List[int] = []
+    transport = httpx.MockTransport(_signing_sessions_handler(25, requested))
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    sessions = [s async for s in client.sign.aiter_signing_sessions(limit=10)]
+
+    assert [s.id for s in sessions] == [str(i) for i in range(25)]
+    assert sorted(requested) == [0, 10, 20]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_scan_signing_sessions_bounds_concurrency(ordered: bool) -> None:
+    """Tests that scan_signing_sessions fetches every page with a bounded fan-out"""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _signing_sessions_handler(95, [])(request)
+
+    transport = httpx.MockTransport(handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    sessions = [
+        s
+        async for s in client.sign.scan_signing_sessions(
+            limit=10, concurrency=3, ordered=ordered
+        )
+    ]
+
+    ids = [s.id for s in sessions]
+    if ordered:
+        assert ids == [str(i) for i in range(95)]
+    else:
+        assert sorted(ids, key=int) == [str(i) for i in range(95)]
+    assert max_in_flight <= 3
+
+
+def _query_handler(
+    total: int, requested: typing.List[int]
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        size = int(request.url.params["size"])
+        requested.append(page)
+        ids = list(range(page * size, min((page + 1) * size, total)))
+        body = {
+            "content": [{"id": str(i)} for i in ids],
+            "number": page,
+            "size": size,
+            "totalPages": -(-total // size),
+        }
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_iter_query_yields_typed_records() -> None:
+    """Tests that iter_query walks every page and yields RecordResponse objects"""
+    requested: typing.List[int] = []
+    transport = httpx.MockTransport(_query_handler(23, requested))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    records = list(client.dem.iter_query(page_size=10, prefetch=1))
+
+    assert [r.id for r in records] == [str(i) for i in range(23)]
+    assert requested[:3] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_aiter_query_reads_hal_pages() -> None:
+    """Tests that aiter_query understands HAL pages and stops at the last one"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        ids = [] if page > 1 else [str(page * 2), str(page * 2 + 1)]
+        body = {
+            "_embedded": {"recordResponseList": [{"id": i} for i in ids]},
+            "page": {"size": 2, "totalElements": 4, "totalPages": 2, "number": page},
+        }
+        return httpx.Response(200, json=body)
+
+    transport = httpx.MockTransport(handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    records = [r async for r in client.dem.aiter_query(page_size=2, prefetch=0)]
+
+    assert [r.id for r in records] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_query_sharded_splits_time_window() -> None:
+    """Tests that query_sharded adds one gte/lt window per shard and merges the results"""
+    windows: typing.List[typing.Tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        conditions = json.loads(request.content)["and"]
+        lower = next(c["value"] for c in conditions if c["operator"] == "gte")
+        upper = next(c["value"] for c in conditions if c["operator"] == "lt")
+        windows.append((lower, upper))
+        return httpx.Response(200, json={"content": [{"id": lower}], "last": True})
+
+    transport = httpx.MockTransport(handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    records = [
+        r
+        async for r in client.dem.query_sharded(
+            data={"and_": [{"field": "metadata.type", "operator": "eq", "value": "X"}]},
+            start=datetime.datetime(2024, 1, 1),
+            end=datetime.datetime(2024, 1, 5),
+            shards=4,
+            concurrency=2,
+        )
+    ]
+
+    assert sorted(windows) == [
+        ("2024-01-01T00:00:00", "2024-01-02T00:00:00"),
+        ("2024-01-02T00:00:00", "2024-01-03T00:00:00"),
+        ("2024-01-03T00:00:00", "2024-01-04T00:00:00"),
+        ("2024-01-04T00:00:00", "2024-01-05T00:00:00"),
+    ]
+    assert sorted(r.id or "" for r in records) == [w[0] for w in sorted(windows)]
@@ -0,0 +1,71 @@
+import httpx
+import pytest
+import typing
+
+from signicat_dem_py import AsyncClient, Client
+
+
+def _pool(client: typing.Union[httpx.Client, httpx.AsyncClient]) -> typing.Any:
+    return client._transport._pool  # type: ignore[attr-defined]
+
+
+def test_client_applies_pool_options() -> None:
+    """Tests that the pool settings configure the shared connection pool"""
+    client = Client(
+        token="API_TOKEN",
+        max_connections=200,
+        max_keepalive_connections=None,
+        keepalive_expiry=30,
+    )
+
+    pool = _pool(client._base_client.httpx_client)
+    assert pool._max_connections == 200
+    assert pool._max_keepalive_connections == 200
+    assert pool._keepalive_expiry == 30
+    assert client._base_client.service_httpx_clients == {}
+
+
+def test_client_routes_services_to_dedicated_pools() -> None:
+    """Tests that services listed in `pools` are sent through their own httpx client"""
+    client = Client(
+        token="API_TOKEN", max_connections=50, pools={"dem": {"keepalive_expiry": 60}}
+    )
+    base_client = client._base_client
+
+    dem_pool = _pool(base_client.httpx_client_for("dem"))
+    assert dem_pool._max_connections == 50
+    assert dem_pool._keepalive_expiry == 60
+    assert base_client.httpx_client_for("sign") is base_client.httpx_client
+
+    hosts: typing.List[str] = []
+    transport = httpx.MockTransport(
+        lambda request: hosts.append(request.url.host) or httpx.Response(200, text="OK")
+    )
+    base_client.service_httpx_clients["dem"] = httpx.Client(transport=transport)
+    assert client.dem.signicat() == "OK"
+    assert hosts == ["api.signicat.com"]
+
+
+@pytest.mark.asyncio
+async def test_async_client_routes_services_to_dedicated_pools() -> None:
+    """Tests that the asynchronous client sends each service through its own pool"""
+    seen: typing.List[str] = []
+
+    def transport(name: str) -> httpx.MockTransport:
+        return httpx.MockTransport(
+            lambda request: seen.append(name) or httpx.Response(200, text="OK")
+        )
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=transport("shared")),
+        pools={"dem": {"max_connections": 10}},
+    )
+    client._base_client.service_httpx_clients["dem"] = httpx.AsyncClient(
+        transport=transport("dem")
+    )
+
+    await client.dem.signicat()
+    await client.sign.list_signing_sessions()
+
+    assert seen == ["dem", "shared"]
@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+import pytest
+import threading
+import time
+import typing
+
+from signicat_dem_py import AsyncClient, Client, RateLimiter
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"id": "document"})
+
+
+def test_rate_limiter_allows_bursts_then_paces() -> None:
+    """Tests that a limiter admits a burst at once and then `rate` requests per second"""
+    limiter = RateLimiter(rate=50, burst=5)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 0.09 <= time.monotonic() - start < 0.5
+
+
+def test_endpoint_limiters_only_apply_to_matching_requests() -> None:
+    """Tests that `<service>:<METHOD> <path>` limiters only pace matching requests"""
+    documents = RateLimiter(rate=1, burst=1)
+    sign = RateLimiter(rate=1, burst=2)
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(_ok)),
+        rate_limiters={"sign:POST /documents": documents, "sign": sign},
+    )
+
+    client.sign.list_signing_sessions()
+    client.sign.upload_document(content_type="application/pdf", data=b"%PDF-1.4")
+
+    assert documents.reserve() > 0
+    assert sign.reserve() > 0.9
+
+
+@pytest.mark.asyncio
+async def test_async_requests_share_a_limiter() -> None:
+    """Tests that concurrent asynchronous requests wait for the shared limiter in turn"""
+    sent: typing.List[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(time.monotonic())
+        return httpx.Response(200, text="OK")
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiters={"dem": RateLimiter(rate=100, burst=1)},
+    )
+
+    start = time.monotonic()
+    await asyncio.gather(*(client.dem.signicat() for _ in range(6)))
+
+    assert len(sent) == 6
+    assert sent[-1] - start >= 0.045
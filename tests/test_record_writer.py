@@ -0,0 +1,241 @@
+import asyncio
+import datetime
+import httpx
+import json
+import pathlib
+import pytest
+import threading
+import time
+import typing
+
+from signicat_dem_py import AsyncClient, AsyncDemRecordWriter, Client, DemRecordWriter
+from signicat_dem_py.types import params
+
+
+def _record(n: int, type_: str = "LOG_IN") -> params.RecordRequest:
+    return {"core_data": {}, "metadata": {"n": n}, "ttl": 30, "type_": type_}
+
+
+def _recording_handler(
+    posted: typing.List[int],
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if body["type"] == "FAIL":
+            return httpx.Response(503)
+        posted.append(body["metadata"]["n"])
+        return httpx.Response(200, json={"id": str(body["metadata"]["n"])})
+
+    return handler
+
+
+def test_record_writer_flushes_on_close() -> None:
+    """Tests that every written record is posted once the writer is closed"""
+    posted: typing.List[int] = []
+    transport = httpx.MockTransport(_recording_handler(posted))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    with DemRecordWriter(client.dem, max_queue=5, batch_size=3) as writer:
+        for n in range(20):
+            writer.write(_record(n))
+
+    assert sorted(posted) == list(range(20))
+
+
+def test_record_writer_journals_and_replays_failures(tmp_path: pathlib.Path) -> None:
+    """Tests that failed records are journaled and posted by the next writer"""
+    journal = tmp_path / "records.jsonl"
+    posted: typing.List[int] = []
+    transport = httpx.MockTransport(_recording_handler(posted))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+
+    with DemRecordWriter(client.dem, journal_path=journal) as writer:
+        writer.write(_record(1))
+        writer.write(_record(2, "FAIL"))
+
+    assert posted == [1]
+    assert [json.loads(line)["metadata"]["n"] for line in journal.open()] == [2]
+
+    failed = json.loads(journal.read_text())
+    failed["type_"] = "LOG_IN"
+    journal.write_text(json.dumps(failed) + "\n")
+    with DemRecordWriter(client.dem, journal_path=journal):
+        pass
+
+    assert posted == [1, 2]
+    assert journal.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_async_record_writer_flushes_on_close() -> None:
+    """Tests that the async writer posts every record before closing"""
+    posted: typing.List[int] = []
+    transport = httpx.MockTransport(_recording_handler(posted))
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+
+    async with AsyncDemRecordWriter(client.dem, max_queue=4, batch_size=2) as writer:
+        for n in range(10):
+            await writer.write(_record(n))
+
+    assert sorted(posted) == list(range(10))
+
+
+def test_record_writer_reports_records_left_after_close_timeout() -> None:
+    """Tests that records not posted before the close timeout reach `on_error`"""
+    posted: typing.List[int] = []
+    dropped: typing.List[typing.Tuple[int, Exception]] = []
+    release = threading.Event()
+    recording = _recording_handler(posted)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        release.wait(5)
+        return recording(request)
+
+    transport = httpx.MockTransport(handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+    writer = DemRecordWriter(
+        client.dem,
+        batch_size=2,
+        on_error=lambda record, e: dropped.append((record["metadata"]["n"], e)),
+    )
+    for n in range(10):
+        writer.write(_record(n))
+    time.sleep(0.05)
+
+    writer.close(timeout=0.1)
+    release.set()
+    writer._thread.join(5)
+
+    assert not writer._thread.is_alive()
+    assert len(dropped) == 8
+    assert all(isinstance(e, TimeoutError) for _, e in dropped)
+    assert sorted(posted + [n for n, _ in dropped]) == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_async_record_writer_reports_records_left_after_close_timeout() -> None:
+    """Tests that the async writer reports unposted records and its task exits"""
+    posted: typing.List[int] = []
+    dropped: typing.List[int] = []
+    release = asyncio.Event()
+    recording = _recording_handler(posted)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return recording(request)
+
+    transport = httpx.MockTransport(handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+    writer = AsyncDemRecordWriter(
+        client.dem,
+        batch_size=2,
+        on_error=lambda record, e: dropped.append(record["metadata"]["n"]),
+    )
+    for n in range(10):
+        await writer.write(_record(n))
+    await asyncio.sleep(0.05)
+
+    await writer.close(timeout=0.1)
+    release.set()
+    assert writer._task is not None
+    await asyncio.wait_for(writer._task, 5)
+
+    assert sorted(posted + dropped) == list(range(10))
+    assert len(dropped) == 8
+
+
+def test_record_writer_reports_records_that_cannot_be_journaled(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Tests that a record the journal cannot serialise still reaches `on_error`"""
+    journal = tmp_path / "records.jsonl"
+    errors: typing.List[typing.Tuple[int, Exception]] = []
+    posted: typing.List[int] = []
+    transport = httpx.MockTransport(_recording_handler(posted))
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+    unserialisable = _record(2, "FAIL")
+    unserialisable["core_data"] = {"at": datetime.datetime(2024, 1, 1)}
+
+    with DemRecordWriter(
+        client.dem,
+        journal_path=journal,
+        on_error=lambda record, e: errors.append((record["metadata"]["n"], e)),
+    ) as writer:
+        writer.write(_record(1, "FAIL"))
+        writer.write(unserialisable)
+
+    assert [json.loads(line)["metadata"]["n"] for line in journal.open()] == [1]
+    journal_errors = [e for n, e in errors if n == 2][1:]
+    assert len(journal_errors) == 1 and isinstance(journal_errors[0], TypeError)
+
+
+def test_record_writer_close_timeout_holds_with_a_full_queue() -> None:
+    """Tests that `close` does not wait past its timeout for room for the stop marker"""
+    posted: typing.List[int] = []
+    dropped: typing.List[int] = []
+    release = threading.Event()
+    recording = _recording_handler(posted)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        release.wait(5)
+        return recording(request)
+
+    transport = httpx.MockTransport(handler)
+    client = Client(token="API_TOKEN", httpx_client=httpx.Client(transport=transport))
+    writer = DemRecordWriter(
+        client.dem,
+        max_queue=2,
+        batch_size=1,
+        on_error=lambda record, e: dropped.append(record["metadata"]["n"]),
+    )
+    for n in range(3):
+        writer.write(_record(n))
+    time.sleep(0.05)
+
+    start = time.monotonic()
+    writer.close(timeout=0.1)
+    elapsed = time.monotonic() - start
+    release.set()
+    writer._thread.join(5)
+
+    assert elapsed < 1
+    assert not writer._thread.is_alive()
+    assert sorted(posted + dropped) == [0, 1, 2] and len(dropped) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_record_writer_close_timeout_holds_with_a_full_queue() -> None:
+    """Tests that the async `close` does not wait past its timeout for queue room"""
+    posted: typing.List[int] = []
+    dropped: typing.List[int] = []
+    release = asyncio.Event()
+    recording = _recording_handler(posted)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return recording(request)
+
+    transport = httpx.MockTransport(handler)
+    client = AsyncClient(
+        token="API_TOKEN", httpx_client=httpx.AsyncClient(transport=transport)
+    )
+    writer = AsyncDemRecordWriter(
+        client.dem,
+        max_queue=2,
+        batch_size=1,
+        on_error=lambda record, e: dropped.append(record["metadata"]["n"]),
+    )
+    for n in range(3):
+        await writer.write(_record(n))
+    await asyncio.sleep(0.05)
+
+    await asyncio.wait_for(writer.close(timeout=0.1), 1)
+    release.set()
+    assert writer._task is not None
+    await asyncio.wait_for(writer._task, 5)
+
+    assert sorted(posted + dropped) == [0, 1, 2] and len(dropped) == 2
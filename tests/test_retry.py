@@ -0,0 +1,138 @@
+import httpx
+import pytest
+import typing
+
+from signicat_dem_py import ApiError, AsyncClient, Client, RetryPolicy
+
+
+def _flaky_handler(
+    responses: typing.List[typing.Union[httpx.Response, Exception]],
+    methods: typing.List[str],
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        outcome = responses.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return handler
+
+
+_NO_BACKOFF = RetryPolicy(max_attempts=3, backoff_base=0)
+
+
+def test_get_is_retried_on_status_and_transport_errors() -> None:
+    """Tests that idempotent requests are retried on retryable statuses and exceptions"""
+    methods: typing.List[str] = []
+    responses: typing.List[typing.Union[httpx.Response, Exception]] = [
+        httpx.Response(503),
+        httpx.ConnectError("connection refused"),
+        httpx.Response(200, text="OK"),
+    ]
+    transport = httpx.MockTransport(_flaky_handler(responses, methods))
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=transport),
+        retry=_NO_BACKOFF,
+    )
+
+    assert client.dem.signicat() == "OK"
+    assert methods == ["GET"] * 3
+
+
+def test_retries_stop_after_max_attempts() -> None:
+    """Tests that the last response is raised once every attempt has failed"""
+    methods: typing.List[str] = []
+    responses: typing.List[typing.Union[httpx.Response, Exception]] = [
+        httpx.Response(429, headers={"Retry-After": "0"}) for _ in range(3)
+    ]
+    transport = httpx.MockTransport(_flaky_handler(responses, methods))
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=transport),
+        retry=_NO_BACKOFF,
+    )
+
+    with pytest.raises(ApiError) as exc_info:
+        client.dem.signicat()
+    assert exc_info.value.status_code == 429
+    assert len(methods) == 3
+
+
+def test_post_is_only_retried_when_marked_idempotent() -> None:
+    """Tests that non-idempotent methods are only retried with the `idempotent` option"""
+    methods: typing.List[str] = []
+    responses: typing.List[typing.Union[httpx.Response, Exception]] = [
+        httpx.Response(503),
+        httpx.Response(503),
+        httpx.Response(200, json={"id": "record"}),
+    ]
+    transport = httpx.MockTransport(_flaky_handler(responses, methods))
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=transport),
+        retry=_NO_BACKOFF,
+    )
+    record: typing.Dict[str, typing.Any] = {
+        "core_data": {},
+        "metadata": {},
+        "ttl": 30,
+        "type_": "LOG_IN",
+    }
+
+    with pytest.raises(ApiError):
+        client.dem.post_new_record(**record)
+    assert len(methods) == 1
+
+    result = client.dem.post_new_record(**record, request_options={"idempotent": True})
+    assert result.id == "record"
+    assert len(methods) == 3
+
+
+def test_retry_delay_uses_full_jitter_and_retry_after() -> None:
+    """Tests the backoff bounds and `Retry-After` handling of RetryPolicy"""
+    policy = RetryPolicy(backoff_base=1, backoff_max=4, retry_after_max=10)
+
+    assert all(0 <= policy.delay(attempt=5) <= 4 for _ in range(100))
+    assert (
+        policy.delay(
+            attempt=1, response=httpx.Response(429, headers={"Retry-After": "3"})
+        )
+        == 3
+    )
+    assert (
+        policy.delay(
+            attempt=1, response=httpx.Response(503, headers={"Retry-After": "120"})
+        )
+        == 10
+    )
+    date = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert (
+        policy.delay(
+            attempt=1, response=httpx.Response(503, headers={"Retry-After": date})
+        )
+        == 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_request_options_override_client_policy() -> None:
+    """Tests that the `retry` request option overrides or disables the client's policy"""
+    methods: typing.List[str] = []
+    responses: typing.List[typing.Union[httpx.Response, Exception]] = [
+        httpx.Response(502),
+        httpx.Response(502),
+        httpx.Response(200, text="OK"),
+    ]
+    transport = httpx.MockTransport(_flaky_handler(responses, methods))
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=transport),
+        retry=_NO_BACKOFF,
+    )
+
+    with pytest.raises(ApiError):
+        await client.dem.signicat(request_options={"retry": None})
+    assert await client.dem.signicat() == "OK"
+    assert len(methods) == 3
@@ -0,0 +1,267 @@
+import asyncio
+import hashlib
+import httpx
+import io
+import os
+import pathlib
+import pytest
+import threading
+import typing
+
+from signicat_dem_py import ApiError, AsyncClient, Client, DocumentStream, RetryPolicy
+
+
+_CONTENT = bytes(range(256)) * 4096
+
+
+def _upload_handler(
+    bodies: typing.List[bytes], statuses: typing.List[int]
+) -> typing.Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Content-Type"] == "application/pdf"
+        bodies.append(request.read())
+        return httpx.Response(statuses.pop(0), json={"documentId": "document"})
+
+    return handler
+
+
+def test_path_upload_is_streamed_hashed_and_retried(tmp_path: pathlib.Path) -> None:
+    """Tests that a file is sent in chunks with its length, hash and retries"""
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(_CONTENT)
+    bodies: typing.List[bytes] = []
+    requests: typing.List[httpx.Request] = []
+    handler = _upload_handler(bodies, [503, 200])
+
+    def recording_handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(recording_handler)),
+        retry=RetryPolicy(max_attempts=3, backoff_base=0),
+    )
+    stream = DocumentStream(path, chunk_size=64 * 1024)
+
+    response = client.sign.upload_document_stream(
+        content_type="application/pdf",
+        source=stream,
+        request_options={"idempotent": True},
+    )
+
+    digest = hashlib.sha256(_CONTENT).hexdigest()
+    assert bodies == [_CONTENT, _CONTENT]
+    assert requests[0].headers["Content-Length"] == str(len(_CONTENT))
+    assert stream.sha256 == digest
+    assert response.document_id == "document"
+    assert response.document_hash is not None
+    assert response.document_hash.hash == digest
+
+
+def test_iterator_upload_is_sent_once() -> None:
+    """Tests that an iterable is sent chunked and its upload is never retried"""
+    bodies: typing.List[bytes] = []
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(_upload_handler(bodies, [503, 200]))
+        ),
+        retry=RetryPolicy(max_attempts=3, backoff_base=0),
+    )
+
+    with pytest.raises(ApiError):
+        client.sign.upload_document_stream(
+            content_type="application/pdf",
+            source=iter([_CONTENT[:10], _CONTENT[10:]]),
+            request_options={"idempotent": True},
+        )
+    assert bodies == [_CONTENT]
+
+
+@pytest.mark.asyncio
+async def test_async_upload_streams_files_and_async_iterables() -> None:
+    """Tests that the async client streams file objects and async iterables"""
+    bodies: typing.List[bytes] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Content-Type"] == "application/pdf"
+        bodies.append(await request.aread())
+        return httpx.Response(200, json={"documentId": "document"})
+
+    async def chunks() -> typing.AsyncIterator[bytes]:
+        yield _CONTENT[:100]
+        yield _CONTENT[100:]
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    from_file = await client.sign.upload_document_stream(
+        content_type="application/pdf", source=io.BytesIO(_CONTENT), chunk_size=1000
+    )
+    from_iterable = await client.sign.upload_document_stream(
+        content_type="application/pdf", source=chunks()
+    )
+
+    digest = hashlib.sha256(_CONTENT).hexdigest()
+    assert bodies == [_CONTENT, _CONTENT]
+    assert from_file.document_hash is not None
+    assert from_file.document_hash.hash == digest
+    assert from_iterable.document_hash is not None
+    assert from_iterable.document_hash.hash == digest
+
+
+def test_path_upload_sends_the_same_multipart_body_as_a_file(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Tests that `upload_document` frames a mapped path like an open file"""
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(_CONTENT)
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+    bodies: typing.List[bytes] = []
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(_upload_handler(bodies, [200, 200, 200]))
+        ),
+    )
+
+    with path.open("rb") as file:
+        client.sign.upload_document(content_type="application/pdf", data=file)
+    client.sign.upload_document(content_type="application/pdf", data=path)
+    client.sign.upload_document(content_type="application/pdf", data=empty)
+    pieces: typing.List[typing.Any] = []
+
+    class ChunkRecorder(httpx.BaseTransport):
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            pieces.extend(typing.cast(typing.Iterable[typing.Any], request.stream))
+            return httpx.Response(200, json={"documentId": "document"})
+
+    Client(
+        token="API_TOKEN", httpx_client=httpx.Client(transport=ChunkRecorder())
+    ).sign.upload_document(content_type="application/pdf", data=path)
+
+    from_file, from_path, from_empty = (
+        body.replace(body.split(b"\r\n", 1)[0], b"--boundary") for body in bodies
+    )
+    assert from_path == from_file
+    assert _CONTENT in from_path and b'filename="contract.pdf"' in from_path
+    assert b'filename="empty.pdf"' in from_empty
+    assert _CONTENT in b"".join(pieces)
+    assert sum(isinstance(piece, memoryview) for piece in pieces) == 16
+
+
+def test_upload_documents_detects_types_and_keeps_input_order(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Tests the detected content types, hashes and per-document errors"""
+    named = tmp_path / "annex.xml"
+    named.write_bytes(b"<annex/>")
+    unnamed = tmp_path / "contract"
+    unnamed.write_bytes(b"%PDF-1.7 contract")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        if body == b"broken":
+            return httpx.Response(400)
+        return httpx.Response(
+            200,
+            json={
+                "documentId": body.decode(),
+                "mimeType": request.headers["Content-Type"],
+            },
+        )
+
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    results = client.sign.upload_documents(
+        sources=[unnamed, named, io.BytesIO(b"broken"), iter([b"plain"])],
+        concurrency=3,
+    )
+
+    contract, annex, broken, plain = results
+    assert not isinstance(contract, Exception) and not isinstance(annex, Exception)
+    assert not isinstance(plain, Exception)
+    assert contract.mime_type == "application/pdf"
+    assert annex.mime_type in ("application/xml", "text/xml")
+    assert plain.mime_type == "application/octet-stream"
+    assert contract.document_hash is not None
+    assert (
+        contract.document_hash.hash == hashlib.sha256(b"%PDF-1.7 contract").hexdigest()
+    )
+    assert isinstance(broken, ApiError) and broken.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_async_upload_documents_runs_uploads_concurrently() -> None:
+    """Tests that the async uploads overlap up to `concurrency`"""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        body = await request.aread()
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"documentId": body.decode()})
+
+    client = AsyncClient(
+        token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    results = await client.sign.upload_documents(
+        sources=[f"document-{i}".encode() for i in range(6)],
+        content_type="text/plain",
+        concurrency=3,
+    )
+
+    assert [
+        result.document_id for result in results if not isinstance(result, Exception)
+    ] == [f"document-{i}" for i in range(6)]
+    assert peak == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires named pipes")
+def test_pipe_path_is_sent_once_without_a_length(tmp_path: pathlib.Path) -> None:
+    """Tests that a named pipe is neither sized from its stat nor read again on retry"""
+    path = tmp_path / "contract.pipe"
+    os.mkfifo(path)
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        request.read()
+        return httpx.Response(503)
+
+    def feed() -> None:
+        with open(path, "wb") as pipe:
+            pipe.write(_CONTENT)
+
+    writer = threading.Thread(target=feed)
+    writer.start()
+    stream = DocumentStream(path)
+    client = Client(
+        token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry=RetryPolicy(max_attempts=3, backoff_base=0),
+    )
+
+    assert stream.size is None and not stream.rewindable
+    with pytest.raises(ApiError):
+        client.sign.upload_document_stream(
+            content_type="application/pdf", source=stream
+        )
+    writer.join(5)
+
+    assert len(requests) == 1
+    assert "Content-Length" not in requests[0].headers
+    assert requests[0].content == _CONTENT